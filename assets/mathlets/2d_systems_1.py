@@ -12,26 +12,6 @@ def make_f(a11, a12, a21, a22):
         return dx, dy
     return f
 
-# ---------- RK4 integrator for a single seed ----------
-def rk4_path(f, x0, y0, t_end, h=0.03, clip=10.0):
-    if t_end == 0:
-        return np.array([x0]), np.array([y0])
-    h = abs(h) * (1.0 if t_end > 0 else -1.0)
-    n_steps = int(abs(t_end) / abs(h))
-    x, y = float(x0), float(y0)
-    xs, ys = [x], [y]
-    for _ in range(n_steps):
-        dx1, dy1 = f(x, y)
-        dx2, dy2 = f(x + 0.5*h*dx1, y + 0.5*h*dy1)
-        dx3, dy3 = f(x + 0.5*h*dx2, y + 0.5*h*dy2)
-        dx4, dy4 = f(x + h*dx3, y + h*dy3)
-        x += (h/6.0) * (dx1 + 2*dx2 + 2*dx3 + dx4)
-        y += (h/6.0) * (dy1 + 2*dy2 + 2*dy3 + dy4)
-        if (not np.isfinite(x)) or (not np.isfinite(y)) or abs(x) > clip or abs(y) > clip:
-            break
-        xs.append(x); ys.append(y)
-    return np.array(xs), np.array(ys)
-
 # ---------- Integer lattice seeds ----------
 def lattice_points(radius, xrange=XRANGE, yrange=YRANGE):
     xs, ys = [], []
@@ -244,7 +224,13 @@ def _scatter_markers(x, y, size=4, color="rgba(0,0,0,0.35)"):
         "showlegend": False,
     }
 
-def compute_plot_and_md(a11, a12, a21, a22, R, T):
+def compute_plot_and_md(a11, a12, a21, a22, R, T, batch=False):
+    """
+    batch=False: one trace per trajectory, per seed marker and per arrow segment.
+    batch=True : the same picture with O(1) traces -- all trajectories in one
+                 NaN-separated line trace, all seeds in one marker trace and
+                 all arrow segments in one line trace.
+    """
     a11 = float(a11); a12 = float(a12); a21 = float(a21); a22 = float(a22)
     R = int(R)
     T = float(T)
@@ -277,12 +263,38 @@ def compute_plot_and_md(a11, a12, a21, a22, R, T):
 
     clip = max(XRANGE[1], YRANGE[1]) + 1
 
-    # trajectories + initial points
-    for (x0, y0) in zip(ix, iy):
-        xf, yf = rk4_path(f, x0, y0,  T, h=0.03, clip=clip)
-        xb, yb = rk4_path(f, x0, y0, -T, h=0.03, clip=clip)
-        xx = np.concatenate([xb[::-1], xf[1:]])
-        yy = np.concatenate([yb[::-1], yf[1:]])
+    # trajectories + initial points: exact flow expm(tA) X0 for all seeds
+    # (linear_paths comes from linear_flow.py, loaded by the page first)
+    A = np.array([[a11, a12], [a21, a22]], dtype=float)
+    seeds = np.column_stack([ix, iy])
+    fwd = linear_paths(A, seeds,  T, 0.03, clip, norm="box", exact_end=False)
+    bwd = linear_paths(A, seeds, -T, 0.03, clip, norm="box", exact_end=False)
+    if batch:
+        paths = [np.concatenate([pb[::-1], pf[1:]]) for pf, pb in zip(fwd, bwd)]
+        traces.append(_scatter_line(nan_join([p[:, 0] for p in paths]).tolist(),
+                                    nan_join([p[:, 1] for p in paths]).tolist(),
+                                    color="rgba(70,160,255,0.75)", width=1.6))
+        traces.append(_scatter_markers(ix.tolist(), iy.tolist(),
+                                       size=4, color="rgba(0,0,0,0.35)"))
+
+        ax, ay = [], []
+        for (x0, y0) in zip(ix, iy):
+            segs = arrow_segments(f, float(x0), float(y0), length=0.5, head=0.18)
+            if segs is None:
+                continue
+            for (xa, ya, xb2, yb2) in segs:
+                ax += [xa, xb2, np.nan]
+                ay += [ya, yb2, np.nan]
+        traces.append(_scatter_line([float(v) for v in ax[:-1]], [float(v) for v in ay[:-1]],
+                                    color="rgba(70,160,255,0.85)", width=1.8))
+
+        md_es = classify_md_es(a11, a12, a21, a22)
+        md_en = classify_md_en(a11, a12, a21, a22)
+        return traces, md_es, md_en, [XRANGE[0], XRANGE[1]], [YRANGE[0], YRANGE[1]]
+
+    for (x0, y0), pf, pb in zip(zip(ix, iy), fwd, bwd):
+        xx = np.concatenate([pb[::-1, 0], pf[1:, 0]])
+        yy = np.concatenate([pb[::-1, 1], pf[1:, 1]])
 
         traces.append(_scatter_line(xx.tolist(), yy.tolist(),
                                    color="rgba(70,160,255,0.75)", width=1.6))
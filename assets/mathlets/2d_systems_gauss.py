@@ -46,39 +46,20 @@ def slope_field(
 
     return xsf.tolist(), ysf.tolist()
 
-# ---- RK4 integrator in time ----
-def rk4_path(
+# ---- Exact flow expm(tA) X0 ----
+# linear_paths / linear_flow come from linear_flow.py, loaded by the page first.
+def flow_path(
     e: float, f: float, d1: float, d2: float,
     x0: float, y0: float, t_end: float,
     h: float = 0.02, clip: float = 10.0
 ):
-    vf = f_factory(e, f, d1, d2)
-
-    h = abs(h) * (1.0 if t_end >= 0 else -1.0)
-    x, y = float(x0), float(y0)
-    xs, ys = [x], [y]
-
-    t = 0.0
-    while (t_end - t) * h > 0:
-        if abs(t_end - t) < abs(h):
-            h = (t_end - t)
-
-        dx1, dy1 = vf(x, y)
-        dx2, dy2 = vf(x + 0.5*h*dx1, y + 0.5*h*dy1)
-        dx3, dy3 = vf(x + 0.5*h*dx2, y + 0.5*h*dy2)
-        dx4, dy4 = vf(x + h*dx3, y + h*dy3)
-
-        x += (h/6.0) * (dx1 + 2.0*dx2 + 2.0*dx3 + dx4)
-        y += (h/6.0) * (dy1 + 2.0*dy2 + 2.0*dy3 + dy4)
-        t += h
-
-        if (not np.isfinite(x)) or (not np.isfinite(y)) or abs(x) > clip or abs(y) > clip:
-            break
-
-        xs.append(x)
-        ys.append(y)
-
-    return xs, ys
+    """
+    Samples the exact trajectory at t = 0, h, 2h, ..., t_end and stops at
+    the clip box.
+    """
+    A = A_matrix(e, f, d1, d2)
+    P = linear_paths(A, [[x0, y0]], t_end, h, clip, norm="box")[0]
+    return P[:, 0].tolist(), P[:, 1].tolist()
 
 # ---- Arrowhead polyline at a given time along trajectory ----
 def arrow_at_time(
@@ -94,11 +75,13 @@ def arrow_at_time(
     """
     vf = f_factory(e, f, d1, d2)
 
-    xs, ys = rk4_path(e, f, d1, d2, x0, y0, t_arrow, h=h, clip=1e9)
-    if len(xs) < 2:
+    if t_arrow == 0:
+        return [], []
+    X = linear_flow(A_matrix(e, f, d1, d2), [[x0, y0]], [t_arrow])[0, 0]
+    if not np.all(np.isfinite(X)):
         return [], []
 
-    x_arrow, y_arrow = xs[-1], ys[-1]
+    x_arrow, y_arrow = float(X[0]), float(X[1])
     dx, dy = vf(x_arrow, y_arrow)
     norm = float(np.hypot(dx, dy))
     if (not np.isfinite(norm)) or norm < 1e-8:
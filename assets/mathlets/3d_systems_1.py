@@ -1,7 +1,8 @@
 # 2d_systems_gauss.py
 # Pyodide-friendly (numpy only)
 # 3D linear system: Xdot = A X, with A 3x3
-# Provides RK4 integration + eigenvalues formatting helpers.
+# Provides exact-flow trajectories + eigenvalues formatting helpers.
+# The exact flow uses linear_flow.py, which the page loads first.
 
 import numpy as np
 
@@ -12,48 +13,15 @@ def A_matrix(a11, a12, a13, a21, a22, a23, a31, a32, a33):
                      [a21, a22, a23],
                      [a31, a32, a33]], dtype=float)
 
-def f_factory(a11, a12, a13, a21, a22, a23, a31, a32, a33):
-    A = A_matrix(a11, a12, a13, a21, a22, a23, a31, a32, a33)
-    def f(x, y, z):
-        dx = A[0, 0]*x + A[0, 1]*y + A[0, 2]*z
-        dy = A[1, 0]*x + A[1, 1]*y + A[1, 2]*z
-        dz = A[2, 0]*x + A[2, 1]*y + A[2, 2]*z
-        return dx, dy, dz
-    return f
-
-def rk4_path(a11, a12, a13, a21, a22, a23, a31, a32, a33,
-             x0, y0, z0, t_end, h=0.02, clip=10.0):
+def flow_path(a11, a12, a13, a21, a22, a23, a31, a32, a33,
+              x0, y0, z0, t_end, h=0.02, clip=10.0):
     """
-    RK4 integration in time t from 0 to t_end (can be negative).
-    Returns (xs, ys, zs) as Python lists (Plotly-friendly).
+    Exact trajectory expm(t A) X0 sampled at t = 0, h, 2h, ..., t_end and
+    cut at the clip ball. Returns (xs, ys, zs) as Python lists (Plotly-friendly).
     """
-    f = f_factory(a11, a12, a13, a21, a22, a23, a31, a32, a33)
-
-    h = abs(h) * (1.0 if t_end >= 0 else -1.0)
-    x, y, z = float(x0), float(y0), float(z0)
-    xs, ys, zs = [x], [y], [z]
-
-    t = 0.0
-    while (t_end - t) * h > 0:
-        if abs(t_end - t) < abs(h):
-            h = (t_end - t)
-
-        dx1, dy1, dz1 = f(x, y, z)
-        dx2, dy2, dz2 = f(x + 0.5*h*dx1, y + 0.5*h*dy1, z + 0.5*h*dz1)
-        dx3, dy3, dz3 = f(x + 0.5*h*dx2, y + 0.5*h*dy2, z + 0.5*h*dz2)
-        dx4, dy4, dz4 = f(x + h*dx3, y + h*dy3, z + h*dz3)
-
-        x += (h/6.0) * (dx1 + 2.0*dx2 + 2.0*dx3 + dx4)
-        y += (h/6.0) * (dy1 + 2.0*dy2 + 2.0*dy3 + dy4)
-        z += (h/6.0) * (dz1 + 2.0*dz2 + 2.0*dz3 + dz4)
-        t += h
-
-        if (not np.isfinite(x)) or (not np.isfinite(y)) or (not np.isfinite(z)) or (np.linalg.norm([x, y, z]) > clip):
-            break
-
-        xs.append(x); ys.append(y); zs.append(z)
-
-    return xs, ys, zs
+    A = A_matrix(a11, a12, a13, a21, a22, a23, a31, a32, a33)
+    P = linear_paths(A, [[x0, y0, z0]], t_end, h, clip, norm="ball")[0]
+    return P[:, 0].tolist(), P[:, 1].tolist(), P[:, 2].tolist()
 
 
 def eigvals_formatted(a11, a12, a13, a21, a22, a23, a31, a32, a33):
@@ -5,7 +5,6 @@ from sympy import Symbol, E, pi
 from sympy.parsing.sympy_parser import (
     parse_expr, standard_transformations, implicit_multiplication_application, convert_xor
 )
-from sympy import lambdify
 
 x = Symbol("x", real=True)
 
@@ -26,25 +25,23 @@ SAFE_LOCALS = {
     "abs": sp.Abs,
 }
 
+def _parse_expr_x(expr_str):
+    locals_map = dict(SAFE_LOCALS)
+    locals_map["e"] = E  # allow e^x
+    return parse_expr(expr_str, local_dict=locals_map, transformations=TRANSFORMS, evaluate=True)
+
 def _parse_to_callable(expr_str):
+    """(callable, expr) for A(x) or B(x); cached in expr_cache.py by source."""
     expr_str = (expr_str or "").strip()
     if expr_str == "":
         expr_str = "0"
 
-    locals_map = dict(SAFE_LOCALS)
-    locals_map["e"] = E  # allow e^x
-
     try:
-        expr = parse_expr(expr_str, local_dict=locals_map, transformations=TRANSFORMS, evaluate=True)
+        c = compile_expr("bernoulli", expr_str, _parse_expr_x, x)
     except Exception as e:
         raise ValueError(f"Could not parse expression: {expr_str}\n{e}")
 
-    try:
-        f = lambdify(x, expr, modules=["numpy"])
-    except Exception as e:
-        raise ValueError(f"Could not compile expression: {expr_str}\n{e}")
-
-    return f, expr
+    return c.func, c.expr
 
 def _f_factory(A_str, B_str, n):
     A_fun, A_expr = _parse_to_callable(A_str)
@@ -1,5 +1,7 @@
 import numpy as np
 
+STATE = None  # global simulation session for Pyodide
+
 def u0_profile(x, kind: str):
     x = np.asarray(x)
     if kind == "sawtooth":
@@ -17,77 +19,127 @@ def flux(u):
     return 0.5*u*u
 
 def godunov_flux(ul, ur):
-    if ul <= ur:
-        if ul >= 0.0:
-            return flux(ul)
-        elif ur <= 0.0:
-            return flux(ur)
-        else:
-            return 0.0
-    else:
-        s = 0.5*(ul + ur)
-        return flux(ul) if s >= 0.0 else flux(ur)
+    """
+    Exact Riemann (Godunov) flux for f(u) = u^2/2, elementwise on arrays:
+      ul <= ur (rarefaction): min of f on [ul, ur]  (0 if the fan crosses 0)
+      ul >  ur (shock):       upwind by the shock speed s = (ul + ur)/2
+    """
+    ul = np.asarray(ul, dtype=float)
+    ur = np.asarray(ur, dtype=float)
+    rare = np.where(ul >= 0.0, flux(ul), np.where(ur <= 0.0, flux(ur), 0.0))
+    shock = np.where(0.5*(ul + ur) >= 0.0, flux(ul), flux(ur))
+    return np.where(ul <= ur, rare, shock)
+
+def engquist_osher_flux(ul, ur):
+    """Engquist–Osher flux for f(u) = u^2/2 (smooth, no branches on the wave type)."""
+    ul = np.asarray(ul, dtype=float)
+    ur = np.asarray(ur, dtype=float)
+    return flux(np.maximum(ul, 0.0)) + flux(np.minimum(ur, 0.0))
+
+FLUXES = {"godunov": godunov_flux, "engquist_osher": engquist_osher_flux}
 
 def simulate(kind: str, nx: int = 401, xmin: float = -2.0, xmax: float = 2.0,
-             T: float = 1.5, dt: float = 0.004):
-    x = np.linspace(xmin, xmax, int(nx))
+             T: float = 1.5, dt: float = 0.004, frame_stride: int = 1,
+             scheme: str = "godunov"):
+    """
+    Periodic finite-volume solve of u_t + (u^2/2)_x = 0.
+
+    The history "U" is kept as a float32 NumPy buffer holding every
+    frame_stride-th step (the last step is always kept), with the matching
+    "times". It is no longer expanded into nested lists; use reset_state()
+    to keep it on the Python side for sample_at_time(). The other arrays
+    (x, times, characteristics) are NumPy arrays too, typed arrays in JS.
+    """
+    numerical_flux = FLUXES[scheme]
+    nx = int(nx)
+    frame_stride = max(1, int(frame_stride))
+
+    x = np.linspace(xmin, xmax, nx)
     dx = x[1] - x[0]
     u = u0_profile(x, kind).astype(float)
 
     nt = int(np.floor(T / dt)) + 1
-    times = np.linspace(0.0, (nt-1)*dt, nt)
+    steps = np.arange(0, nt, frame_stride)
+    if steps[-1] != nt - 1:
+        steps = np.append(steps, nt - 1)
+    times = steps * dt
 
-    U = np.empty((nt, nx), dtype=float)
+    U = np.empty((steps.size, nx), dtype=np.float32)
     U[0] = u
+    k = 1
 
     for n in range(1, nt):
-        un = U[n-1].copy()
-        F = np.empty(nx, dtype=float)
-        for i in range(nx):
-            ul = un[i]
-            ur = un[(i+1) % nx]
-            F[i] = godunov_flux(ul, ur)
-        U[n] = un - (dt/dx) * (F - np.roll(F, 1))
+        F = numerical_flux(u, np.roll(u, -1))   # F[i] = flux at x_{i+1/2}
+        u = u - (dt/dx) * (F - np.roll(F, 1))
+        if k < steps.size and n == steps[k]:
+            U[k] = u
+            k += 1
 
     m = 33
     x0s = np.linspace(xmin, xmax, m)
     u0s = u0_profile(x0s, kind)
-    Xchars = []
-    Tchars = times
+    Tchars = np.linspace(0.0, (nt-1)*dt, nt)
     L = xmax - xmin
-    for x0, u00 in zip(x0s, u0s):
-        xx = x0 + u00*Tchars
-        xx = ((xx - xmin) % L) + xmin
-        Xchars.append(xx.tolist())
+    # one characteristic per row, shape (m, nt)
+    Xchars = x0s[:, None] + u0s[:, None]*Tchars[None, :]
+    Xchars = ((Xchars - xmin) % L) + xmin
 
     return {
-        "x": x.tolist(),
-        "times": times.tolist(),
-        "U": U.tolist(),
-        "x0": x0s.tolist(),
-        "u0": u0s.tolist(),
+        "x": x,
+        "times": times.astype(float),
+        "U": U,
+        "x0": x0s,
+        "u0": u0s,
         "Xchars": Xchars,
-        "Tchars": Tchars.tolist(),
+        "Tchars": Tchars,
         "xmin": float(xmin),
         "xmax": float(xmax),
         "dt": float(dt),
     }
 
-def sample_at_time(sim, t_query: float):
-    times = np.array(sim["times"], dtype=float)
-    U = np.array(sim["U"], dtype=float)
-    x = np.array(sim["x"], dtype=float)
-
-    t = float(t_query)
-    if t <= times[0]:
-        return x.tolist(), U[0].tolist(), 0
-    if t >= times[-1]:
-        return x.tolist(), U[-1].tolist(), len(times)-1
-
-    idx = int(np.searchsorted(times, t))
-    if idx <= 0:
-        return x.tolist(), U[0].tolist(), 0
-    t0, t1 = times[idx-1], times[idx]
-    w = (t - t0) / (t1 - t0 + 1e-12)
-    u = (1-w)*U[idx-1] + w*U[idx]
-    return x.tolist(), u.tolist(), idx
+class BurgersState:
+    """
+    Keeps one simulation's times, x and U as NumPy arrays on the Python side,
+    so scrubbing the time slider only ships a single interpolated row to JS.
+    """
+
+    def __init__(self, sim):
+        self.times = np.asarray(sim["times"], dtype=float)
+        self.x = np.asarray(sim["x"], dtype=float)
+        self.U = np.asarray(sim["U"])
+
+    def sample(self, t_query: float):
+        """Return (u, idx): the profile linearly interpolated at t_query."""
+        times, U = self.times, self.U
+        t = float(t_query)
+        if t <= times[0]:
+            return U[0].astype(float), 0
+        if t >= times[-1]:
+            return U[-1].astype(float), len(times)-1
+
+        idx = int(np.searchsorted(times, t))
+        if idx <= 0:
+            return U[0].astype(float), 0
+        t0, t1 = times[idx-1], times[idx]
+        w = (t - t0) / (t1 - t0 + 1e-12)
+        u = (1-w)*U[idx-1].astype(float) + w*U[idx].astype(float)
+        return u, idx
+
+
+def reset_state(kind: str, **kwargs):
+    """
+    Run simulate() and keep the result as the session STATE.
+    Returns the simulation metadata for JS (everything except "U").
+    """
+    global STATE
+    sim = simulate(kind, **kwargs)
+    STATE = BurgersState(sim)
+    return {k: v for k, v in sim.items() if k != "U"}
+
+
+def sample_at_time(t_query: float):
+    """Return (u, idx) at time t_query from the session STATE: O(nx) per call."""
+    if STATE is None:
+        raise RuntimeError("State not initialized. Call reset_state first.")
+    u, idx = STATE.sample(t_query)
+    return u, idx
@@ -1,5 +1,10 @@
 import numpy as np
 
+# Integrated with the adaptive Dormand–Prince scheme from dopri.py (loaded by
+# the page first); method="rk4" keeps the fixed-step loop.
+RTOL = 1e-10
+ATOL = 1e-12
+
 def f(x, y, r1, K1, a12, r2, K2, a21):
     dx = r1 * x * (1.0 - (x + a12 * y) / K1)
     dy = r2 * y * (1.0 - (y + a21 * x) / K2)
@@ -14,7 +19,7 @@ def rk4_step(x, y, dt, r1, K1, a12, r2, K2, a21):
     yn = y + (dt/6.0)*(k1y + 2*k2y + 2*k3y + k4y)
     return xn, yn
 
-def simulate(r1, K1, a12, r2, K2, a21, x0, y0, T=30.0, dt=0.01):
+def simulate(r1, K1, a12, r2, K2, a21, x0, y0, T=30.0, dt=0.01, method="dopri"):
     r1 = float(r1); K1 = float(K1); a12 = float(a12)
     r2 = float(r2); K2 = float(K2); a21 = float(a21)
     x0 = float(x0); y0 = float(y0)
@@ -23,6 +28,16 @@ def simulate(r1, K1, a12, r2, K2, a21, x0, y0, T=30.0, dt=0.01):
     n = int(max(2, np.floor(T/dt) + 1))
     t = np.linspace(0.0, T, n)
 
+    if method == "dopri":
+        # sampled exactly at t; populations stay >= 0 (same guard as below)
+        def rhs(_t, s):
+            dx, dy = f(s[0], s[1], r1, K1, a12, r2, K2, a21)
+            return np.array([dx, dy])
+        s0 = [max(x0, 0.0), max(y0, 0.0)]
+        t, S, _ = dopri45(rhs, (0.0, T), s0, t_eval=t, rtol=RTOL, atol=ATOL)
+        S = np.maximum(S, 0.0)
+        return t, np.ascontiguousarray(S[:, 0]), np.ascontiguousarray(S[:, 1])
+
     x = np.empty(n, dtype=float)
     y = np.empty(n, dtype=float)
     x[0] = max(x0, 0.0)
@@ -35,8 +50,8 @@ def simulate(r1, K1, a12, r2, K2, a21, x0, y0, T=30.0, dt=0.01):
 
     return t, x, y
 
-def compute_plot_data(r1, K1, a12, r2, K2, a21, x0, y0, T=30.0, dt=0.01):
-    t, x, y = simulate(r1, K1, a12, r2, K2, a21, x0, y0, T=T, dt=dt)
+def compute_plot_data(r1, K1, a12, r2, K2, a21, x0, y0, T=30.0, dt=0.01, method="dopri"):
+    t, x, y = simulate(r1, K1, a12, r2, K2, a21, x0, y0, T=T, dt=dt, method=method)
 
     x_max = max(np.max(x), float(K1), 1e-9)
     y_max = max(np.max(y), float(K2), 1e-9)
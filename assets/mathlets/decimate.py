@@ -0,0 +1,90 @@
+# decimate.py
+# Pyodide-friendly (numpy only)
+# Level-of-detail for plotted polylines: Ramer–Douglas–Peucker simplification
+# with the tolerance in screen pixels, so the integration resolution (dt)
+# no longer sets how many vertices are sent to JS and drawn.
+# Shared by lorenz_3d and vanderpol; the page loads this file before the
+# mathlet so both live in the same Python globals.
+#
+# Every dropped vertex lies within tol_px of the segment that replaces it,
+# so the drawn curve does not change visibly. Straight-ish stretches
+# collapse to a few vertices and tight turns keep theirs (curvature-aware).
+# Distances are taken in all coordinates at once, so one index set serves
+# every projection of the same samples (phase plot and time series).
+
+import numpy as np
+
+DEFAULT_TOL_PX = 0.5
+DEFAULT_PLOT_PX = 800      # generous plot size: errors on screen only get smaller
+
+def _segment_dist(P, a, b):
+    """Distances of the rows of P to the segment a-b (any dimension)."""
+    ab = b - a
+    L2 = float(ab @ ab)
+    ap = P - a
+    if L2 == 0.0:
+        return np.sqrt(np.einsum("ij,ij->i", ap, ap))
+    s = np.clip(ap @ ab / L2, 0.0, 1.0)
+    d = ap - s[:, None] * ab
+    return np.sqrt(np.einsum("ij,ij->i", d, d))
+
+def rdp_keep(P, tol):
+    """
+    Mask of the vertices of the polyline P (n, d) that Ramer–Douglas–Peucker
+    keeps for tolerance `tol` (same units as P). End points are always kept;
+    non-finite rows (NaN breaks) are kept and split the polyline.
+    """
+    P = np.asarray(P, dtype=float)
+    n = P.shape[0]
+    keep = np.zeros(n, dtype=bool)
+    if n <= 2:
+        keep[:] = True
+        return keep
+
+    finite = np.all(np.isfinite(P), axis=1)
+    keep[~finite] = True
+    # runs of finite rows: [start, stop)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], finite.view(np.int8), [0]))))
+    for start, stop in zip(edges[0::2], edges[1::2]):
+        keep[start] = keep[stop - 1] = True
+        stack = [(start, stop - 1)]
+        while stack:
+            i, j = stack.pop()
+            if j - i < 2:
+                continue
+            d = _segment_dist(P[i + 1:j], P[i], P[j])
+            k = int(np.argmax(d))
+            if d[k] > tol:
+                k += i + 1
+                keep[k] = True
+                stack.append((i, k))
+                stack.append((k, j))
+    return keep
+
+def pixel_scales(coords, ranges=None, px=DEFAULT_PLOT_PX):
+    """
+    Factors turning each coordinate into pixels: px over its plotted span,
+    given as (lo, hi) in `ranges` or taken from the data.
+    """
+    scales = []
+    for c, r in zip(coords, ranges if ranges is not None else [None] * len(coords)):
+        if r is None:
+            c = np.asarray(c, dtype=float)
+            fin = c[np.isfinite(c)]
+            r = (float(fin.min()), float(fin.max())) if fin.size else (0.0, 1.0)
+        span = float(r[1]) - float(r[0])
+        scales.append(px / span if span > 0 else 0.0)
+    return scales
+
+def decimate(coords, ranges=None, tol_px=DEFAULT_TOL_PX, px=DEFAULT_PLOT_PX):
+    """
+    Indices of the samples to draw for the curve through `coords` (list of
+    equal-length 1-D arrays, e.g. [t, x, y, z]). tol_px <= 0 keeps all.
+    """
+    coords = [np.asarray(c, dtype=float) for c in coords]
+    n = coords[0].size
+    if not tol_px or tol_px <= 0 or n <= 2:
+        return np.arange(n)
+    scales = pixel_scales(coords, ranges, px)
+    P = np.column_stack([c * s for c, s in zip(coords, scales)])
+    return np.flatnonzero(rdp_keep(P, float(tol_px)))
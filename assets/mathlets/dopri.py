@@ -0,0 +1,251 @@
+# dopri.py
+# Pyodide-friendly (numpy only)
+# Adaptive Dormand–Prince 5(4) integrator with error control and dense output,
+# shared by the ODE mathlets in place of fixed-step RK4. The page loads this
+# file before the mathlet module so both live in the same Python globals.
+#
+# Steps are chosen by the local error estimate (rtol/atol), not by the display;
+# the solution is then evaluated on whatever output grid the plot needs with
+# the 4th-order continuous extension (Shampine), at no extra RHS cost.
+# FSAL: 6 RHS evaluations per accepted step.
+
+import numpy as np
+
+# ---------- Butcher tableau (Dormand & Prince 1980) ----------
+DP_C = np.array([0.0, 1/5, 3/10, 4/5, 8/9, 1.0])
+DP_A = [np.array(row) for row in (
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+)]
+DP_B = np.array([35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84])
+# 5th minus embedded 4th order weights (7 stages incl. the FSAL stage)
+DP_E = np.array([-71/57600, 0.0, 71/16695, -71/1920, 17253/339200, -22/525, 1/40])
+# Dense output: y(t + s h) = y + h * K^T P [s, s^2, s^3, s^4]
+DP_P = np.array([
+    [1.0, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+    [0.0, 0.0, 0.0, 0.0],
+    [0.0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+    [0.0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+    [0.0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+    [0.0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+    [0.0, 40617522/29380423, -110615467/29380423, 69997945/29380423],
+])
+
+SAFETY = 0.9
+MIN_FACTOR = 0.2
+MAX_FACTOR = 10.0
+
+def _err_norm(err, y, y_new, rtol, atol, norm="rms"):
+    r = np.abs(err) / (atol + rtol * np.maximum(np.abs(y), np.abs(y_new)))
+    if norm == "max":
+        return float(np.max(r))
+    return float(np.sqrt(np.mean(r * r)))
+
+def _initial_step(f, t0, y0, f0, rtol, atol, max_step):
+    """Hairer–Wanner starting step guess for a 5th-order method."""
+    scale = atol + rtol * np.abs(y0)
+    d0 = float(np.sqrt(np.mean((y0 / scale) ** 2)))
+    d1 = float(np.sqrt(np.mean((f0 / scale) ** 2)))
+    h0 = 1e-6 if (d0 < 1e-5 or d1 < 1e-5) else 0.01 * d0 / d1
+    h0 = min(h0, max_step)
+    f1 = f(t0 + h0, y0 + h0 * f0)
+    d2 = float(np.sqrt(np.mean(((f1 - f0) / scale) ** 2))) / h0
+    if d1 <= 1e-15 and d2 <= 1e-15:
+        h1 = max(1e-6, h0 * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2)) ** (1 / 5)
+    return min(100 * h0, h1, max_step)
+
+def _dense(y, h, K, s):
+    """Continuous extension at fractions s in [0, 1] of the step: (len(s), n)."""
+    s = np.atleast_1d(s)
+    powers = np.stack([s, s**2, s**3, s**4], axis=1)     # (m, 4)
+    return y[None, :] + h * (powers @ (DP_P.T @ K))
+
+def _locate_event(event, t, y, h, K, g_old, g_new, iters=40):
+    """Root of event() inside the step, by Illinois regula falsi on the dense output."""
+    a, b = 0.0, 1.0
+    ga, gb = g_old, g_new
+    side = 0
+    s = 1.0
+    for _ in range(iters):
+        s = (a * gb - b * ga) / (gb - ga) if gb != ga else 0.5 * (a + b)
+        gs = float(event(t + s * h, _dense(y, h, K, s)[0]))
+        if gs == 0.0 or (b - a) < 1e-14:
+            break
+        if (gs > 0) == (ga > 0):
+            a, ga = s, gs
+            if side == -1:
+                gb *= 0.5
+            side = -1
+        else:
+            b, gb = s, gs
+            if side == 1:
+                ga *= 0.5
+            side = 1
+    return s
+
+def dopri45(f, t_span, y0, t_eval=None, rtol=1e-6, atol=1e-9, max_step=np.inf,
+            first_step=None, max_steps=100000, event=None, norm="rms"):
+    """
+    Integrate y' = f(t, y) from t_span[0] to t_span[1] (> t_span[0]).
+    An empty span (t_span[1] <= t_span[0]) returns just the initial sample,
+    with status "done" and no event.
+
+    y0 may have any shape (e.g. an ensemble); the error norm is taken over
+    all of it (norm="max" makes every member meet the tolerance). With
+    t_eval (increasing, inside t_span) the solution is returned at those
+    times through the dense output, otherwise at the accepted steps.
+
+    event(t, y) -> float stops the run at its first crossing from positive
+    to <= 0 (or from 0 at t0 if the first step goes down); the crossing
+    becomes the last sample. event may also return an array (one entry per
+    ensemble member, say): each entry's crossing is located separately and
+    the run stops once all of them have crossed.
+
+    Returns (t, Y, info) with Y of shape (len(t),) + y0.shape and info a
+    dict: nfev, steps, rejected, status ("done" | "event" | "max_steps" |
+    "nonfinite"), t_event and y_event (crossing time and state; None if
+    there was none, arrays with NaN for missed entries for a vector event).
+    """
+    t0, t1 = float(t_span[0]), float(t_span[1])
+    y = np.array(y0, dtype=float)
+    shape = y.shape
+    y = y.ravel()
+    rtol = float(rtol); atol = float(atol)
+    max_step = min(float(max_step), t1 - t0) if t1 > t0 else float(max_step)
+
+    # the stepper works on flat vectors; f and event see the caller's shape
+    fun = lambda t, v: np.asarray(f(t, v.reshape(shape)), dtype=float).ravel()
+    g = None
+    if event is not None:
+        g = lambda t, v: np.atleast_1d(np.asarray(event(t, v.reshape(shape)), dtype=float))
+
+    info = {"nfev": 0, "steps": 0, "rejected": 0, "status": "done",
+            "t_event": None, "y_event": None}
+
+    def result(t_out, Y_out):
+        if g is not None and not np.all(np.isnan(t_ev)):
+            if vector_event:
+                info["t_event"] = t_ev
+                info["y_event"] = y_ev.reshape((-1,) + shape)
+            else:
+                info["t_event"] = float(t_ev[0])
+                info["y_event"] = y_ev[0].reshape(shape)
+        return np.asarray(t_out, dtype=float), np.asarray(Y_out).reshape((-1,) + shape), info
+
+    # event state exists before any return, including an empty span
+    if g is not None:
+        vector_event = np.ndim(event(t0, y.reshape(shape))) > 0
+        g_old = g(t0, y)
+        t_ev = np.full(g_old.size, np.nan)
+        y_ev = np.full((g_old.size, y.size), np.nan)
+        crossed = np.zeros(g_old.size, dtype=bool)
+
+    if t_eval is not None:
+        t_eval = np.asarray(t_eval, dtype=float)
+        out_Y = np.empty((t_eval.size, y.size))
+        n_out = int(np.searchsorted(t_eval, t0, side="right"))
+        out_Y[:n_out] = y
+    else:
+        out_t = [t0]
+        out_y = [y.copy()]
+
+    if t1 <= t0:
+        return result(t_eval[:n_out], out_Y[:n_out]) if t_eval is not None else result(out_t, out_y)
+
+    K = np.empty((7, y.size))
+    K[0] = fun(t0, y)
+    info["nfev"] += 1
+    if first_step:
+        h = float(first_step)
+    else:
+        h = _initial_step(fun, t0, y, K[0], rtol, atol, max_step)
+        info["nfev"] += 1
+
+    t = t0
+    while t < t1:
+        if info["steps"] >= max_steps:
+            info["status"] = "max_steps"
+            break
+        h = min(h, max_step, t1 - t)
+        if t1 - (t + h) < 1e-12 * max(1.0, abs(t1)):
+            h = t1 - t
+
+        # stages
+        for i in range(1, 6):
+            K[i] = fun(t + DP_C[i] * h, y + h * (DP_A[i] @ K[:i]))
+        y_new = y + h * (DP_B @ K[:6])
+        K[6] = fun(t + h, y_new)
+        info["nfev"] += 6
+
+        if not np.all(np.isfinite(y_new)):
+            if h <= 1e-12 * max(1.0, abs(t)):
+                info["status"] = "nonfinite"
+                break
+            h *= MIN_FACTOR
+            info["rejected"] += 1
+            continue
+
+        err = _err_norm(h * (DP_E @ K), y, y_new, rtol, atol, norm)
+        if err > 1.0:
+            h *= max(MIN_FACTOR, SAFETY * err ** -0.2)
+            info["rejected"] += 1
+            continue
+
+        # accepted step [t, t + h]
+        t_new = t + h
+        info["steps"] += 1
+
+        t_stop = None
+        if g is not None:
+            g_new = g(t_new, y_new)
+            # a start exactly on the surface counts if the first step goes down
+            started = (g_old > 0.0) | ((g_old == 0.0) & (t == t0))
+            hit = started & (g_new <= 0.0) & ~crossed
+            for k in np.nonzero(hit)[0]:
+                gk = lambda tt, v, k=k: g(tt, v)[k]
+                s_k = _locate_event(gk, t, y, h, K, g_old[k], g_new[k])
+                t_ev[k] = t + s_k * h
+                y_ev[k] = _dense(y, h, K, s_k)[0]
+            crossed |= hit
+            if hit.any() and crossed.all():
+                t_stop = float(np.max(t_ev[hit]))
+                info["status"] = "event"
+            g_old = g_new
+
+        t_end_step = t_new if t_stop is None else t_stop
+        if t_eval is not None:
+            j = int(np.searchsorted(t_eval, t_end_step, side="right"))
+            if j > n_out:
+                out_Y[n_out:j] = _dense(y, h, K, (t_eval[n_out:j] - t) / h)
+                n_out = j
+        else:
+            out_t.append(t_end_step)
+            out_y.append(y_new.copy() if t_stop is None else _dense(y, h, K, (t_stop - t) / h)[0])
+
+        if t_stop is not None:
+            if t_eval is not None:
+                Y_last = _dense(y, h, K, (t_stop - t) / h)
+                return result(np.append(t_eval[:n_out], t_stop),
+                              np.concatenate([out_Y[:n_out], Y_last]))
+            break
+
+        y = y_new
+        K[0] = K[6]
+        t = t_new
+        factor = MAX_FACTOR if err == 0 else min(MAX_FACTOR, SAFETY * err ** -0.2)
+        h *= factor
+
+    if t_eval is not None:
+        return result(t_eval[:n_out], out_Y[:n_out])
+    return result(out_t, out_y)
+
+def output_grid(t_end, dt):
+    """Display grid 0, dt, 2dt, ... <= t_end (the samples the RK4 loops produced)."""
+    n = int(np.floor(float(t_end) / float(dt))) + 1
+    return np.arange(n) * float(dt)
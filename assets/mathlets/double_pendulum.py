@@ -9,6 +9,11 @@ g = 1.0
 TH_RANGE = (-np.pi, np.pi)
 PH_RANGE = (-np.pi, np.pi)
 
+# Adaptive Dormand–Prince (dopri.py, loaded by the page first); the
+# symplectic option uses symplectic.py, also loaded first
+RTOL = 1e-9
+ATOL = 1e-9
+
 def V(theta, phi):
     """
     Potential energy up to additive constant, for equal masses/lengths.
@@ -16,16 +21,29 @@ def V(theta, phi):
     """
     return m * g * l * (3.0 - 2.0*np.cos(theta) - np.cos(phi))
 
-def energy_grid(n=220):
-    th = np.linspace(TH_RANGE[0], TH_RANGE[1], n)
-    ph = np.linspace(PH_RANGE[0], PH_RANGE[1], n)
-    TH, PH = np.meshgrid(th, ph)
-    Z = V(TH, PH)
-    return th.tolist(), ph.tolist(), Z.tolist()
+# V does not depend on the initial condition: one grid per resolution
+ENERGY_N = 220
+_ENERGY_GRIDS = {}
+
+def energy_grid(n=ENERGY_N):
+    """th, ph (n,) and Z = V on their meshgrid (n, n), computed once per n."""
+    n = int(n)
+    if n not in _ENERGY_GRIDS:
+        th = np.linspace(TH_RANGE[0], TH_RANGE[1], n)
+        ph = np.linspace(PH_RANGE[0], PH_RANGE[1], n)
+        TH, PH = np.meshgrid(th, ph)
+        _ENERGY_GRIDS[n] = (th, ph, V(TH, PH))
+    return _ENERGY_GRIDS[n]
+
+def contour_data(n=ENERGY_N):
+    """Background contour grid, for pages that fetch it once and keep it."""
+    th_grid, ph_grid, Z = energy_grid(n)
+    return {"th_grid": th_grid, "ph_grid": ph_grid, "Z": Z}
 
 def eom(theta, phi, theta_dot, phi_dot):
     """
-    Equations of motion derived from the Lagrangian for the equal-parameter point-mass double pendulum:
+    Equations of motion derived from the Lagrangian for the equal-parameter point-mass double pendulum
+    (elementwise: the arguments may be arrays of ensemble members):
       T = m l^2 (theta_dot^2 + 1/2 phi_dot^2 + theta_dot*phi_dot*cos(theta-phi))
       V = m g l (3 - 2 cos theta - cos phi)
 
@@ -42,13 +60,55 @@ def eom(theta, phi, theta_dot, phi_dot):
     rhs2 = + (theta_dot**2) * sd - 1.0*(g/l)*np.sin(phi)
 
     denom = 2.0 - cd*cd  # det of [[2,cd],[cd,1]]
-    if abs(denom) < 1e-12:
-        denom = 1e-12 if denom >= 0 else -1e-12
+    # keep |denom| >= 1e-12, branch-free so that arrays of states work too
+    denom = np.copysign(np.maximum(np.abs(denom), 1e-12), denom)
 
     theta_dd = (rhs1 - cd*rhs2) / denom
     phi_dd   = (-cd*rhs1 + 2.0*rhs2) / denom
     return theta_dd, phi_dd
 
+def momenta(theta, phi, theta_dot, phi_dot):
+    """
+    Canonical momenta p = ∂T/∂(θ̇, φ̇):
+      p_theta = m l^2 (2 θ̇ + cosΔ φ̇),   p_phi = m l^2 (cosΔ θ̇ + φ̇)
+    """
+    cd = np.cos(theta - phi)
+    ml2 = m * l * l
+    return ml2 * (2.0*theta_dot + cd*phi_dot), ml2 * (cd*theta_dot + phi_dot)
+
+def hamiltonian(theta, phi, p_theta, p_phi):
+    """
+    Total energy in canonical variables (works on arrays):
+      H = (p_θ^2 - 2 cosΔ p_θ p_φ + 2 p_φ^2) / (2 m l^2 (2 - cos^2 Δ)) + V
+    """
+    cd = np.cos(theta - phi)
+    D = 2.0 - cd*cd
+    N = p_theta*p_theta - 2.0*cd*p_theta*p_phi + 2.0*p_phi*p_phi
+    return N / (2.0 * m * l * l * D) + V(theta, phi)
+
+def hamilton_rhs(y):
+    """
+    Hamilton's equations for y = [theta, phi, p_theta, p_phi] (each entry a
+    float or an array of ensemble members). With D = 2 - cos^2 Δ and
+    A = ∂T/∂Δ = sinΔ (p_θ p_φ D - cosΔ N) / (m l^2 D^2):
+      θ̇ = (p_θ - cosΔ p_φ) / (m l^2 D),   φ̇ = (2 p_φ - cosΔ p_θ) / (m l^2 D)
+      ṗ_θ = -A - 2 m g l sinθ,          ṗ_φ = A - m g l sinφ
+    """
+    theta, phi, pt, pp = y
+    d = theta - phi
+    cd = np.cos(d)
+    sd = np.sin(d)
+    ml2 = m * l * l
+    D = 2.0 - cd*cd
+    N = pt*pt - 2.0*cd*pt*pp + 2.0*pp*pp
+    A = sd * (pt*pp*D - cd*N) / (ml2 * D*D)
+    return np.array([
+        (pt - cd*pp) / (ml2 * D),
+        (2.0*pp - cd*pt) / (ml2 * D),
+        -A - 2.0*m*g*l*np.sin(theta),
+        A - m*g*l*np.sin(phi),
+    ])
+
 def _wrap_to_2pi_window(a):
     """
     Wrap angle into [-2π, 2π].
@@ -74,12 +134,12 @@ def rk4_path(theta0, phi0, t_end=20.0, h=0.01):
     prev_th = theta
     prev_ph = phi
 
-    for _ in range(n_steps-1):
-        def F(state):
-            th, ph, thd_, phd_ = state
-            thdd, phdd = eom(th, ph, thd_, phd_)
-            return np.array([thd_, phd_, thdd, phdd], dtype=float)
+    def F(state):
+        th, ph, thd_, phd_ = state
+        thdd, phdd = eom(th, ph, thd_, phd_)
+        return np.array([thd_, phd_, thdd, phdd], dtype=float)
 
+    for _ in range(n_steps-1):
         y = np.array([theta, phi, thd, phd], dtype=float)
 
         k1 = F(y)
@@ -112,22 +172,232 @@ def rk4_path(theta0, phi0, t_end=20.0, h=0.01):
     return TH, PH
 
 
-def compute_fig_data(theta0, phi0):
+def _wrapped_polyline(theta, phi):
+    """
+    Vectorized form of the wrapping in rk4_path: angles wrapped into
+    [-2π,2π] (the first sample as given), NaN inserted before each jump.
+    """
+    TH = _wrap_to_2pi_window(theta)
+    PH = _wrap_to_2pi_window(phi)
+    TH[0] = theta[0]
+    PH[0] = phi[0]
+    jumps = np.nonzero((np.abs(np.diff(TH)) > np.pi) | (np.abs(np.diff(PH)) > np.pi))[0] + 1
+    return np.insert(TH, jumps, np.nan), np.insert(PH, jumps, np.nan)
+
+def energy_drift(theta, phi, theta_dot, phi_dot):
+    """max |H(t) - H(0)| along sampled (θ, φ, θ̇, φ̇), all at once."""
+    return float(invariant_drift(hamiltonian(theta, phi, *momenta(theta, phi, theta_dot, phi_dot))))
+
+def dopri_path(theta0, phi0, t_end=20.0, h=0.01):
+    """
+    Same samples as rk4_path (uniform grid of spacing ~h), but the steps are
+    chosen adaptively by dopri45 and the samples come from its dense output.
+    Returns TH, PH and the energy drift.
+    """
+    n_steps = int(max(2, np.ceil(abs(t_end)/abs(h))))
+    t = np.linspace(0.0, t_end, n_steps)
+
+    def F(_t, s):
+        thdd, phdd = eom(s[0], s[1], s[2], s[3])
+        return np.array([s[2], s[3], thdd, phdd])
+
+    t, S, _ = dopri45(F, (0.0, float(t_end)), [float(theta0), float(phi0), 0.0, 0.0],
+                      t_eval=t, rtol=RTOL, atol=ATOL)
+    ok = np.all(np.isfinite(S), axis=1)
+    if not ok.all():
+        S = S[:int(np.argmin(ok))]
+    TH, PH = _wrapped_polyline(S[:, 0], S[:, 1])
+    return TH.tolist(), PH.tolist(), energy_drift(S[:, 0], S[:, 1], S[:, 2], S[:, 3])
+
+def midpoint_path(theta0, phi0, t_end=20.0, h=0.01):
+    """
+    Symplectic alternative to dopri_path on the same uniform grid: implicit
+    midpoint rule on Hamilton's equations (symplectic.py). Only 2nd order,
+    but the energy error stays bounded instead of drifting, so long horizons
+    and larger h stay on the right energy surface.
+    Returns TH, PH and the energy drift.
+    """
+    n_steps = int(max(2, np.ceil(abs(t_end)/abs(h))))
+    h = (t_end / (n_steps-1))
+
+    # released from rest: p_theta = p_phi = 0
+    Y, _ = implicit_midpoint(hamilton_rhs, [float(theta0), float(phi0), 0.0, 0.0], h, n_steps-1)
+    TH, PH = _wrapped_polyline(Y[:, 0], Y[:, 1])
+    return TH.tolist(), PH.tolist(), float(invariant_drift(hamiltonian(*Y.T)))
+
+
+# =========================
+# Ensemble / chaos maps
+# =========================
+CHAOS_N = 100          # grid points per axis
+CHAOS_T_MAX = 30.0     # in units of sqrt(l/g)
+CHAOS_H = 0.02
+CHAOS_CHUNK = 2048     # states integrated together (a divergence pair counts twice)
+CHAOS_STEPS = 100      # RK4 steps per increment, so no single call runs long
+CHAOS_EPS = 1e-6       # twin offset in theta (divergence map)
+CHAOS_DELTA = 0.1      # separation counted as divergence
+
+def _rhs_ensemble(S):
+    """S = [theta, phi, theta_dot, phi_dot] stacked on axis 0, any trailing shape."""
+    thdd, phdd = eom(S[0], S[1], S[2], S[3])
+    return np.stack((S[2], S[3], thdd, phdd))
+
+def _first_event_times(S, T, steps, h, hit, every=CHAOS_STEPS):
+    """
+    Fixed-step RK4 for a whole ensemble S (4, ..., m), members on the last
+    axis, for at most `steps` steps or until hit(S) -> (m,) bool has fired
+    for each of them. First hit times (multiples of h) go into T (m,),
+    which stays NaN when there was none. Members are dropped from the
+    working arrays as they finish, so the cost follows the ones still
+    running.
+
+    A generator: yields the number of steps taken after every `every`
+    steps and finally `steps`, keeping S between increments.
+    """
+    idx = np.arange(S.shape[-1])
+    i = 0
+    while i < steps and idx.size:
+        with np.errstate(all="ignore"):
+            for i in range(i + 1, min(i + every, steps) + 1):
+                k1 = _rhs_ensemble(S)
+                k2 = _rhs_ensemble(S + 0.5*h*k1)
+                k3 = _rhs_ensemble(S + 0.5*h*k2)
+                k4 = _rhs_ensemble(S + h*k3)
+                S = S + (h/6.0)*(k1 + 2*k2 + 2*k3 + k4)
+
+                done = hit(S)
+                if done.any():
+                    T[idx[done]] = i * h
+                    keep = ~done
+                    idx = idx[keep]
+                    S = S[..., keep]
+                    if idx.size == 0:
+                        break
+        if i < steps and idx.size:
+            yield i
+    yield steps
+
+def _flipped(S):
+    # either rod over the top
+    return (np.abs(S[0]) > np.pi) | (np.abs(S[1]) > np.pi)
+
+def iter_chaos_map(n=CHAOS_N, mode="flip", t_max=CHAOS_T_MAX, h=CHAOS_H, chunk=CHAOS_CHUNK,
+                   eps=CHAOS_EPS, delta=CHAOS_DELTA):
+    """
+    Map over the (theta0, phi0) plane, released from rest, built chunk by
+    chunk of members and, within a chunk, CHAOS_STEPS time steps at a time.
+    Yields (done, total, result) after every increment, done and total
+    counting chunk steps; result["T"] is filled in place, (n, n) with
+    T[j, i] at (th[i], ph[j]) as energy_grid:
+      mode "flip":       first time either rod flips over (the classic
+                         flip-time fractal); starts with 2cosθ + cosφ > 1
+                         lack the energy to flip and are skipped
+      mode "divergence": first time a twin started eps away in theta is
+                         more than delta away in (θ, φ, θ̇, φ̇)
+    NaN means "not by t_max".
+    """
+    th = np.linspace(TH_RANGE[0], TH_RANGE[1], int(n))
+    ph = np.linspace(PH_RANGE[0], PH_RANGE[1], int(n))
+    TH, PH = np.meshgrid(th, ph)
+    th0 = TH.ravel()
+    ph0 = PH.ravel()
+
+    Tmap = np.full(TH.shape, np.nan)
+    flat = Tmap.reshape(-1)
+    result = {"th": th, "ph": ph, "T": Tmap, "mode": mode, "t_max": float(t_max)}
+
+    if mode == "flip":
+        # E = V(θ0, φ0) must reach min V on |φ| = π, i.e. 2 m g l
+        todo = np.nonzero(2.0*np.cos(th0) + np.cos(ph0) <= 1.0)[0]
+        hit = _flipped
+    elif mode == "divergence":
+        todo = np.arange(th0.size)
+        def hit(S):
+            d = S[:, 1] - S[:, 0]
+            return ~(np.sqrt(np.sum(d*d, axis=0)) <= delta)    # NaN counts as diverged
+    else:
+        raise ValueError(f"unknown chaos map mode: {mode}")
+
+    if todo.size == 0:
+        yield 0, 0, result
+        return
+    # a divergence member is a reference and a twin: half as many per chunk
+    chunk = max(1, int(chunk) // (2 if mode == "divergence" else 1))
+    steps = int(np.ceil(float(t_max) / h))
+    n_chunks = -(-int(todo.size) // chunk)
+    total = n_chunks * steps
+    for c in range(n_chunks):
+        sel = todo[c*chunk:(c + 1)*chunk]
+        zero = np.zeros(sel.size)
+        S = np.stack((th0[sel], ph0[sel], zero, zero))
+        if mode == "divergence":
+            S = np.stack((S, S), axis=1)        # (4, 2, m): reference and twin
+            S[0, 1] += eps
+        T = np.full(sel.size, np.nan)
+        for i in _first_event_times(S, T, steps, h, hit):
+            flat[sel] = T
+            yield c*steps + i, total, result
+
+def chaos_map(n=CHAOS_N, mode="flip", t_max=CHAOS_T_MAX, h=CHAOS_H, chunk=CHAOS_CHUNK,
+              eps=CHAOS_EPS, delta=CHAOS_DELTA, progress=None):
+    """Whole map at once; progress(done, total) is called after each increment."""
+    result = None
+    for done, total, result in iter_chaos_map(n, mode, t_max, h, chunk, eps, delta):
+        if progress is not None:
+            progress(done, total)
+    return result
+
+# Incremental driver for the page: one increment (a chunk of members over
+# CHAOS_STEPS time steps) per call, so the browser can repaint (and show
+# progress) between them.
+CHAOS = {"it": None, "result": None, "done": 0, "total": 0}
+
+def chaos_map_start(n=CHAOS_N, mode="flip", t_max=CHAOS_T_MAX, h=CHAOS_H):
+    CHAOS["it"] = iter_chaos_map(int(n), str(mode), float(t_max), float(h))
+    CHAOS["result"] = None
+    CHAOS["done"] = 0
+    CHAOS["total"] = 0
+
+def chaos_map_step():
+    """Integrate the next increment; returns [done, total] (done == total at the end)."""
+    if CHAOS["it"] is not None:
+        try:
+            CHAOS["done"], CHAOS["total"], CHAOS["result"] = next(CHAOS["it"])
+        except StopIteration:
+            CHAOS["it"] = None
+        if CHAOS["done"] >= CHAOS["total"]:
+            CHAOS["it"] = None
+    return [CHAOS["done"], CHAOS["total"]]
+
+def chaos_map_result():
+    """th, ph (1-D) and T (n, n) as NumPy arrays (typed arrays on the JS side)."""
+    r = CHAOS["result"]
+    if r is None:
+        return None
+    return {"th": r["th"], "ph": r["ph"], "T": np.ascontiguousarray(r["T"]),
+            "mode": r["mode"], "t_max": r["t_max"]}
+
+
+def compute_fig_data(theta0, phi0, method="dopri", with_grid=True):
     """
     Returns:
-      - energy grid for V(theta,phi)  (this equals H at p_theta=p_phi=0)
-      - trajectory in (theta,phi)
+      - energy grid for V(theta,phi)  (this equals H at p_theta=p_phi=0);
+        left out with with_grid=False (trajectory-only update, the page
+        keeps the grid from contour_data())
+      - trajectory in (theta,phi)  (method "dopri" or symplectic "midpoint")
+      - energy drift max |H - H0| along it
       - initial point
     """
-    th_grid, ph_grid, Z = energy_grid(n=220)
-    ths, phs = rk4_path(theta0, phi0, t_end=20.0, h=0.01)
+    path = midpoint_path if method == "midpoint" else dopri_path
+    ths, phs, drift = path(theta0, phi0, t_end=20.0, h=0.01)
 
-    return {
-        "th_grid": th_grid,
-        "ph_grid": ph_grid,
-        "Z": Z,
+    out = {
         "ths": ths,
         "phs": phs,
+        "energy_drift": drift,
         "theta0": float(theta0),
         "phi0": float(phi0),
-    }
\ No newline at end of file
+    }
+    if with_grid:
+        out.update(contour_data())
+    return out
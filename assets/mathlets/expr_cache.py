@@ -0,0 +1,85 @@
+# expr_cache.py
+# Pyodide-friendly (numpy + sympy)
+# LRU cache of user-entered formulas: parsed sympy expression, LaTeX and the
+# lambdified NumPy callable, keyed by the normalized source string.
+# Shared by lyapunov, riccati_isoclines and bernoulli_isoclines; the page
+# loads this file before the mathlet so both live in the same Python globals.
+#
+# Parsing + lambdify are by far the slowest steps in Pyodide, so redraws
+# driven by sliders (formulas unchanged) never touch sympy again.
+
+from collections import OrderedDict
+
+import sympy as sp
+
+EXPR_CACHE_SIZE = 64
+
+def normalize_source(s):
+    """Strip and collapse runs of whitespace; empty input means "0"."""
+    s = " ".join(str(s or "").split())
+    return s if s else "0"
+
+class CompiledExpr:
+    """A parsed expression with its NumPy callable; LaTeX built on first use."""
+
+    __slots__ = ("expr", "func", "_latex")
+
+    def __init__(self, expr, func):
+        self.expr = expr
+        self.func = func
+        self._latex = None
+
+    @property
+    def latex(self):
+        if self._latex is None:
+            self._latex = sp.latex(self.expr)
+        return self._latex
+
+class LRUCache:
+    """Small least-recently-used map; build() runs only on a miss."""
+
+    def __init__(self, maxsize=EXPR_CACHE_SIZE):
+        self.maxsize = int(maxsize)
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        value = build()          # exceptions propagate, nothing is cached
+        self._data[key] = value
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+EXPR_CACHE = LRUCache()
+
+def compile_expr(namespace, src, parse, args):
+    """
+    Cached parse(src) -> sympy expression, lambdified over `args`.
+    `namespace` separates mathlets whose parsers (symbols, allowed names)
+    differ; `parse` receives the normalized source.
+    """
+    key = (namespace, normalize_source(src))
+
+    def build():
+        expr = parse(key[1])
+        return CompiledExpr(expr, sp.lambdify(args, expr, modules=["numpy"]))
+
+    return EXPR_CACHE.get(key, build)
+
+def cached(namespace, key, build):
+    """Any other sympy-derived result worth keeping (same LRU)."""
+    return EXPR_CACHE.get((namespace,) + tuple(key), build)
@@ -51,10 +51,18 @@ _p_grid = np.linspace(-Lp, Lp, NP)
 _X, _P = np.meshgrid(_x_grid, _p_grid)
 _H = H0(_X, _P)
 
-def compute_fig_data(x0: float, p0: float, alpha: float, t_cur: float):
+def contour_data():
+    """
+    The constant energy grid as NumPy arrays (typed arrays on the JS side),
+    for pages that fetch it once and keep it.
+    """
+    return {"x_grid": _x_grid, "p_grid": _p_grid, "H": _H}
+
+def compute_fig_data(x0: float, p0: float, alpha: float, t_cur: float, with_grid: bool = True):
     """
     Returns a dict with Plotly-friendly lists for:
-      - energy contours grid
+      - energy contours grid (left out with with_grid=False: trajectory-only
+        update, the page keeps the grid from contour_data())
       - phase trajectory up to t_cur
       - x(t) curve on [0,10] + marker at t_cur
       - arrow annotation data for phase trajectory tip direction
@@ -88,10 +96,7 @@ def compute_fig_data(x0: float, p0: float, alpha: float, t_cur: float):
             "ay": float(ps[i_tip]),
         }
 
-    return {
-        "x_grid": _x_grid.tolist(),
-        "p_grid": _p_grid.tolist(),
-        "H": _H.tolist(),
+    out = {
         "xs": xs.tolist(),
         "ps": ps.tolist(),
         "T_long": T_long.tolist(),
@@ -101,4 +106,7 @@ def compute_fig_data(x0: float, p0: float, alpha: float, t_cur: float):
         "x0": x0,
         "p0": p0,
         "arrow": arrow
-    }
\ No newline at end of file
+    }
+    if with_grid:
+        out.update(contour_data())
+    return out
\ No newline at end of file
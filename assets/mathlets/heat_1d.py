@@ -5,6 +5,11 @@ import numpy as np
 #   u_t = k u_xx,   u(0,t)=U0,  u(L,t)=UL
 # u = u_s + v, with u_s(x) = U0 + (UL-U0) x/L
 # v has homogeneous Dirichlet BC and sine-series solution.
+#
+# method="quad": dense sine matrix + trapezoidal quadrature, O(N·NX).
+# method="dst" : type-I DST via FFT (sine_transform.py, loaded by the page
+#                first) for analysis and synthesis, O(NX log NX); allows up
+#                to NX-2 coefficients.
 # =====================================================
 
 L = 10.0
@@ -31,13 +36,15 @@ def u0_gaussian(X, A, x0, sigma):
 def u0_linear(X, U0, UL):
     return steady_state(X, U0, UL)
 
-def fourier_coeffs(gx, nmax):
+def fourier_coeffs(gx, nmax, method="quad"):
+    if method == "dst":
+        return sine_coeffs(gx, nmax)
     # S shape: (nmax, NX)
     S = np.sin(np.outer(np.arange(1, nmax + 1), np.pi * X / L))
     bn = (2.0 / L) * np.trapz(gx * S, X, axis=1)
     return bn
 
-def solution_profile(t, k, U0, UL, ic_kind, C, A, x0, sigma, n_coeff=N_COEFF):
+def solution_profile(t, k, U0, UL, ic_kind, C, A, x0, sigma, n_coeff=N_COEFF, method="quad"):
     if ic_kind == "uniform":
         u0 = u0_uniform(X, C)
     elif ic_kind == "gaussian":
@@ -49,22 +56,29 @@ def solution_profile(t, k, U0, UL, ic_kind, C, A, x0, sigma, n_coeff=N_COEFF):
 
     us = steady_state(X, U0, UL)
     gx = u0 - us
-    bn = fourier_coeffs(gx, n_coeff)
+    if method == "dst":
+        n_coeff = min(int(n_coeff), max_modes(NX))
+    bn = fourier_coeffs(gx, n_coeff, method=method)
 
     n = np.arange(1, n_coeff + 1)[:, None]              # (n_coeff, 1)
     lam = (np.pi * n / L) ** 2                          # (n_coeff, 1)
     decay = np.exp(-k * lam * t)                        # (n_coeff, 1)
-    S = np.sin(n * np.pi * X[None, :] / L)              # (n_coeff, NX)
-    v = (bn[:, None] * decay * S).sum(axis=0)           # (NX,)
+    if method == "dst":
+        v = sine_synthesis(bn * decay[:, 0], NX)        # (NX,)
+    else:
+        S = np.sin(n * np.pi * X[None, :] / L)          # (n_coeff, NX)
+        v = (bn[:, None] * decay * S).sum(axis=0)       # (NX,)
 
     return (us + v), us, bn
 
-def compute_plot_data(ic_kind, show_modes, t, U0, UL, kappa, C, A, x0, sigma):
+def compute_plot_data(ic_kind, show_modes, t, U0, UL, kappa, C, A, x0, sigma,
+                      n_coeff=N_COEFF, method="quad"):
     """
     Returns data for Plotly:
       X, u, us, modes, L, Y_MIN, Y_MAX
 
     modes is a list of [y_mode, color, name] for n=1..5 if enabled.
+    method="dst" uses the fast sine transform (n_coeff up to NX-2).
     """
     t = float(t)
     U0 = float(U0); UL = float(UL)
@@ -72,7 +86,8 @@ def compute_plot_data(ic_kind, show_modes, t, U0, UL, kappa, C, A, x0, sigma):
     C = float(C); A = float(A)
     x0 = float(x0); sigma = float(sigma)
 
-    u, us, bn = solution_profile(t, kappa, U0, UL, ic_kind, C, A, x0, sigma, n_coeff=N_COEFF)
+    u, us, bn = solution_profile(t, kappa, U0, UL, ic_kind, C, A, x0, sigma,
+                                 n_coeff=int(n_coeff), method=method)
 
     modes_out = []
     if int(show_modes) == 1:
@@ -22,33 +22,48 @@ import numpy as np
 STATE = None  # global state for Pyodide session
 
 
-def _tridiag_solve(a, b, c, d):
+def _tridiag_factor(a, b, c):
     """
-    Solve tridiagonal system with vectors:
-      a: sub-diagonal (n-1)
-      b: diagonal (n)
-      c: super-diagonal (n-1)
-      d: RHS (n)
-    Returns x (n).
+    Thomas forward-elimination factors of a tridiagonal matrix, computed once
+    so that many right-hand sides can be solved with _tridiag_solve_lines:
+      cp:  modified super-diagonal (n-1)
+      inv: 1 / modified pivots (n)
     """
     n = b.size
     cp = np.empty(n-1, dtype=float)
-    dp = np.empty(n, dtype=float)
+    inv = np.empty(n, dtype=float)
 
-    # forward sweep
     beta = b[0]
-    dp[0] = d[0] / beta
+    inv[0] = 1.0 / beta
     for i in range(n-1):
         cp[i] = c[i] / beta
         beta = b[i+1] - a[i] * cp[i]
-        dp[i+1] = (d[i+1] - a[i] * dp[i]) / beta
+        inv[i+1] = 1.0 / beta
+    return cp, inv
+
+
+def _tridiag_solve_lines(a, factors, D):
+    """
+    Solve the same tridiagonal system for many right-hand sides at once.
+      a:       sub-diagonal (n-1)
+      factors: (cp, inv) from _tridiag_factor
+      D:       RHS array (n, m) -- one system per column
+    Returns X (n, m). The sweeps loop over n only; each step is vectorized
+    across all m lines.
+    """
+    cp, inv = factors
+    n = D.shape[0]
+    X = np.empty_like(D, dtype=float)
+
+    # forward sweep (X holds d' temporarily)
+    X[0] = D[0] * inv[0]
+    for i in range(1, n):
+        X[i] = (D[i] - a[i-1] * X[i-1]) * inv[i]
 
     # back substitution
-    x = np.empty(n, dtype=float)
-    x[-1] = dp[-1]
     for i in range(n-2, -1, -1):
-        x[i] = dp[i] - cp[i] * x[i+1]
-    return x
+        X[i] -= cp[i] * X[i+1]
+    return X
 
 
 def _bc_arrays(a, b, c, d, X, Y):
@@ -147,6 +162,10 @@ class Heat2DState:
         self.by = (1.0 + 2.0*self.ry) * np.ones(n_int)
         self.cy = -self.ry * np.ones(n_int-1)
 
+        # Coefficients are constant in time: factorize once, reuse every step
+        self.fx = _tridiag_factor(self.ax, self.bx, self.cx)
+        self.fy = _tridiag_factor(self.ay, self.by, self.cy)
+
     def step(self, nsteps=1):
         """
         Advance by nsteps using ADI Crank–Nicolson (Douglas):
@@ -155,47 +174,34 @@ class Heat2DState:
         Dirichlet BC enforced each substep.
         """
         nsteps = int(nsteps)
-        N = self.N
-        n_int = N - 2
+        rx, ry = self.rx, self.ry
 
         for _ in range(nsteps):
             U = self.U
             # Enforce BC each step (they are time-independent here)
             _apply_bc(U, self.left, self.right, self.bottom, self.top)
 
-            # ---- Step 1: solve along x for each interior y-index j
+            # ---- Step 1: solve along x, all interior y-lines j at once
+            # RHS = (I + ry Dyy) U^n on the interior, columns are the lines
             Ustar = U.copy()
+            rhs = U[1:-1, 1:-1] + ry * (U[1:-1, :-2] - 2.0*U[1:-1, 1:-1] + U[1:-1, 2:])
 
-            # RHS = (I + ry Dyy) U^n for interior
-            # For each (i,j): RHS = U[i,j] + ry*(U[i,j-1] -2U[i,j] + U[i,j+1])
-            # then solve (I - rx Dxx) Ustar[:,j] = RHS[:,j]
-            for j in range(1, N-1):
-                rhs = U[1:-1, j].copy()
-                rhs += self.ry * (U[1:-1, j-1] - 2.0*U[1:-1, j] + U[1:-1, j+1])
-
-                # add Dirichlet contributions from x-boundaries due to -rx Dxx
-                # equation for first interior i=1 includes +rx*U[0,j] on RHS; last includes +rx*U[N-1,j]
-                rhs[0] += self.rx * U[0, j]
-                rhs[-1] += self.rx * U[-1, j]
-
-                sol = _tridiag_solve(self.ax, self.bx, self.cx, rhs)
-                Ustar[1:-1, j] = sol
+            # Dirichlet contributions from x-boundaries due to -rx Dxx
+            rhs[0, :] += rx * U[0, 1:-1]
+            rhs[-1, :] += rx * U[-1, 1:-1]
 
+            Ustar[1:-1, 1:-1] = _tridiag_solve_lines(self.ax, self.fx, rhs)
             _apply_bc(Ustar, self.left, self.right, self.bottom, self.top)
 
-            # ---- Step 2: solve along y for each interior x-index i
+            # ---- Step 2: solve along y, all interior x-lines i at once
             Unew = Ustar.copy()
-            for i in range(1, N-1):
-                rhs = Ustar[i, 1:-1].copy()
-                rhs += self.rx * (Ustar[i-1, 1:-1] - 2.0*Ustar[i, 1:-1] + Ustar[i+1, 1:-1])
-
-                # Dirichlet contributions from y-boundaries
-                rhs[0] += self.ry * Ustar[i, 0]
-                rhs[-1] += self.ry * Ustar[i, -1]
+            rhs = Ustar[1:-1, 1:-1] + rx * (Ustar[:-2, 1:-1] - 2.0*Ustar[1:-1, 1:-1] + Ustar[2:, 1:-1])
 
-                sol = _tridiag_solve(self.ay, self.by, self.cy, rhs)
-                Unew[i, 1:-1] = sol
+            # Dirichlet contributions from y-boundaries
+            rhs[:, 0] += ry * Ustar[1:-1, 0]
+            rhs[:, -1] += ry * Ustar[1:-1, -1]
 
+            Unew[1:-1, 1:-1] = _tridiag_solve_lines(self.ay, self.fy, rhs.T).T
             _apply_bc(Unew, self.left, self.right, self.bottom, self.top)
 
             self.U = Unew
@@ -227,7 +233,6 @@ def get_plot_data():
     Uref = np.kron(U, np.ones((f, f)))
     xref = np.linspace(0.0, 1.0, Uref.shape[0])
     yref = np.linspace(0.0, 1.0, Uref.shape[1])
-    Xr, Yr = np.meshgrid(xref, yref, indexing="ij")
 
     # ranges
     umin = float(np.min(Uref))
@@ -236,10 +241,12 @@ def get_plot_data():
     zmin = umin - pad
     zmax = umax + pad
 
+    # NumPy arrays (typed arrays in JS): 1-D axes and z laid out the way
+    # Plotly expects with 1-D x, y, i.e. rows along y -> shape (ny, nx)
     return (
-        Xr.tolist(),
-        Yr.tolist(),
-        Uref.tolist(),
+        xref,
+        yref,
+        np.ascontiguousarray(Uref.T),
         STATE.t,
         zmin,
         zmax
@@ -13,11 +13,20 @@ import numpy as np
 #   u(x,0) = (1-x)*b + x*d
 #   u(x,1) = (1-x)*(1+a+b) + x*(1+c+d)
 #
-# Numerical solve: Gauss–Seidel SOR (stable for 0<omega<2).
+# Numerical solve (method=...):
+#   "sor"       : lexicographic Gauss–Seidel SOR (stable for 0<omega<2).
+#   "redblack"  : red-black ordered SOR, each half-sweep is one vectorized
+#                 NumPy slice update (same convergence theory as "sor").
+#   "multigrid" : geometric multigrid V-cycles (red-black Gauss–Seidel
+#                 smoothing, full-weighting restriction, bilinear
+#                 prolongation, dense solve on the coarsest grid).
+#                 Converges in O(N^2) work; needs N-1 divisible by 2 to coarsen.
 # NOTE: the previous version used a "weighted Jacobi" formula with
 # omega>1, which diverges. This version fixes that.
 # ============================================================
 
+METHODS = ("sor", "redblack", "multigrid")
+
 
 def _apply_boundary(U, x, y, a, b, c, d):
     # Left/right: functions of y
@@ -30,8 +39,136 @@ def _apply_boundary(U, x, y, a, b, c, d):
     return U
 
 
-def solve_laplace(a, b, c, d, N=31, iters=600, omega=1.85, tol=1e-6):
-    """Return (x, y, U) with U.shape=(N,N), U[i,j]=u(x_i,y_j)."""
+def residual_max(U):
+    """Max-norm of the 5-point residual, in update units: max |avg(nb) - u|."""
+    R = 0.25 * (U[2:, 1:-1] + U[:-2, 1:-1] + U[1:-1, 2:] + U[1:-1, :-2]) - U[1:-1, 1:-1]
+    return float(np.max(np.abs(R))) if R.size else 0.0
+
+
+# ---------- Red-black SOR (vectorized half-sweeps) ----------
+def _rb_half_sweep(U, i0, j0, omega, F=None, h2=0.0):
+    """
+    Update the interior points with i = i0, i0+2, ... and j = j0, j0+2, ...
+    (one colour class is two such sub-lattices). Optional RHS F for
+    Lu = F (used by the multigrid smoother). Returns max |change|.
+    """
+    N0, N1 = U.shape
+    I = slice(i0, N0 - 1, 2)
+    J = slice(j0, N1 - 1, 2)
+    nb = (U[i0 - 1:N0 - 2:2, J] + U[i0 + 1:N0:2, J]
+          + U[I, j0 - 1:N1 - 2:2] + U[I, j0 + 1:N1:2])
+    if F is not None:
+        nb = nb - h2 * F[I, J]
+    old = U[I, J]
+    new = (1.0 - omega) * old + omega * 0.25 * nb
+    dlt = float(np.max(np.abs(new - old))) if new.size else 0.0
+    U[I, J] = new
+    return dlt
+
+
+def redblack_sweep(U, omega=1.0, F=None, h2=0.0):
+    """One red-black SOR sweep in place. Returns max |change|."""
+    # red: i+j even, black: i+j odd (interior indices start at 1)
+    d1 = _rb_half_sweep(U, 1, 1, omega, F, h2)
+    d2 = _rb_half_sweep(U, 2, 2, omega, F, h2)
+    d3 = _rb_half_sweep(U, 1, 2, omega, F, h2)
+    d4 = _rb_half_sweep(U, 2, 1, omega, F, h2)
+    return max(d1, d2, d3, d4)
+
+
+# ---------- Geometric multigrid ----------
+_MG_DENSE_MAX = 1200  # coarsest-grid unknowns solved directly
+
+
+def _apply_L(U, h2):
+    """5-point Laplacian on the interior (zero outside)."""
+    R = np.zeros_like(U)
+    R[1:-1, 1:-1] = (U[2:, 1:-1] + U[:-2, 1:-1] + U[1:-1, 2:] + U[1:-1, :-2]
+                     - 4.0 * U[1:-1, 1:-1]) / h2
+    return R
+
+
+def _restrict(R):
+    """Full-weighting restriction of an interior field (boundary stays 0)."""
+    nc = (R.shape[0] - 1) // 2 + 1
+    C = np.zeros((nc, nc))
+    C[1:-1, 1:-1] = (
+        4.0 * R[2:-2:2, 2:-2:2]
+        + 2.0 * (R[1:-3:2, 2:-2:2] + R[3:-1:2, 2:-2:2] + R[2:-2:2, 1:-3:2] + R[2:-2:2, 3:-1:2])
+        + (R[1:-3:2, 1:-3:2] + R[3:-1:2, 1:-3:2] + R[1:-3:2, 3:-1:2] + R[3:-1:2, 3:-1:2])
+    ) / 16.0
+    return C
+
+
+def _prolong(C):
+    """Bilinear interpolation from a coarse grid to the next finer grid."""
+    nc = C.shape[0]
+    nf = 2 * (nc - 1) + 1
+    F = np.zeros((nf, nf))
+    F[::2, ::2] = C
+    F[1::2, ::2] = 0.5 * (C[:-1, :] + C[1:, :])
+    F[:, 1::2] = 0.5 * (F[:, :-1:2] + F[:, 2::2])
+    return F
+
+
+def _dense_laplacian(n, h2):
+    """Matrix of the 5-point Laplacian on an n x n interior (zero Dirichlet)."""
+    T = -2.0 * np.eye(n) + np.eye(n, k=1) + np.eye(n, k=-1)
+    I = np.eye(n)
+    return (np.kron(T, I) + np.kron(I, T)) / h2
+
+
+def _can_coarsen(N):
+    return (N - 1) % 2 == 0 and N >= 5 and (N - 2) ** 2 > _MG_DENSE_MAX // 4
+
+
+def _v_cycle(U, F, h, nu1=2, nu2=2):
+    """One V-cycle for L U = F (U holds the Dirichlet data on its boundary)."""
+    N = U.shape[0]
+    h2 = h * h
+
+    if not _can_coarsen(N):
+        n = N - 2
+        if n * n <= _MG_DENSE_MAX:
+            rhs = F[1:-1, 1:-1].copy()
+            rhs[0, :] -= U[0, 1:-1] / h2
+            rhs[-1, :] -= U[-1, 1:-1] / h2
+            rhs[:, 0] -= U[1:-1, 0] / h2
+            rhs[:, -1] -= U[1:-1, -1] / h2
+            sol = np.linalg.solve(_dense_laplacian(n, h2), rhs.ravel())
+            U[1:-1, 1:-1] = sol.reshape(n, n)
+        else:
+            for _ in range(50):
+                redblack_sweep(U, 1.0, F, h2)
+        return U
+
+    for _ in range(nu1):
+        redblack_sweep(U, 1.0, F, h2)
+
+    R = F - _apply_L(U, h2)
+    R[0, :] = R[-1, :] = R[:, 0] = R[:, -1] = 0.0
+    Rc = _restrict(R)
+    Ec = _v_cycle(np.zeros_like(Rc), Rc, 2.0 * h, nu1, nu2)
+    U[1:-1, 1:-1] += _prolong(Ec)[1:-1, 1:-1]
+
+    for _ in range(nu2):
+        redblack_sweep(U, 1.0, F, h2)
+    return U
+
+
+def solve_laplace(a, b, c, d, N=31, iters=600, omega=1.85, tol=1e-6,
+                  method="sor", return_info=False):
+    """
+    Return (x, y, U) with U.shape=(N,N), U[i,j]=u(x_i,y_j).
+
+    method: "sor", "redblack" or "multigrid" (see header). iters caps the
+    number of sweeps (SOR) or V-cycles (multigrid). Multigrid with an even N
+    falls back to "redblack" with the optimal omega for N and the cap raised
+    to at least N*N sweeps.
+    With return_info=True returns (x, y, U, info), info = {"method",
+    "iters", "residual"}; method is the one actually used and residual is
+    residual_max(U).
+    """
 
     a = float(a)
     b = float(b)
@@ -62,8 +199,35 @@ def solve_laplace(a, b, c, d, N=31, iters=600, omega=1.85, tol=1e-6):
     U[1:-1, 1:-1] = U0[1:-1, 1:-1]
     U = _apply_boundary(U, x, y, a, b, c, d)
 
+    method = str(method).lower()
+    if method not in METHODS:
+        raise ValueError(f"unknown method {method!r}; expected one of {METHODS}")
+    if method == "multigrid" and (N - 1) % 2 != 0:
+        # cannot coarsen an even number of points: use the single-grid solver
+        # with the optimal SOR omega for this grid (about (N-1)/(2 pi) ln(1/tol)
+        # sweeps, well inside the N*N cap) rather than a handful of V-cycles
+        method = "redblack"
+        omega = 2.0 / (1.0 + np.sin(np.pi / (N - 1)))
+        iters = max(iters, N * N)
+
+    n_done = 0
+    if method == "multigrid":
+        h = x[1] - x[0]
+        F = np.zeros_like(U)
+        for n_done in range(1, iters + 1):
+            U = _v_cycle(U, F, h)
+            if residual_max(U) < tol:
+                break
+        return _solve_result(x, y, U, method, n_done, return_info)
+
+    if method == "redblack":
+        for n_done in range(1, iters + 1):
+            if redblack_sweep(U, omega) < tol:
+                break
+        return _solve_result(x, y, U, method, n_done, return_info)
+
     # SOR sweep
-    for _ in range(iters):
+    for n_done in range(1, iters + 1):
         max_delta = 0.0
 
         for i in range(1, N - 1):
@@ -81,13 +245,25 @@ def solve_laplace(a, b, c, d, N=31, iters=600, omega=1.85, tol=1e-6):
         if max_delta < tol:
             break
 
-    return x, y, U
+    return _solve_result(x, y, U, method, n_done, return_info)
+
+
+def _solve_result(x, y, U, method, n_done, return_info):
+    if not return_info:
+        return x, y, U
+    info = {"method": method, "iters": int(n_done), "residual": residual_max(U)}
+    return x, y, U, info
 
 
-def compute_plot_data(a, b, c, d, N=31, iters=600):
-    """Return (x, y, Z, zmin, zmax) JSON-friendly for Plotly."""
+def compute_plot_data(a, b, c, d, N=31, iters=600, method="sor"):
+    """
+    Return (x, y, Z, zmin, zmax, n_iter, residual, method) JSON-friendly for
+    Plotly. n_iter is the number of sweeps / V-cycles used, residual the
+    final residual_max of the solution and method the solver actually used.
+    """
 
-    x, y, U = solve_laplace(a, b, c, d, N=N, iters=iters)
+    x, y, U, info = solve_laplace(a, b, c, d, N=N, iters=iters, method=method,
+                                  return_info=True)
 
     zmin = float(np.min(U))
     zmax = float(np.max(U))
@@ -95,4 +271,5 @@ def compute_plot_data(a, b, c, d, N=31, iters=600):
     zmin -= pad
     zmax += pad
 
-    return (x.tolist(), y.tolist(), U.tolist(), zmin, zmax)
+    return (x.tolist(), y.tolist(), U.tolist(), zmin, zmax, info["iters"], info["residual"],
+            info["method"])
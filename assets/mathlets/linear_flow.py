@@ -0,0 +1,142 @@
+# linear_flow.py
+# Pyodide-friendly (numpy only)
+# Closed-form flow of a constant-coefficient linear system X' = A X:
+#   X(t) = expm(t A) X0
+# Shared by the linear-system mathlets in place of RK4. The page loads this
+# file before the mathlet module so both live in the same Python globals.
+
+import numpy as np
+
+# Eigenvector matrices worse conditioned than this are treated as defective
+# (repeated eigenvalues, Jordan blocks) and use scaling-and-squaring instead.
+EIG_COND_MAX = 1e6
+
+# ---------- Sample times 0, h, 2h, ... towards t_end ----------
+def sample_times(t_end, h, exact_end=True):
+    """
+    Fixed-step sample times 0, h, 2h, ... with h carrying the sign of
+    t_end. With exact_end=True a final shorter step lands exactly on t_end;
+    otherwise the grid stops at the last full step.
+    """
+    t_end = float(t_end)
+    h = abs(float(h))
+    if t_end == 0 or h == 0:
+        return np.zeros(1)
+    n_full = int(abs(t_end) / h)
+    ts = np.arange(n_full + 1) * h
+    if exact_end and abs(t_end) - ts[-1] > 1e-12 * max(1.0, abs(t_end)):
+        ts = np.append(ts, abs(t_end))
+    return np.sign(t_end) * ts
+
+# ---------- Batched matrix exponential ----------
+def expm_batch(A, ts, order=18):
+    """
+    expm(t A) for every t in ts, returned as an array (len(ts), d, d).
+    Taylor series plus scaling-and-squaring, done for all times at once.
+    """
+    A = np.asarray(A, dtype=float)
+    ts = np.atleast_1d(np.asarray(ts, dtype=float))
+    d = A.shape[0]
+
+    M = ts[:, None, None] * A[None, :, :]
+    norm = float(np.max(np.abs(ts))) * float(np.linalg.norm(A, 1)) if ts.size else 0.0
+    s = max(0, int(np.ceil(np.log2(norm))) + 1) if norm > 0 else 0
+    M = M / (2.0 ** s)
+
+    E = np.broadcast_to(np.eye(d), M.shape).copy()
+    term = E.copy()
+    for k in range(1, order + 1):
+        term = term @ M / k
+        E += term
+    for _ in range(s):
+        E = E @ E
+    return E
+
+# ---------- Cached decomposition of A ----------
+class LinearFlow:
+    """
+    Precomputes what is needed to evaluate expm(t A) X0 for many seeds and
+    times: an eigendecomposition when A is safely diagonalizable, otherwise
+    nothing (expm_batch is used per call).
+    """
+
+    def __init__(self, A):
+        self.A = np.array(A, dtype=float)
+        self.dim = self.A.shape[0]
+        self.w = None
+        self.V = None
+        self.Vinv = None
+        try:
+            w, V = np.linalg.eig(self.A)
+            if np.all(np.isfinite(w)) and np.linalg.cond(V) < EIG_COND_MAX:
+                self.w, self.V, self.Vinv = w, V, np.linalg.inv(V)
+        except np.linalg.LinAlgError:
+            pass
+
+    @property
+    def diagonalizable(self):
+        return self.w is not None
+
+    def states(self, X0, ts):
+        """
+        X0: (n, d) seeds, ts: (k,) times.
+        Returns an array (n, k, d) with the exact state of every seed at every time.
+        """
+        X0 = np.asarray(X0, dtype=float).reshape(-1, self.dim)
+        ts = np.atleast_1d(np.asarray(ts, dtype=float))
+
+        if self.diagonalizable:
+            C = X0 @ self.Vinv.T                              # (n, d) modal coords
+            growth = np.exp(ts[:, None] * self.w[None, :])    # (k, d)
+            P = (C[:, None, :] * growth[None, :, :]) @ self.V.T
+            return np.real(P)
+
+        E = expm_batch(self.A, ts)                            # (k, d, d)
+        return np.einsum("kij,nj->nki", E, X0)
+
+_FLOW_CACHE = {"key": None, "flow": None}
+
+def get_flow(A):
+    """One decomposition per parameter change: reuse it while A is unchanged."""
+    A = np.asarray(A, dtype=float)
+    key = A.tobytes()
+    if _FLOW_CACHE["key"] != key:
+        _FLOW_CACHE["key"] = key
+        _FLOW_CACHE["flow"] = LinearFlow(A)
+    return _FLOW_CACHE["flow"]
+
+def linear_flow(A, X0, ts):
+    """Exact states expm(t A) X0 with shape (n_seeds, n_times, dim)."""
+    return get_flow(A).states(X0, ts)
+
+# ---------- Truncate at the clip region ----------
+def clip_paths(P, clip, norm="box"):
+    """
+    P: (n, k, d) states. Each path is cut before its first sample that leaves
+    the clip region or is non-finite; the seed itself is always kept.
+    norm="box" tests max|x_i| <= clip, norm="ball" tests the Euclidean norm.
+    Returns a list of (L_i, d) arrays.
+    """
+    if norm == "ball":
+        size = np.sqrt(np.sum(P * P, axis=-1))
+    else:
+        size = np.max(np.abs(P), axis=-1)
+    bad = ~np.all(np.isfinite(P), axis=-1) | (size > clip)
+    bad[:, 0] = False
+    lengths = np.where(bad.any(axis=1), bad.argmax(axis=1), P.shape[1])
+    return [P[i, :lengths[i]] for i in range(P.shape[0])]
+
+def nan_join(polylines):
+    """Concatenate polylines into one array with NaN breaks (Plotly gaps)."""
+    parts = []
+    for p in polylines:
+        parts.append(np.asarray(p, dtype=float))
+        parts.append(np.array([np.nan]))
+    if not parts:
+        return np.empty(0)
+    return np.concatenate(parts[:-1])
+
+def linear_paths(A, X0, t_end, h, clip, norm="box", exact_end=True):
+    """Clipped exact trajectories sampled on the sample_times grid."""
+    ts = sample_times(t_end, h, exact_end=exact_end)
+    return clip_paths(linear_flow(A, X0, ts), clip, norm=norm)
@@ -6,8 +6,10 @@ import numpy as np
 #   dy/dt = x (rho - z) - y
 #   dz/dt = x y - beta z
 #
-# Integrated with a fixed-step RK4 scheme.
-# Returned arrays are JSON-friendly lists for Plotly.
+# Integrated with the adaptive Dormand–Prince scheme from dopri.py (loaded
+# by the page first) and sampled every dt for display; the fixed-step RK4
+# path is kept as method="rk4".
+# Returned arrays are contiguous float64 NumPy arrays (typed arrays in JS).
 # ==========================================================
 
 def lorenz_rhs(state, sigma, rho, beta):
@@ -36,16 +38,39 @@ def rk4_trajectory(x0, y0, z0, sigma, rho, beta, tmax=40.0, dt=0.01):
         state = state + (dt/6.0)*(k1 + 2*k2 + 2*k3 + k4)
         traj[i] = state
 
-    return t, traj[:,0], traj[:,1], traj[:,2]
+    x, y, z = np.ascontiguousarray(traj.T)
+    return t, x, y, z
 
-def compute_plot_data(sigma, rho, beta, x0, y0, z0, tmax, dt):
+# Local error tolerances: slightly more accurate than RK4 at dt = 0.01 for
+# about the same work; unlike RK4 the cost does not grow as dt shrinks.
+RTOL = 1e-7
+ATOL = 1e-7
+
+def dopri_trajectory(x0, y0, z0, sigma, rho, beta, tmax=40.0, dt=0.01, rtol=RTOL, atol=ATOL):
+    """Same samples as rk4_trajectory (t = 0, dt, 2dt, ...); steps chosen adaptively."""
+    sigma = float(sigma); rho = float(rho); beta = float(beta)
+
+    t = output_grid(tmax, dt)
+    rhs = lambda _t, s: lorenz_rhs(s, sigma, rho, beta)
+    t, S, _ = dopri45(rhs, (0.0, t[-1]), [float(x0), float(y0), float(z0)],
+                      t_eval=t, rtol=rtol, atol=atol)
+    x, y, z = np.ascontiguousarray(S.T)
+    return t, x, y, z
+
+def compute_plot_data(sigma, rho, beta, x0, y0, z0, tmax, dt, method="dopri", tol_px=DEFAULT_TOL_PX):
     """Compute trajectory + padded ranges for plotting.
 
+    dt is the output spacing; with method="rk4" it is also the step.
+    The samples are then thinned for display (decimate.py, loaded by the
+    page first): no drawn point moves by more than tol_px pixels in the
+    3-D box or the time series; tol_px=0 returns every sample.
+
     Returns:
       t, x, y, z,
       x_min, x_max, y_min, y_max, z_min, z_max
     """
-    t, x, y, z = rk4_trajectory(x0, y0, z0, sigma, rho, beta, tmax=tmax, dt=dt)
+    integrate = dopri_trajectory if method == "dopri" else rk4_trajectory
+    t, x, y, z = integrate(x0, y0, z0, sigma, rho, beta, tmax=tmax, dt=dt)
 
     def padded_range(a):
         amin = float(np.min(a)); amax = float(np.max(a))
@@ -59,7 +84,216 @@ def compute_plot_data(sigma, rho, beta, x0, y0, z0, tmax, dt):
     ymn, ymx = padded_range(y)
     zmn, zmx = padded_range(z)
 
+    keep = decimate([t, x, y, z], ranges=[(t[0], t[-1]), (xmn, xmx), (ymn, ymx), (zmn, zmx)],
+                    tol_px=tol_px)
+    t, x, y, z = t[keep], x[keep], y[keep], z[keep]
+
     return (
-        t.tolist(), x.tolist(), y.tolist(), z.tolist(),
+        t, x, y, z,
         xmn, xmx, ymn, ymx, zmn, zmx
     )
+
+# ==========================================================
+# Analysis: Lyapunov spectrum and invariant density
+#
+# Both average over an ensemble of trajectories started near (x0, y0, z0)
+# and integrated together (fixed-step RK4 on (3, n) arrays), so the cost per
+# step is a few NumPy calls however many members there are. The work is cut
+# into chunks of steps; iter_analysis() yields after each one so the page
+# can repaint between chunks.
+#
+# Lyapunov spectrum: each member carries an orthonormal frame Q (3 x 3)
+# moved by the tangent (linearized) flow J(x) Q and re-orthonormalized by QR
+# every QR_EVERY steps; the exponents are the time averages of log |diag R|.
+# Their sum must equal the trace of J, -(sigma + 1 + beta).
+#
+# Invariant density: (x, z) samples of every member at every step go into a
+# fixed 2-D histogram; the trajectory itself is never stored.
+# ==========================================================
+ANALYSIS_DT = 0.01
+T_TRANSIENT = 20.0         # time to settle onto the attractor first
+LYAP_N = 16                # members carrying a tangent frame
+LYAP_T = 100.0
+QR_EVERY = 10
+DENSITY_N = 1000           # members sampled for the histogram
+DENSITY_STEPS = 1_000_000  # total (x, z) samples
+DENSITY_BINS = 120
+CHUNK_STEPS = 200
+
+def _lorenz_batch(S, p):
+    """RHS for S (3, n); p = (sigma, rho, beta) fixed for the run."""
+    sigma, rho, beta = p
+    x, y, z = S
+    return np.stack((sigma*(y - x), x*(rho - z) - y, x*y - beta*z))
+
+def _tangent_batch(S, Q, p):
+    """J(S) Q for frames Q (n, 3, 3), rows of J written out."""
+    sigma, rho, beta = p
+    x = S[0][:, None]; y = S[1][:, None]; z = S[2][:, None]
+    q0, q1, q2 = Q[:, 0], Q[:, 1], Q[:, 2]
+    return np.stack((sigma*(q1 - q0), (rho - z)*q0 - q1 - x*q2, y*q0 + x*q1 - beta*q2), axis=1)
+
+def _rk4_batch(S, h, p):
+    k1 = _lorenz_batch(S, p)
+    k2 = _lorenz_batch(S + 0.5*h*k1, p)
+    k3 = _lorenz_batch(S + 0.5*h*k2, p)
+    k4 = _lorenz_batch(S + h*k3, p)
+    return S + (h/6.0)*(k1 + 2*k2 + 2*k3 + k4)
+
+def _rk4_tangent(S, Q, h, p):
+    k1 = _lorenz_batch(S, p);          l1 = _tangent_batch(S, Q, p)
+    S2 = S + 0.5*h*k1
+    k2 = _lorenz_batch(S2, p);         l2 = _tangent_batch(S2, Q + 0.5*h*l1, p)
+    S3 = S + 0.5*h*k2
+    k3 = _lorenz_batch(S3, p);         l3 = _tangent_batch(S3, Q + 0.5*h*l2, p)
+    S4 = S + h*k3
+    k4 = _lorenz_batch(S4, p);         l4 = _tangent_batch(S4, Q + h*l3, p)
+    return (S + (h/6.0)*(k1 + 2*k2 + 2*k3 + k4),
+            Q + (h/6.0)*(l1 + 2*l2 + 2*l3 + l4))
+
+def _ensemble(x0, y0, z0, n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.array([x0, y0, z0], dtype=float)[:, None] + 1e-3*rng.standard_normal((3, n))
+
+def _kaplan_yorke(lam):
+    """Lyapunov (Kaplan–Yorke) dimension from a sorted spectrum."""
+    c = np.cumsum(lam)
+    k = int(np.sum(c >= 0))
+    if k == 0:
+        return 0.0
+    if k >= len(lam):
+        return float(len(lam))
+    return k + float(c[k-1]) / abs(float(lam[k]))
+
+def iter_analysis(sigma, rho, beta, x0=1.0, y0=1.0, z0=1.0, dt=ANALYSIS_DT,
+                  t_transient=T_TRANSIENT, lyap_n=LYAP_N, lyap_t=LYAP_T, qr_every=QR_EVERY,
+                  density_n=DENSITY_N, density_steps=DENSITY_STEPS, bins=DENSITY_BINS,
+                  chunk_steps=CHUNK_STEPS):
+    """
+    Yields (done, total, result) after every chunk of steps; `result` holds
+    the running estimates:
+      lyap (3,)         spectrum, largest first (time averages so far)
+      lyap_sum, trace   their sum and the exact -(sigma + 1 + beta)
+      dim_ky            Kaplan–Yorke dimension
+      x_edges, z_edges  histogram bin edges (bins + 1,)
+      density (bins_z, bins_x)  normalized (x, z) density, row = z bin
+      samples           (x, z) samples binned so far
+    """
+    p = (float(sigma), float(rho), float(beta))    # fixed for the whole run
+    h = float(dt)
+    n_lyap = int(round(float(lyap_t) / h))
+    n_dens = max(1, int(density_steps) // int(density_n))
+    n_trans = int(round(float(t_transient) / h))
+    chunk_steps = int(chunk_steps)
+    total = n_trans + n_lyap + n_dens
+    done = 0
+
+    result = {"lyap": np.full(3, np.nan), "lyap_sum": np.nan, "trace": -(p[0] + 1.0 + p[2]),
+              "dim_ky": np.nan, "x_edges": None, "z_edges": None, "density": None, "samples": 0,
+              "sigma": p[0], "rho": p[1], "beta": p[2]}
+
+    # --- transient: one ensemble, the first lyap_n members get frames later
+    S = _ensemble(float(x0), float(y0), float(z0), max(int(lyap_n), int(density_n)))
+    with np.errstate(all="ignore"):
+        while done < n_trans:
+            m = min(chunk_steps, n_trans - done)
+            for _ in range(m):
+                S = _rk4_batch(S, h, p)
+            done += m
+            yield done, total, result
+
+        # --- Lyapunov spectrum
+        SL = S[:, :int(lyap_n)].copy()
+        Q = np.broadcast_to(np.eye(3), (SL.shape[1], 3, 3)).copy()
+        log_r = np.zeros((SL.shape[1], 3))
+        steps = 0
+        while steps < n_lyap:
+            m = min(chunk_steps, n_lyap - steps)
+            for _ in range(m):
+                SL, Q = _rk4_tangent(SL, Q, h, p)
+                steps += 1
+                if steps % qr_every == 0 or steps == n_lyap:
+                    Q, R = np.linalg.qr(Q)
+                    log_r += np.log(np.abs(np.diagonal(R, axis1=1, axis2=2)))
+            done += m
+            ok = np.all(np.isfinite(log_r), axis=1)
+            if ok.any():
+                lam = np.sort(np.mean(log_r[ok], axis=0) / (steps * h))[::-1]
+                result["lyap"] = lam
+                result["lyap_sum"] = float(np.sum(lam))
+                result["dim_ky"] = _kaplan_yorke(lam)
+            yield done, total, result
+
+        # --- invariant density of (x, z): fixed bins from the settled ensemble
+        SD = S[:, :int(density_n)]
+        finite = np.all(np.isfinite(SD), axis=0)
+        SD = SD[:, finite]
+        def edges(a):
+            lo, hi = (float(np.min(a)), float(np.max(a))) if a.size else (-1.0, 1.0)
+            pad = max(0.25*(hi - lo), 1.0)     # a fixed point still gets unit-size bins
+            return np.linspace(lo - pad, hi + pad, int(bins) + 1)
+        xe, ze = edges(SD[0]), edges(SD[2])
+        counts = np.zeros(int(bins) * int(bins))
+        inv_dx = int(bins) / (xe[-1] - xe[0])
+        inv_dz = int(bins) / (ze[-1] - ze[0])
+        result["x_edges"], result["z_edges"] = xe, ze
+        samples = 0
+        steps = 0
+        while steps < n_dens:
+            m = min(chunk_steps, n_dens - steps)
+            for _ in range(m):
+                SD = _rk4_batch(SD, h, p)
+                ix = np.floor((SD[0] - xe[0]) * inv_dx)
+                iz = np.floor((SD[2] - ze[0]) * inv_dz)
+                inside = (ix >= 0) & (ix < bins) & (iz >= 0) & (iz < bins)
+                counts += np.bincount((iz[inside]*bins + ix[inside]).astype(np.intp),
+                                      minlength=counts.size)
+                samples += SD.shape[1]
+            steps += m
+            done += m
+            cell = (xe[1] - xe[0]) * (ze[1] - ze[0])
+            result["density"] = counts.reshape(int(bins), int(bins)) / (max(samples, 1) * cell)
+            result["samples"] = samples
+            yield done, total, result
+
+def lyapunov_analysis(sigma, rho, beta, x0=1.0, y0=1.0, z0=1.0, progress=None, **kw):
+    """Whole analysis at once; progress(done, total) is called after each chunk."""
+    result = None
+    for done, total, result in iter_analysis(sigma, rho, beta, x0, y0, z0, **kw):
+        if progress is not None:
+            progress(done, total)
+    return result
+
+# Incremental driver for the page: one chunk per call.
+ANALYSIS = {"it": None, "result": None, "done": 0, "total": 0}
+
+def analysis_start(sigma, rho, beta, x0=1.0, y0=1.0, z0=1.0):
+    ANALYSIS["it"] = iter_analysis(sigma, rho, beta, x0, y0, z0)
+    ANALYSIS["result"] = None
+    ANALYSIS["done"] = 0
+    ANALYSIS["total"] = 0
+
+def analysis_step():
+    """Advance one chunk; returns [done, total] (done == total at the end)."""
+    if ANALYSIS["it"] is not None:
+        try:
+            ANALYSIS["done"], ANALYSIS["total"], ANALYSIS["result"] = next(ANALYSIS["it"])
+        except StopIteration:
+            ANALYSIS["it"] = None
+        if ANALYSIS["done"] >= ANALYSIS["total"]:
+            ANALYSIS["it"] = None
+    return [ANALYSIS["done"], ANALYSIS["total"]]
+
+def analysis_result():
+    """Current estimates; arrays as NumPy (typed arrays on the JS side)."""
+    r = ANALYSIS["result"]
+    if r is None:
+        return None
+    out = dict(r)
+    out["lyap"] = [float(v) for v in r["lyap"]]
+    if r["density"] is not None:
+        xe, ze = r["x_edges"], r["z_edges"]
+        out["x_centers"] = 0.5*(xe[:-1] + xe[1:])
+        out["z_centers"] = 0.5*(ze[:-1] + ze[1:])
+        out["density"] = np.ascontiguousarray(r["density"])
+    return out
@@ -9,7 +9,8 @@ import numpy as np
 # x(t): prey population
 # y(t): predator population
 #
-# We integrate with a fixed-step RK4 solver (Pyodide-friendly).
+# We integrate with the adaptive Dormand–Prince solver from dopri.py (loaded
+# by the page first) and sample every DT; rk4() keeps the fixed-step solver.
 # =====================================================
 
 # Defaults (chosen for a nice closed orbit)
@@ -17,6 +18,8 @@ X0_DEFAULT = 10.0
 Y0_DEFAULT = 5.0
 T_MAX = 30.0
 DT = 0.01
+RTOL = 1e-11
+ATOL = 1e-11
 
 def rhs(x, y, alpha, beta, gamma, delta):
     dx = alpha * x - beta * x * y
@@ -52,6 +55,20 @@ def rk4(alpha, beta, gamma, delta, x0=X0_DEFAULT, y0=Y0_DEFAULT, t_max=T_MAX, dt
 
     return t, x, y
 
+def dopri(alpha, beta, gamma, delta, x0=X0_DEFAULT, y0=Y0_DEFAULT, t_max=T_MAX, dt=DT):
+    """Same output grid as rk4(); steps chosen by the error estimate."""
+    alpha = float(alpha); beta = float(beta); gamma = float(gamma); delta = float(delta)
+
+    def f(_t, s):
+        dx, dy = rhs(s[0], s[1], alpha, beta, gamma, delta)
+        return np.array([dx, dy])
+
+    t = output_grid(t_max, dt)
+    s0 = [max(float(x0), 0.0), max(float(y0), 0.0)]
+    t, S, _ = dopri45(f, (0.0, t[-1]), s0, t_eval=t, rtol=RTOL, atol=ATOL)
+    S = np.maximum(S, 0.0)   # keep non-negative (numerical guard)
+    return t, np.ascontiguousarray(S[:, 0]), np.ascontiguousarray(S[:, 1])
+
 def axis_range(vals, pad_frac=0.08, min_span=1.0):
     vmin = float(np.min(vals))
     vmax = float(np.max(vals))
@@ -64,7 +81,7 @@ def axis_range(vals, pad_frac=0.08, min_span=1.0):
     pad = pad_frac * span
     return (max(vmin - pad, 0.0), vmax + pad)
 
-def compute_plot_data(alpha, beta, gamma, delta):
+def compute_plot_data(alpha, beta, gamma, delta, method="dopri"):
     """
     Returns JSON-friendly Plotly data:
       t, x, y, phase_x, phase_y, x_range, y_range, t_max
@@ -72,7 +89,8 @@ def compute_plot_data(alpha, beta, gamma, delta):
     - phase_x, phase_y are identical to x, y (trajectory in x–y plane).
     - ranges are [min,max] for axes (with padding).
     """
-    t, x, y = rk4(alpha, beta, gamma, delta)
+    integrate = dopri if method == "dopri" else rk4
+    t, x, y = integrate(alpha, beta, gamma, delta)
 
     xr = axis_range(x)
     yr = axis_range(y)
@@ -1,3 +1,5 @@
+import math
+
 import numpy as np
 
 # =====================================================
@@ -9,6 +11,12 @@ import numpy as np
 # A conserved quantity (first integral) is:
 #   C(x,y) = δ x - γ ln(x) + β y - α ln(y)
 # (for x>0, y>0). Along exact solutions, C is constant.
+#
+# In log variables u = ln x, v = ln y the system is Hamiltonian with the
+# separable H(u, v) = C = (δ e^u - γ u) + (β e^v - α v):
+#   u' = α - β e^v,   v' = δ e^u - γ
+# so the symplectic splitting of symplectic.py (loaded by the page first)
+# applies; positivity is automatic since x = e^u.
 # =====================================================
 
 def _rk4_step(f, t, z, h, params):
@@ -26,26 +34,18 @@ def _lv_rhs(t, z, p):
     return np.array([dx, dy], dtype=float)
 
 def conserved_charge(x, y, alpha, beta, gamma, delta):
-    # guard against non-positive values (log domain)
-    x = max(float(x), 1e-12)
-    y = max(float(y), 1e-12)
+    # guard against non-positive values (log domain); works on arrays
+    x = np.maximum(np.asarray(x, dtype=float), 1e-12)
+    y = np.maximum(np.asarray(y, dtype=float), 1e-12)
     alpha = float(alpha); beta = float(beta); gamma = float(gamma); delta = float(delta)
     return delta*x - gamma*np.log(x) + beta*y - alpha*np.log(y)
 
-def simulate(alpha, beta, gamma, delta, x0, y0, tmax=30.0, nsteps=1200):
-    alpha = float(alpha); beta = float(beta); gamma = float(gamma); delta = float(delta)
-    x0 = float(x0); y0 = float(y0)
-
-    tmax = float(tmax); nsteps = int(nsteps)
-    if nsteps < 10:
-        nsteps = 10
-    h = tmax/(nsteps-1)
-
+def _rk4_path(alpha, beta, gamma, delta, x0, y0, t, h):
     p = {"alpha": alpha, "beta": beta, "gamma": gamma, "delta": delta}
-    t = np.linspace(0.0, tmax, nsteps)
+    nsteps = t.size
 
     z = np.zeros((nsteps, 2), dtype=float)
-    z[0, :] = [max(x0, 1e-12), max(y0, 1e-12)]
+    z[0, :] = [x0, y0]
 
     for i in range(nsteps-1):
         z[i+1, :] = _rk4_step(_lv_rhs, t[i], z[i, :], h, p)
@@ -53,12 +53,39 @@ def simulate(alpha, beta, gamma, delta, x0, y0, tmax=30.0, nsteps=1200):
         z[i+1, 0] = max(z[i+1, 0], 1e-12)
         z[i+1, 1] = max(z[i+1, 1], 1e-12)
 
-    x = z[:, 0]
-    y = z[:, 1]
+    return z[:, 0], z[:, 1]
+
+def _symplectic_path(alpha, beta, gamma, delta, x0, y0, h, nsteps):
+    """4th-order Yoshida splitting in (u, v) = (ln x, ln y)."""
+    du = lambda v: alpha - beta*np.exp(v)
+    dv = lambda u: delta*np.exp(u) - gamma
+    # overflow gives inf (not OverflowError), so splitting cuts the orbit at
+    # its first non-finite sample
+    with np.errstate(over="ignore", invalid="ignore"):
+        U, V = splitting(du, dv, math.log(x0), math.log(y0), h, nsteps-1, coeffs=YOSHIDA4)
+    return np.exp(U), np.exp(V)
+
+def simulate(alpha, beta, gamma, delta, x0, y0, tmax=30.0, nsteps=1200, method="symplectic"):
+    alpha = float(alpha); beta = float(beta); gamma = float(gamma); delta = float(delta)
+    x0 = max(float(x0), 1e-12); y0 = max(float(y0), 1e-12)
+
+    tmax = float(tmax); nsteps = int(nsteps)
+    if nsteps < 10:
+        nsteps = 10
+    h = tmax/(nsteps-1)
+
+    t = np.linspace(0.0, tmax, nsteps)
+
+    if method == "symplectic":
+        x, y = _symplectic_path(alpha, beta, gamma, delta, x0, y0, h, nsteps)
+        t = t[:x.size]
+    else:
+        x, y = _rk4_path(alpha, beta, gamma, delta, x0, y0, t, h)
 
-    C0 = conserved_charge(x[0], y[0], alpha, beta, gamma, delta)
-    C = np.array([conserved_charge(xi, yi, alpha, beta, gamma, delta) for xi, yi in zip(x, y)])
-    drift = float(np.max(np.abs(C - C0)))
+    # first-integral drift over the whole orbit (one vectorized pass)
+    C = conserved_charge(x, y, alpha, beta, gamma, delta)
+    C0 = float(C[0])
+    drift = float(invariant_drift(C))
 
     return t, x, y, C0, drift
 
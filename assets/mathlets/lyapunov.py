@@ -33,46 +33,75 @@ def _to_expr(s: str) -> sp.Expr:
         return sp.Integer(0)
     return parse_expr(s, local_dict=_ALLOWED, transformations=_TRANSFORMS, evaluate=True)
 
+# Parsed/lambdified formulas come from the shared LRU in expr_cache.py
+# (loaded by the page first): unchanged f, g never reach sympy again.
 def compile_system(f_str: str, g_str: str):
-    f_expr = _to_expr(f_str)
-    g_expr = _to_expr(g_str)
-    f_num = sp.lambdify((x, y), f_expr, modules=['numpy'])
-    g_num = sp.lambdify((x, y), g_expr, modules=['numpy'])
-    return f_expr, g_expr, f_num, g_num, sp.latex(f_expr), sp.latex(g_expr)
-
-def integrate_rk4(f_num, g_num, x0, y0, T=4.0, dt=0.01, max_steps=20000):
+    f = compile_expr('lyapunov', f_str, _to_expr, (x, y))
+    g = compile_expr('lyapunov', g_str, _to_expr, (x, y))
+    return f.expr, g.expr, f.func, g.func, f.latex, g.latex
+
+def _as_field(v, shape):
+    # constant formulas lambdify to plain scalars
+    return np.broadcast_to(np.asarray(v, dtype=float), shape)
+
+def integrate_rk4_ensemble(f_num, g_num, x0s, y0s, T=4.0, dt=0.01, max_steps=20000):
+    """
+    RK4 for all seeds at once: each step is one vectorized call of f_num and
+    g_num per stage. A seed that produces a non-finite value is frozen there
+    (its path keeps that last point, as in the scalar loop) and the others
+    go on. Returns t (steps+1,), X, Y (steps+1, n) and lengths (n,).
+    """
     T = float(T); dt = float(dt)
     steps = int(min(max_steps, max(1, round(T / dt))))
     t = np.linspace(0.0, steps*dt, steps+1)
-    X = np.empty(steps+1); Y = np.empty(steps+1)
-    X[0] = float(x0); Y[0] = float(y0)
-
-    for i in range(steps):
-        xi, yi = X[i], Y[i]
-
-        k1x = f_num(xi, yi); k1y = g_num(xi, yi)
-        k2x = f_num(xi + 0.5*dt*k1x, yi + 0.5*dt*k1y); k2y = g_num(xi + 0.5*dt*k1x, yi + 0.5*dt*k1y)
-        k3x = f_num(xi + 0.5*dt*k2x, yi + 0.5*dt*k2y); k3y = g_num(xi + 0.5*dt*k2x, yi + 0.5*dt*k2y)
-        k4x = f_num(xi + dt*k3x, yi + dt*k3y); k4y = g_num(xi + dt*k3x, yi + dt*k3y)
+    xc = np.asarray(x0s, dtype=float).ravel().copy()
+    yc = np.asarray(y0s, dtype=float).ravel().copy()
+    n = xc.size
+    X = np.empty((steps+1, n)); Y = np.empty((steps+1, n))
+    X[0] = xc; Y[0] = yc
+    lengths = np.full(n, steps+1)
+    alive = np.ones(n, dtype=bool)
+
+    with np.errstate(all='ignore'):
+        for i in range(steps):
+            k1x = _as_field(f_num(xc, yc), xc.shape); k1y = _as_field(g_num(xc, yc), xc.shape)
+            xa = xc + 0.5*dt*k1x; ya = yc + 0.5*dt*k1y
+            k2x = _as_field(f_num(xa, ya), xc.shape); k2y = _as_field(g_num(xa, ya), xc.shape)
+            xa = xc + 0.5*dt*k2x; ya = yc + 0.5*dt*k2y
+            k3x = _as_field(f_num(xa, ya), xc.shape); k3y = _as_field(g_num(xa, ya), xc.shape)
+            xa = xc + dt*k3x; ya = yc + dt*k3y
+            k4x = _as_field(f_num(xa, ya), xc.shape); k4y = _as_field(g_num(xa, ya), xc.shape)
+
+            xn = xc + (dt/6.0)*(k1x + 2*k2x + 2*k3x + k4x)
+            yn = yc + (dt/6.0)*(k1y + 2*k2y + 2*k3y + k4y)
+            X[i+1] = xn; Y[i+1] = yn
+
+            bad = alive & ~(np.isfinite(xn) & np.isfinite(yn))
+            if bad.any():
+                lengths[bad] = i + 2
+                alive &= ~bad
+                if not alive.any():
+                    break
+                # frozen seeds keep their last finite state (rows are trimmed later)
+                xn = np.where(alive, xn, xc); yn = np.where(alive, yn, yc)
+            xc, yc = xn, yn
+
+    return t, X, Y, lengths
 
-        X[i+1] = xi + (dt/6.0)*(k1x + 2*k2x + 2*k3x + k4x)
-        Y[i+1] = yi + (dt/6.0)*(k1y + 2*k2y + 2*k3y + k4y)
-
-        if not np.isfinite(X[i+1]) or not np.isfinite(Y[i+1]):
-            X = X[:i+2]; Y = Y[:i+2]; t = t[:i+2]
-            break
-
-    return t, X, Y
+def integrate_rk4(f_num, g_num, x0, y0, T=4.0, dt=0.01, max_steps=20000):
+    t, X, Y, lengths = integrate_rk4_ensemble(f_num, g_num, [x0], [y0],
+                                              T=T, dt=dt, max_steps=max_steps)
+    L = int(lengths[0])
+    return t[:L], X[:L, 0], Y[:L, 0]
 
 def phase_portrait(f_num, g_num, T=4.0, dt=0.02, grid_n=5, xlim=(-2.5, 2.5), ylim=(-2.5, 2.5)):
     x0s = np.linspace(xlim[0], xlim[1], grid_n)
     y0s = np.linspace(ylim[0], ylim[1], grid_n)
-    trajs = []
-    for x0 in x0s:
-        for y0 in y0s:
-            t, X, Y = integrate_rk4(f_num, g_num, x0, y0, T=T, dt=dt)
-            trajs.append({'x': X.tolist(), 'y': Y.tolist()})
-    return trajs
+    # seeds in the same order as the old nested loop (x outer, y inner)
+    X0, Y0 = np.meshgrid(x0s, y0s, indexing='ij')
+    _, X, Y, lengths = integrate_rk4_ensemble(f_num, g_num, X0.ravel(), Y0.ravel(), T=T, dt=dt)
+    return [{'x': X[:L, k].tolist(), 'y': Y[:L, k].tolist()}
+            for k, L in enumerate(lengths)]
 
 def _is_zero(expr):
     try:
@@ -121,9 +150,11 @@ def find_lyapunov_candidate(f_expr, g_expr):
 
     return {'found': False}
 
+def _sympify_V(s: str) -> sp.Expr:
+    return sp.sympify(s, locals=_ALLOWED)
+
 def eval_V_on_grid(V_expr_str, xlim=(-2.5,2.5), ylim=(-2.5,2.5), n=140):
-    V_expr = sp.sympify(V_expr_str, locals=_ALLOWED)
-    V_num = sp.lambdify((x,y), V_expr, modules=['numpy'])
+    V_num = compile_expr('lyapunov-V', V_expr_str, _sympify_V, (x, y)).func
     xs = np.linspace(xlim[0], xlim[1], n)
     ys = np.linspace(ylim[0], ylim[1], n)
     X, Y = np.meshgrid(xs, ys)
@@ -140,7 +171,9 @@ def compute_all(f_str, g_str, T, dt, grid_n, xlim, ylim, x0, y0, want_solution=T
         t, X, Y = integrate_rk4(f_num, g_num, x0, y0, T=float(T), dt=float(dt))
         sol = {'t': t.tolist(), 'x': X.tolist(), 'y': Y.tolist()}
 
-    ly = find_lyapunov_candidate(f_expr, g_expr)
+    # simplify/integrate are the slowest sympy calls: cache per (f, g)
+    ly = cached('lyapunov-candidate', (f_expr, g_expr),
+                lambda: find_lyapunov_candidate(f_expr, g_expr))
     Vgrid = None
     if ly.get('found'):
         xs, ys, Z = eval_V_on_grid(ly['V_expr_str'], xlim=tuple(xlim), ylim=tuple(ylim), n=140)
@@ -11,6 +11,10 @@ R_E = 6_371_000.0
 DEFAULT_g = 9.80665
 DT_DEFAULT = 0.01
 TMAX_DEFAULT = 300.0
+# Adaptive Dormand–Prince (dopri.py, loaded by the page first); dt is then
+# only the output spacing and the landing is found by event location.
+RTOL = 1e-9
+ATOL = 1e-9
 
 # ------------------
 # Physics
@@ -41,7 +45,99 @@ def rk4_step(s, dt, f, *fargs):
     k4 = f(s + dt * k3, *fargs)
     return s + (dt / 6.0) * (k1 + 2*k2 + 2*k3 + k4)
 
-def simulate_full(v0, theta_deg, h0, k_drag, use_newton=False, g=DEFAULT_g, dt=DT_DEFAULT, tmax=TMAX_DEFAULT):
+def _summary(ts, xs, ys, vxs, vys):
+    speed = np.sqrt(vxs**2 + vys**2)
+
+    apogee_idx = int(np.argmax(ys))
+    h_max = float(ys[apogee_idx])
+    x_at_hmax = float(xs[apogee_idx])
+
+    tof = float(ts[-1])
+    range_ = float(xs[-1])
+    final_speed = float(speed[-1])
+
+    return {
+        "t": ts, "x": xs, "y": ys, "vx": vxs, "vy": vys, "speed": speed,
+        "h_max": h_max, "x_hmax": x_at_hmax, "tof": tof, "range": range_, "final_speed": final_speed
+    }
+
+def rhs_batch(k, g, use_newton, n):
+    """
+    RHS for n projectiles at once, state S of shape (4, n) (rows x, y, vx, vy).
+    Written component by component into one preallocated buffer (no
+    per-call state arrays, no norm()); k is a scalar or one value per column.
+    """
+    mk = -np.asarray(k, dtype=float)
+    out = np.empty((4, n))
+
+    def uniform(_t, S):
+        out[0] = S[2]
+        out[1] = S[3]
+        out[2] = mk * S[2]
+        out[3] = mk * S[3] - g
+        return out
+
+    def newton(_t, S):
+        x, y, vx, vy = S
+        yR = y + R_E
+        r2 = x * x + yR * yR
+        r3 = r2 * np.sqrt(r2)
+        if r3.all():
+            c = MU / r3
+        else:
+            # r == 0 -> no gravity (as deriv_newton)
+            c = np.divide(MU, r3, out=np.zeros(n), where=r3 > 0.0)
+        out[0] = vx
+        out[1] = vy
+        out[2] = mk * vx - c * x
+        out[3] = mk * vy - c * yR
+        return out
+
+    return newton if use_newton else uniform
+
+def simulate_batch(v0s, thetas_deg, h0, ks, use_newton=False, g=DEFAULT_g, dt=DT_DEFAULT, tmax=TMAX_DEFAULT):
+    """
+    Several launches integrated as one (4, n) state in a single dopri45 pass.
+    Each column's ground crossing (y = 0) is its own event entry; a launch's
+    trajectory is its samples every dt up to its own landing, which is then
+    the last point. The pass ends once every launch has landed (or at tmax).
+    Returns one _summary dict per launch.
+    """
+    theta = np.deg2rad(np.asarray(thetas_deg, dtype=float))
+    v0s = np.asarray(v0s, dtype=float) * np.ones_like(theta)
+    n = theta.size
+
+    S0 = np.empty((4, n))
+    S0[0] = 0.0
+    S0[1] = h0
+    S0[2] = v0s * np.cos(theta)
+    S0[3] = v0s * np.sin(theta)
+
+    t_out = output_grid(tmax, dt)
+    ts, S, info = dopri45(rhs_batch(ks, g, use_newton, n), (0.0, float(tmax)), S0,
+                          t_eval=t_out, rtol=RTOL, atol=ATOL, norm="max",
+                          event=lambda _t, St: St[1])
+    t_land = info["t_event"]
+
+    sims = []
+    for i in range(n):
+        if t_land is not None and np.isfinite(t_land[i]):
+            m = int(np.searchsorted(ts, t_land[i], side="left"))
+            ti = np.append(ts[:m], t_land[i])
+            Si = np.hstack([S[:m, :, i].T, info["y_event"][i][:, i:i + 1]])
+            Si[1, -1] = 0.0
+        else:
+            ti, Si = ts, S[:, :, i].T
+        sims.append(_summary(ti, *(np.ascontiguousarray(c) for c in Si)))
+    return sims
+
+def simulate_full(v0, theta_deg, h0, k_drag, use_newton=False, g=DEFAULT_g, dt=DT_DEFAULT, tmax=TMAX_DEFAULT,
+                  method="dopri"):
+    if method == "dopri":
+        # samples every dt, plus the exact ground crossing (y = 0) as the last point
+        return simulate_batch([v0], [theta_deg], h0, [k_drag], use_newton=use_newton,
+                              g=g, dt=dt, tmax=tmax)[0]
+
     theta = np.deg2rad(theta_deg)
     vx0 = v0 * np.cos(theta)
     vy0 = v0 * np.sin(theta)
@@ -87,20 +183,7 @@ def simulate_full(v0, theta_deg, h0, k_drag, use_newton=False, g=DEFAULT_g, dt=D
         y_prev = s[1]
 
     xs = np.array(xs); ys = np.array(ys); vxs = np.array(vxs); vys = np.array(vys); ts = np.array(ts)
-    speed = np.sqrt(vxs**2 + vys**2)
-
-    apogee_idx = int(np.argmax(ys))
-    h_max = float(ys[apogee_idx])
-    x_at_hmax = float(xs[apogee_idx])
-
-    tof = float(ts[-1])
-    range_ = float(xs[-1])
-    final_speed = float(speed[-1])
-
-    return {
-        "t": ts, "x": xs, "y": ys, "vx": vxs, "vy": vys, "speed": speed,
-        "h_max": h_max, "x_hmax": x_at_hmax, "tof": tof, "range": range_, "final_speed": final_speed
-    }
+    return _summary(ts, xs, ys, vxs, vys)
 
 def _metrics(sim):
     return {
@@ -117,13 +200,10 @@ def compute_all(v0A, thetaA, kA, v0B, thetaB, kB, use_newton, g_val):
     use_newton = bool(use_newton)
     g_val = float(g_val)
 
-    # simulations
-    sim_refA = simulate_full(v0=v0A, theta_deg=thetaA, h0=h0, k_drag=0.0,
-                             use_newton=use_newton, g=g_val)
-    sim_A = simulate_full(v0=v0A, theta_deg=thetaA, h0=h0, k_drag=kA,
-                          use_newton=use_newton, g=g_val)
-    sim_B = simulate_full(v0=v0B, theta_deg=thetaB, h0=h0, k_drag=kB,
-                          use_newton=use_newton, g=g_val)
+    # simulations: drag-free reference, A and B in one batched pass
+    sim_refA, sim_A, sim_B = simulate_batch(
+        [v0A, v0A, v0B], [thetaA, thetaA, thetaB], h0, [0.0, kA, kB],
+        use_newton=use_newton, g=g_val)
 
     # bounds for trajectory plot
     all_x = np.concatenate([sim_refA["x"], sim_A["x"], sim_B["x"]])
@@ -2,18 +2,62 @@
  *
  * Minimal Pyodide loader for GitHub Pages mathlets.
  * Provides:
- *   - initPyodideBase({ packages?: string[], stdout?: (s)=>void, stderr?: (s)=>void })
- *   - loadPythonFile(py, url)  -> loads and executes a .py file from the repo
+ *   - initPyodideBase({ packages?: string[], stdout?: (s)=>void, stderr?: (s)=>void,
+ *                       worker?: boolean })
+ *   - loadPythonFile(py, url | [url, ...])  -> loads and executes a .py file
+ *       from the repo; with several candidate URLs the first one that exists
+ *       is used (and remembered for later visits). Resolves to that URL.
+ *   - pyToPlain(py, code)  -> runs `code` and returns its value as plain JS
+ *       (dicts -> objects, lists -> arrays, NumPy arrays -> typed arrays),
+ *       releasing the proxy. With a PyodideWorker it returns a promise.
  *
  * Usage:
  *   const py = await initPyodideBase({ packages: ["numpy"] });
+ *
+ * Worker mode:
+ *   const py = await initPyodideBase({ worker: true, packages: ["numpy"] });
+ *   await loadPythonFile(py, "./heat_2d.py");
+ *   const out = await py.runPython("step_state(n)", { n: 1 });
+ *
+ *   Python runs in pyodide-worker.js, so long computations do not block
+ *   sliders or rendering. `py` is a PyodideWorker: every call returns a
+ *   promise and results arrive already converted to plain JS (lists ->
+ *   arrays, dicts -> objects). Calls are executed in the order they are made.
+ *   The worker keeps the Pyodide runtime and packages in Cache Storage, so
+ *   other mathlets start without downloading them again.
+ *
+ * Results:
+ *   Mathlets return array data as C-contiguous NumPy arrays (float64 or
+ *   float32), not lists. `toJs()` converts any buffer to a Float64Array /
+ *   Float32Array with a single memcpy (2-D arrays become an Array of row
+ *   typed arrays), and Plotly takes typed arrays directly, so no per-element
+ *   list building or conversion happens. In worker mode those arrays are
+ *   transferred to the page, not cloned.
+ *
+ * Module files:
+ *   Sources are fetched with HTTP revalidation (ETag / Last-Modified), so an
+ *   unchanged file costs a 304 instead of a download, and the candidate URL
+ *   that worked is remembered so later visits try it first. Each file runs
+ *   in the shared globals (it is not imported); it is first written to
+ *   /home/pyodide/mathlets/ in the in-memory filesystem only so that
+ *   tracebacks can show its source lines.
  */
 
 (() => {
   const PYODIDE_VERSION = "0.26.2";
   const PYODIDE_INDEX_URL = `https://cdn.jsdelivr.net/pyodide/v${PYODIDE_VERSION}/full/`;
 
+  // Resolved while this script is executing; the worker lives next to it.
+  const WORKER_URL = new URL(
+    "pyodide-worker.js",
+    (document.currentScript && document.currentScript.src) || document.baseURI
+  ).href;
+
+  const MODULE_DIR = "/home/pyodide/mathlets";
+  const RESOLVED_KEY_PREFIX = "pyodide-base:resolved:";
+
   let _pyodidePromise = null;
+  let _workerPromise = null;
 
   function _loadScript(src) {
     return new Promise((resolve, reject) => {
@@ -35,13 +79,100 @@
     }
   }
 
+  // ---------- Worker mode: promise-based RPC ----------
+  class PyodideWorker {
+    constructor({ stdout = null, stderr = null } = {}) {
+      this._worker = new Worker(WORKER_URL);
+      this._nextId = 0;
+      this._pending = new Map();
+      this._stdout = stdout;
+      this._stderr = stderr;
+
+      this._worker.onmessage = (ev) => {
+        const msg = ev.data || {};
+        if (msg.stream) {
+          const sink = msg.stream === "stderr" ? this._stderr : this._stdout;
+          if (sink) sink(msg.text);
+          return;
+        }
+        const p = this._pending.get(msg.id);
+        if (!p) return;
+        this._pending.delete(msg.id);
+        if ("error" in msg) p.reject(new Error(msg.error));
+        else p.resolve(msg.result);
+      };
+
+      this._worker.onerror = (ev) => {
+        const err = new Error(`Pyodide worker failed: ${ev.message || "unknown error"}`);
+        this._pending.forEach(p => p.reject(err));
+        this._pending.clear();
+      };
+    }
+
+    _rpc(op, args = {}) {
+      const id = this._nextId++;
+      return new Promise((resolve, reject) => {
+        this._pending.set(id, { resolve, reject });
+        this._worker.postMessage({ id, op, ...args });
+      });
+    }
+
+    loadPackage(packages) {
+      return this._rpc("loadPackage", { packages: [].concat(packages) });
+    }
+
+    installModule(name, code) {
+      return this._rpc("installModule", { name, code });
+    }
+
+    setGlobals(values) {
+      return this._rpc("setGlobals", { values });
+    }
+
+    // `globals` (optional) are assigned just before `code` runs
+    runPython(code, globals = null) {
+      return this._rpc("runPython", { code, globals });
+    }
+
+    call(name, args = [], kwargs = {}) {
+      return this._rpc("call", { name, args, kwargs });
+    }
+
+    terminate() {
+      this._worker.terminate();
+      const err = new Error("Pyodide worker terminated");
+      this._pending.forEach(p => p.reject(err));
+      this._pending.clear();
+    }
+  }
+
+  async function _initWorker({ packages, stdout, stderr }) {
+    if (!_workerPromise) {
+      _workerPromise = (async () => {
+        const py = new PyodideWorker({ stdout, stderr });
+        await py._rpc("init", { packages: [] });
+        return py;
+      })();
+    }
+    const py = await _workerPromise;
+    if (packages && packages.length) {
+      await py.loadPackage(packages);
+    }
+    return py;
+  }
+
   async function initPyodideBase(options = {}) {
     const {
       packages = [],
       stdout = null,
-      stderr = null
+      stderr = null,
+      worker = false
     } = options;
 
+    if (worker) {
+      return _initWorker({ packages, stdout, stderr });
+    }
+
     if (!_pyodidePromise) {
       _pyodidePromise = (async () => {
         await _ensurePyodideLoader();
@@ -73,14 +204,81 @@
     return pyodide;
   }
 
-  async function loadPythonFile(pyodide, url) {
-    const r = await fetch(url, { cache: "no-store" });
-    if (!r.ok) throw new Error(`Failed to fetch python file: ${url} (${r.status})`);
-    const code = await r.text();
-    pyodide.runPython(code);
+  // ---------- Module files ----------
+  function _readStorage(key) {
+    try { return window.localStorage.getItem(key); } catch (e) { return null; }
+  }
+
+  function _writeStorage(key, value) {
+    try { window.localStorage.setItem(key, value); } catch (e) { /* ignore */ }
+  }
+
+  // Candidate order: the URL that worked last time first, the rest as given
+  function _candidateOrder(urls) {
+    const key = RESOLVED_KEY_PREFIX + urls.join("|");
+    const known = _readStorage(key);
+    const ordered = urls.includes(known) ? [known, ...urls.filter(u => u !== known)] : urls;
+    return { key, ordered };
+  }
+
+  // Fetched here on the page (the worker only receives the source), so
+  // relative URLs are resolved against the page, not the worker script
+  async function _fetchSource(urls) {
+    const { key, ordered } = _candidateOrder(urls);
+    let lastErr = null;
+    for (const url of ordered) {
+      try {
+        // "no-cache": always revalidate, but a 304 re-uses the cached body
+        const r = await fetch(url, { cache: "no-cache" });
+        if (!r.ok) throw new Error(`Failed to fetch python file: ${url} (${r.status})`);
+        const code = await r.text();
+        _writeStorage(key, url);
+        return { url, code };
+      } catch (e) {
+        lastErr = e;
+      }
+    }
+    throw lastErr;
+  }
+
+  function _moduleName(url) {
+    return new URL(url, document.baseURI).pathname.split("/").pop();
+  }
+
+  // Same steps as installModule in pyodide-worker.js
+  function _installModule(pyodide, name, code) {
+    const path = `${MODULE_DIR}/${name}`;
+    pyodide.FS.mkdirTree(MODULE_DIR);
+    pyodide.FS.writeFile(path, code);
+    pyodide.runPython(code, { filename: path });
+  }
+
+  // ---------- Results ----------
+  function pyToPlain(pyodide, code) {
+    if (pyodide instanceof PyodideWorker) return pyodide.runPython(code);
+    const out = pyodide.runPython(code);
+    if (!out || typeof out.toJs !== "function") return out;
+    try {
+      return out.toJs({ dict_converter: Object.fromEntries });
+    } finally {
+      out.destroy();
+    }
+  }
+
+  async function loadPythonFile(pyodide, urls) {
+    const { url, code } = await _fetchSource([].concat(urls));
+    const name = _moduleName(url);
+    if (pyodide instanceof PyodideWorker) {
+      await pyodide.installModule(name, code);
+    } else {
+      _installModule(pyodide, name, code);
+    }
+    return url;
   }
 
   // Expose globally
   window.initPyodideBase = initPyodideBase;
   window.loadPythonFile = loadPythonFile;
+  window.pyToPlain = pyToPlain;
+  window.PyodideWorker = PyodideWorker;
 })();
@@ -0,0 +1,176 @@
+/* assets/mathlets/pyodide-worker.js
+ *
+ * Dedicated worker that hosts Pyodide off the main thread.
+ * Started by initPyodideBase({ worker: true }) in pyodide-base.js; do not
+ * load it directly from a page.
+ *
+ * Messages in:  { id, op, ...args }   (processed strictly in order)
+ * Messages out: { id, result } | { id, error } | { stream, text }
+ * Typed arrays inside a result are transferred with the message.
+ *
+ * Everything under the Pyodide CDN URL (runtime, stdlib, wheels) is kept in
+ * Cache Storage, keyed by version, so moving between mathlets re-uses the
+ * downloaded files instead of fetching them again.
+ */
+
+const PYODIDE_VERSION = "0.26.2";
+const PYODIDE_INDEX_URL = `https://cdn.jsdelivr.net/pyodide/v${PYODIDE_VERSION}/full/`;
+const CACHE_PREFIX = "pyodide-";
+const CACHE_NAME = `${CACHE_PREFIX}${PYODIDE_VERSION}`;
+const MODULE_DIR = "/home/pyodide/mathlets";
+
+// ---------- Cache Storage in front of the CDN ----------
+const _fetch = self.fetch.bind(self);
+
+async function cachedFetch(input, init) {
+  const url = typeof input === "string" ? input : input.url;
+  if (!self.caches || !String(url).startsWith(PYODIDE_INDEX_URL)) {
+    return _fetch(input, init);
+  }
+  try {
+    const cache = await caches.open(CACHE_NAME);
+    const hit = await cache.match(url);
+    if (hit) return hit;
+    const r = await _fetch(input, init);
+    if (r.ok) await cache.put(url, r.clone());
+    return r;
+  } catch (e) {
+    // Storage unavailable (private mode, quota): plain network fetch
+    return _fetch(input, init);
+  }
+}
+
+async function dropOldCaches() {
+  if (!self.caches) return;
+  try {
+    const keys = await caches.keys();
+    await Promise.all(
+      keys
+        .filter(k => k.startsWith(CACHE_PREFIX) && k !== CACHE_NAME)
+        .map(k => caches.delete(k))
+    );
+  } catch (e) {
+    // ignore
+  }
+}
+
+self.fetch = cachedFetch;
+
+// ---------- Runtime ----------
+let _pyodidePromise = null;
+const _loadedPackages = new Set();
+
+function ensurePyodide() {
+  if (!_pyodidePromise) {
+    _pyodidePromise = (async () => {
+      dropOldCaches();
+      importScripts(`${PYODIDE_INDEX_URL}pyodide.js`);
+      const py = await self.loadPyodide({ indexURL: PYODIDE_INDEX_URL });
+      py.setStdout({ batched: (s) => self.postMessage({ stream: "stdout", text: String(s) }) });
+      py.setStderr({ batched: (s) => self.postMessage({ stream: "stderr", text: String(s) }) });
+      return py;
+    })();
+  }
+  return _pyodidePromise;
+}
+
+async function loadPackages(py, packages) {
+  const missing = (packages || []).filter(p => !_loadedPackages.has(p));
+  if (!missing.length) return;
+  await py.loadPackage(missing);
+  missing.forEach(p => _loadedPackages.add(p));
+}
+
+// Python results cross the boundary as plain JS (dicts -> objects)
+function toPlain(value) {
+  if (value && typeof value.toJs === "function") {
+    try {
+      return value.toJs({ dict_converter: Object.fromEntries, create_pyproxies: false });
+    } finally {
+      value.destroy();
+    }
+  }
+  return value;
+}
+
+// ArrayBuffers behind the typed arrays in a result (moved, not copied)
+function transferList(value, seen = new Set()) {
+  if (ArrayBuffer.isView(value)) {
+    seen.add(value.buffer);
+  } else if (Array.isArray(value)) {
+    value.forEach(v => transferList(v, seen));
+  } else if (value && typeof value === "object") {
+    Object.values(value).forEach(v => transferList(v, seen));
+  }
+  return seen;
+}
+
+function setGlobals(py, values) {
+  if (!values) return;
+  for (const [name, v] of Object.entries(values)) {
+    py.globals.set(name, v);
+  }
+}
+
+const OPS = {
+  async init(py, { packages }) {
+    await loadPackages(py, packages);
+    return null;
+  },
+
+  async loadPackage(py, { packages }) {
+    await loadPackages(py, packages);
+    return null;
+  },
+
+  // Source is fetched on the page (see loadPythonFile in pyodide-base.js)
+  async installModule(py, { name, code }) {
+    const path = `${MODULE_DIR}/${name}`;
+    // written out only so tracebacks show source lines; runs in the globals
+    py.FS.mkdirTree(MODULE_DIR);
+    py.FS.writeFile(path, code);
+    py.runPython(code, { filename: path });
+    return null;
+  },
+
+  async setGlobals(py, { values }) {
+    setGlobals(py, values);
+    return null;
+  },
+
+  async runPython(py, { code, globals }) {
+    setGlobals(py, globals);
+    return toPlain(py.runPython(code));
+  },
+
+  async call(py, { name, args, kwargs }) {
+    const fn = py.globals.get(name);
+    if (!fn) throw new Error(`Python name not defined: ${name}`);
+    try {
+      const pyArgs = (args || []).map(a => py.toPy(a));
+      const res = fn.callKwargs(...pyArgs, kwargs || {});
+      pyArgs.forEach(a => a && typeof a.destroy === "function" && a.destroy());
+      return toPlain(res);
+    } finally {
+      fn.destroy();
+    }
+  }
+};
+
+// ---------- Message loop (one request at a time, in arrival order) ----------
+let _queue = Promise.resolve();
+
+self.onmessage = (ev) => {
+  const { id, op, ...args } = ev.data || {};
+  _queue = _queue.then(async () => {
+    try {
+      const handler = OPS[op];
+      if (!handler) throw new Error(`Unknown worker op: ${op}`);
+      const py = await ensurePyodide();
+      const result = await handler(py, args);
+      self.postMessage({ id, result }, [...transferList(result)]);
+    } catch (e) {
+      self.postMessage({ id, error: (e && e.message) ? e.message : String(e) });
+    }
+  });
+};
@@ -10,22 +10,15 @@ import numpy as np
 # We use sympy to safely parse expressions like:
 #   e^x, sin(x), 1/(1+x^2), pi, sqrt(x)
 # and then lambdify to numpy for fast evaluation.
+# Parsed formulas are kept in the shared expr_cache.py LRU (loaded by the
+# page first), so redraws with unchanged A, B, C skip sympy entirely.
 
-def _make_callable(expr_str: str):
+def _parse_expr_x(s: str):
     import sympy as sp
     from sympy.parsing.sympy_parser import (
         parse_expr, standard_transformations, implicit_multiplication_application
     )
 
-    s = (expr_str or "").strip()
-    if s == "":
-        s = "0"
-
-    # light "latex-ish" normalization
-    s = s.replace("^", "**")
-    # common aliases
-    s = s.replace("ln(", "log(")
-
     x = sp.Symbol("x")
     transformations = standard_transformations + (implicit_multiplication_application,)
 
@@ -50,13 +43,26 @@ def _make_callable(expr_str: str):
         "abs": sp.Abs,
     }
 
+    return parse_expr(s, local_dict=local_dict, transformations=transformations, evaluate=True)
+
+def _make_callable(expr_str: str):
+    import sympy as sp
+
+    s = (expr_str or "").strip()
+    if s == "":
+        s = "0"
+
+    # light "latex-ish" normalization
+    s = s.replace("^", "**")
+    # common aliases
+    s = s.replace("ln(", "log(")
+
     try:
-        expr = parse_expr(s, local_dict=local_dict, transformations=transformations, evaluate=True)
+        c = compile_expr("riccati", s, _parse_expr_x, sp.Symbol("x"))
     except Exception as e:
         raise ValueError(f"Could not parse expression: {expr_str!r}\n{e}")
 
-    f = sp.lambdify(x, expr, modules=["numpy"])
-    return f, str(expr)
+    return c.func, str(c.expr)
 
 
 # ---------- Numerical helpers ----------
@@ -0,0 +1,61 @@
+# sine_transform.py
+# Pyodide-friendly (numpy only)
+# Type-I discrete sine transform via the FFT, for sine series on a uniform
+# grid x_j = j L / M, j = 0..M (M = NX - 1) with f(0) = f(L) = 0 weight.
+# Shared by heat_1d and wave_1d; the page loads this file before the mathlet.
+#
+# On that grid the trapezoidal projection
+#   b_n = (2/L) ∫ f(x) sin(nπx/L) dx
+# only sees interior points (sin vanishes at both ends), so
+#   b_n = (2/M) Σ_{j=1}^{M-1} f_j sin(nπ j/M) = (2/M) DST-I(f_int)_n,
+# exactly, for n = 1..M-1. Synthesis Σ_n c_n sin(nπ x_j/L) is the same
+# DST-I applied to the (zero-padded) coefficients.
+# Cost O(NX log NX) instead of O(n_coeff * NX).
+
+import numpy as np
+
+def dst1(v, axis=-1):
+    """
+    Unnormalized DST-I along `axis`:
+      y_k = Σ_{j=1}^{K} v_j sin(π j k / (K+1)),  k = 1..K
+    computed from the FFT of the odd extension of length 2(K+1).
+    """
+    v = np.moveaxis(np.asarray(v, dtype=float), axis, -1)
+    K = v.shape[-1]
+    M = K + 1
+    ext = np.zeros(v.shape[:-1] + (2 * M,))
+    ext[..., 1:M] = v
+    ext[..., M + 1:] = -v[..., ::-1]
+    y = -0.5 * np.fft.rfft(ext, axis=-1).imag[..., 1:M]
+    return np.moveaxis(y, -1, axis)
+
+def max_modes(nx):
+    """Highest sine mode resolved on an NX-point grid."""
+    return int(nx) - 2
+
+def sine_coeffs(fx, nmax=None):
+    """
+    Sine-series coefficients b_1..b_nmax of samples fx on the uniform grid
+    (same values as the trapezoidal projection). nmax <= NX - 2.
+    """
+    fx = np.asarray(fx, dtype=float)
+    M = fx.shape[-1] - 1
+    b = (2.0 / M) * dst1(fx[..., 1:-1])
+    if nmax is not None:
+        b = b[..., :int(nmax)]
+    return b
+
+def sine_synthesis(coef, nx):
+    """
+    Values of Σ_n coef_n sin(nπ x/L) on the NX-point uniform grid
+    (zero at both ends). len(coef) <= NX - 2.
+    """
+    coef = np.asarray(coef, dtype=float)
+    K = int(nx) - 2
+    if coef.shape[-1] > K:
+        raise ValueError(f"at most {K} sine modes fit on a grid of {nx} points")
+    padded = np.zeros(coef.shape[:-1] + (K,))
+    padded[..., :coef.shape[-1]] = coef
+    u = np.zeros(coef.shape[:-1] + (int(nx),))
+    u[..., 1:-1] = dst1(padded)
+    return u
@@ -6,10 +6,18 @@ import numpy as np
 # Convert to first-order system:
 #   x' = y
 #   y' = μ(1-x^2)y - x
+#
+# The main orbit and the reference orbits are integrated together as one
+# ensemble with the adaptive Dormand–Prince scheme from dopri.py (loaded by
+# the page first): small steps only on the fast relaxation jumps at large μ.
 # ============================================
 
 YMIN, YMAX = -4.5, 4.5
 
+# Local error tolerances (max norm over all orbits)
+RTOL = 1e-8
+ATOL = 1e-10
+
 def f(mu, x, y):
     dx = y
     dy = mu*(1.0 - x*x)*y - x
@@ -24,12 +32,32 @@ def rk4_step(mu, x, y, dt):
     yn = y + (dt/6.0)*(k1y + 2*k2y + 2*k3y + k4y)
     return xn, yn
 
-def simulate(mu, x0, y0, T=30.0, dt=0.01):
+def simulate_ensemble(mu, x0s, y0s, T=30.0, dt=0.01, rtol=RTOL, atol=ATOL):
+    """
+    All initial conditions at once; output on the same time grid as simulate().
+    Returns t (n,), xs, ys (n_orbits, n).
+    """
+    mu = float(mu)
+    S0 = np.stack([np.asarray(x0s, dtype=float), np.asarray(y0s, dtype=float)], axis=1)
+
+    def rhs(_t, S):
+        dx, dy = f(mu, S[:, 0], S[:, 1])
+        return np.stack([dx, dy], axis=1)
+
+    t = output_grid(T, dt)
+    t, S, _ = dopri45(rhs, (0.0, t[-1]), S0, t_eval=t, rtol=rtol, atol=atol, norm="max")
+    return t, np.ascontiguousarray(S[:, :, 0].T), np.ascontiguousarray(S[:, :, 1].T)
+
+def simulate(mu, x0, y0, T=30.0, dt=0.01, method="dopri"):
+    if method == "dopri":
+        t, xs, ys = simulate_ensemble(mu, [x0], [y0], T=T, dt=dt)
+        return t, xs[0], ys[0]
+
     mu = float(mu)
     x = float(x0)
     y = float(y0)
-    n = int(np.floor(T/dt)) + 1
-    t = np.linspace(0.0, n*dt, n)
+    t = output_grid(T, dt)
+    n = t.size
     xs = np.empty(n, dtype=float)
     ys = np.empty(n, dtype=float)
     xs[0] = x
@@ -40,39 +68,58 @@ def simulate(mu, x0, y0, T=30.0, dt=0.01):
         ys[i] = y
     return t, xs, ys
 
-def compute_plot_data(mu, x0, y0):
+# reference trajectories (fixed ICs)
+REF_ICS = [
+    (2.0, 0.0),
+    (0.0, 2.0),
+    (-2.0, 0.0),
+    (0.0, -2.0),
+    (1.5, 1.5),
+    (-1.5, -1.5),
+]
+
+def compute_plot_data(mu, x0, y0, method="dopri", tol_px=DEFAULT_TOL_PX):
     """
     Returns:
       refs: list of dicts {x:[], y:[], name:str}
       main: dict {t:[], x:[], y:[]}
       ranges: {xmin,xmax,ymin,ymax}
+
+    Orbits are thinned for display (decimate.py, loaded by the page first):
+    no drawn point moves by more than tol_px pixels; tol_px=0 keeps all.
     """
     mu = float(mu)
 
-    # main trajectory
-    t, xs, ys = simulate(mu, x0, y0, T=30.0, dt=0.01)
-
-    # reference trajectories (fixed ICs)
-    ref_ics = [
-        (2.0, 0.0),
-        (0.0, 2.0),
-        (-2.0, 0.0),
-        (0.0, -2.0),
-        (1.5, 1.5),
-        (-1.5, -1.5),
-    ]
-    refs = []
-    for (rx0, ry0) in ref_ics:
-        _, rxs, rys = simulate(mu, rx0, ry0, T=30.0, dt=0.01)
-        refs.append({"x": rxs.tolist(), "y": rys.tolist(), "name": f"ref ({rx0:g},{ry0:g})"})
+    if method == "dopri":
+        # main trajectory first, then the reference trajectories (fixed ICs)
+        x0s = [float(x0)] + [ic[0] for ic in REF_ICS]
+        y0s = [float(y0)] + [ic[1] for ic in REF_ICS]
+        t, X, Y = simulate_ensemble(mu, x0s, y0s, T=30.0, dt=0.01)
+        xs, ys = X[0], Y[0]
+        ref_paths = list(zip(X[1:], Y[1:]))
+    else:
+        t, xs, ys = simulate(mu, x0, y0, T=30.0, dt=0.01)
+        ref_paths = [simulate(mu, rx0, ry0, T=30.0, dt=0.01)[1:] for (rx0, ry0) in REF_ICS]
 
-    # ranges
-    allx = np.concatenate([xs] + [np.array(r["x"]) for r in refs])
-    ally = np.concatenate([ys] + [np.array(r["y"]) for r in refs])
+    # ranges (from the full-resolution orbits)
+    allx = np.concatenate([xs] + [rxs for rxs, _ in ref_paths])
+    ally = np.concatenate([ys] + [rys for _, rys in ref_paths])
     pad = 0.35
     xmin, xmax = float(allx.min()-pad), float(allx.max()+pad)
     ymin, ymax = float(ally.min()-pad), float(ally.max()+pad)
 
+    xr, yr = (xmin, xmax), (ymin, ymax)
+    refs = []
+    for (rx0, ry0), (rxs, rys) in zip(REF_ICS, ref_paths):
+        k = decimate([rxs, rys], ranges=[xr, yr], tol_px=tol_px)
+        refs.append({"x": rxs[k].tolist(), "y": rys[k].tolist(), "name": f"ref ({rx0:g},{ry0:g})"})
+
+    # main orbit: phase plot (x, y) and time series (t, x) from one index set;
+    # x is drawn on both, so it is scaled by the narrower of its two axes
+    xr_main = min(xr, (float(YMIN), float(YMAX)), key=lambda r: r[1] - r[0])
+    k = decimate([t, xs, ys], ranges=[(t[0], t[-1]), xr_main, yr], tol_px=tol_px)
+    t, xs, ys = t[k], xs[k], ys[k]
+
     return (
         refs,
         {"t": t.tolist(), "x": xs.tolist(), "y": ys.tolist()},
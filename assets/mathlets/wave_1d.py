@@ -15,6 +15,11 @@ import numpy as np
 # To get an (approximately) right-moving Gaussian pulse at speed c, we set
 #   v0(x) = -c * d/dx u0(x)
 # (Reflections appear due to the fixed boundaries.)
+#
+# method="quad": dense sine basis + trapezoidal quadrature, O(N·NX).
+# method="dst" : type-I DST via FFT (sine_transform.py, loaded by the page
+#                first) for projection and synthesis, O(NX log NX); allows
+#                up to NX-2 coefficients.
 # =====================================================
 
 L = 10.0
@@ -54,42 +59,84 @@ def sine_matrix(nmax):
     S = np.sin(n * np.pi * X[None, :] / L)            # (nmax,NX)
     return n, S
 
+# X and L are fixed, so the sine basis is built once per session
+N_MODES, SINE_BASIS = sine_matrix(N_COEFF)
+
+def _basis(nmax):
+    if nmax <= N_COEFF:
+        return N_MODES[:nmax], SINE_BASIS[:nmax]
+    return sine_matrix(nmax)
+
 def project_to_sines(fx, S):
     # (2/L) ∫ f(x) sin(nπx/L) dx  for all n; integrate along X
     return (2.0 / L) * np.trapz(fx * S, X, axis=1)    # (nmax,)
 
-def reconstruct(u0, v0, t, kappa, nmax=N_COEFF):
-    t = float(t)
+def spectral_data(u0, v0, kappa, nmax=N_COEFF, method="quad"):
+    """
+    Time-independent part of the solution: (a, b, S, omega, c).
+    With method="dst" S is None (synthesis goes through the DST).
+    """
     kappa = float(kappa)
     c = np.sqrt(max(kappa, 0.0))
 
-    n, S = sine_matrix(nmax)
-    a = project_to_sines(u0, S)                        # (nmax,)
-    b = project_to_sines(v0, S)                        # (nmax,)
-
+    if method == "dst":
+        nmax = min(int(nmax), max_modes(NX))
+        n = np.arange(1, nmax + 1)[:, None]
+        S = None
+        a = sine_coeffs(u0, nmax)                      # (nmax,)
+        b = sine_coeffs(v0, nmax)                      # (nmax,)
+    else:
+        n, S = _basis(nmax)
+        a = project_to_sines(u0, S)                    # (nmax,)
+        b = project_to_sines(v0, S)                    # (nmax,)
     omega = c * np.pi * n / L                          # (nmax,1)
-    ct = np.cos(omega * t)                             # (nmax,1)
-    st = np.sin(omega * t)                             # (nmax,1)
+    return a, b, S, omega, c
 
-    # Σ [ a_n cos + (b_n/ω_n) sin ] sin(nπx/L)
-    # omega is never zero for n>=1; safe division
-    u = ((a[:, None] * ct + (b[:, None] / omega) * st) * S).sum(axis=0)
+def evolve(a, b, S, omega, t):
+    """
+    Σ [ a_n cos(ω_n t) + (b_n/ω_n) sin(ω_n t) ] sin(nπx/L): one matrix–vector
+    product, or one DST when S is None.
+    """
+    t = float(t)
+    w = omega[:, 0]
+    # omega is never zero for n>=1 and kappa>0; safe division
+    coef = a * np.cos(w * t) + (b / w) * np.sin(w * t)  # (nmax,)
+    if S is None:
+        return sine_synthesis(coef, NX)
+    return coef @ S
+
+def reconstruct(u0, v0, t, kappa, nmax=N_COEFF, method="quad"):
+    a, b, S, omega, c = spectral_data(u0, v0, kappa, nmax=nmax, method=method)
+    u = evolve(a, b, S, omega, t)
     return u, a, b, S, omega, c
 
-def compute_plot_data(t, kappa, A, x0, sigma, show_modes):
+# ---- Memo of the spectral data for the current pulse ----
+# Slider moves that only change t reuse a_n, b_n: one (nmax x NX) product per frame.
+_SPECTRAL_CACHE = {"key": None, "data": None}
+
+def cached_spectral_data(A, x0, sigma, kappa, nmax=N_COEFF, method="quad"):
+    key = (float(A), float(x0), float(sigma), float(kappa), int(nmax), method)
+    if _SPECTRAL_CACHE["key"] != key:
+        u0, v0, _ = initial_data(A, x0, sigma, kappa)
+        _SPECTRAL_CACHE["key"] = key
+        _SPECTRAL_CACHE["data"] = spectral_data(u0, v0, kappa, nmax=nmax, method=method)
+    return _SPECTRAL_CACHE["data"]
+
+def compute_plot_data(t, kappa, A, x0, sigma, show_modes, n_coeff=N_COEFF, method="quad"):
     """
     Returns data for Plotly:
       X, u, baseline, modes, L, Y_MIN, Y_MAX, c
 
     modes is a list of [y_mode, color, name] for n=1..10 if enabled.
+    method="dst" uses the fast sine transform (n_coeff up to NX-2).
     """
     t = float(t)
     kappa = float(kappa)
     A = float(A); x0 = float(x0); sigma = float(sigma)
     show_modes = int(show_modes)
 
-    u0, v0, c0 = initial_data(A, x0, sigma, kappa)
-    u, a, b, S, omega, c = reconstruct(u0, v0, t, kappa, nmax=N_COEFF)
+    a, b, S, omega, c = cached_spectral_data(A, x0, sigma, kappa, nmax=int(n_coeff), method=method)
+    u = evolve(a, b, S, omega, t)
 
     baseline = np.zeros_like(X)
 
@@ -98,7 +145,7 @@ def compute_plot_data(t, kappa, A, x0, sigma, show_modes):
         ct = np.cos(omega[:N_SHOW] * t)[:, 0]          # (N_SHOW,)
         st = np.sin(omega[:N_SHOW] * t)[:, 0]          # (N_SHOW,)
         for i in range(N_SHOW):
-            y_mode = (a[i] * ct[i] + (b[i] / omega[i, 0]) * st[i]) * S[i]
+            y_mode = (a[i] * ct[i] + (b[i] / omega[i, 0]) * st[i]) * SINE_BASIS[i]
             modes_out.append([y_mode.tolist(), MODE_COLORS[i], f"harmonic n={i+1}"])
 
     return (
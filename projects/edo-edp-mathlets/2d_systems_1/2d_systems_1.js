@@ -24,6 +24,7 @@ async function initPyodideAndModule() {
   });
 
   // expects: ../../../assets/mathlets/lattice-flow.py
+  await loadPythonFile(py, "../../../assets/mathlets/linear_flow.py");
   await loadPythonFile(py, "../../../assets/mathlets/2d_systems_1.py");
 }
 
@@ -79,7 +80,7 @@ async function compute(a11, a12, a21, a22, R, T) {
   py.globals.set("T", T);
 
   const out = py.runPython(`
-traces, md_es, md_en, XR, YR = compute_plot_and_md(a11, a12, a21, a22, int(R), float(T))
+traces, md_es, md_en, XR, YR = compute_plot_and_md(a11, a12, a21, a22, int(R), float(T), batch=True)
 (traces, md_es, md_en, XR, YR)
   `);
 
@@ -57,6 +57,7 @@ async function initPyodideAndModule() {
 
   // expects this python file:
   // ../../../assets/mathlets/2d_systems_gauss.py
+  await loadPythonFile(py, "../../../assets/mathlets/linear_flow.py");
   await loadPythonFile(py, "../../../assets/mathlets/2d_systems_gauss.py");
 }
 
@@ -106,8 +107,8 @@ xsf, ysf = slope_field(E, F, D1, D2, x_range=(X0, X1), y_range=(Y0, Y1), n=20, s
     py.globals.set("x0", s.x0);
     py.globals.set("y0", s.y0);
 
-    const resF = py.runPython(`rk4_path(E, F, D1, D2, x0, y0, 10.0, h=0.02, clip=10.0)`).toJs();
-    const resB = py.runPython(`rk4_path(E, F, D1, D2, x0, y0, -10.0, h=0.02, clip=10.0)`).toJs();
+    const resF = py.runPython(`flow_path(E, F, D1, D2, x0, y0, 10.0, h=0.02, clip=10.0)`).toJs();
+    const resB = py.runPython(`flow_path(E, F, D1, D2, x0, y0, -10.0, h=0.02, clip=10.0)`).toJs();
 
     const [xf, yf] = resF;
     const [xb, yb] = resB;
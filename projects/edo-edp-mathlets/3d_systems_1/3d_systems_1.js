@@ -26,6 +26,7 @@ async function initPyodideAndModule() {
   });
 
   // expects ../../../assets/mathlets/2d_systems_gauss.py
+  await loadPythonFile(py, "../../../assets/mathlets/linear_flow.py");
   await loadPythonFile(py, "../../../assets/mathlets/3d_systems_1.py");
 }
 
@@ -108,8 +109,8 @@ async function computeTraces(pars) {
     py.globals.set("y0", s.y0);
     py.globals.set("z0", s.z0);
 
-    const resF = py.runPython(`rk4_path(a11,a12,a13,a21,a22,a23,a31,a32,a33, x0,y0,z0, 10.0, h=0.02, clip=10.0)`).toJs();
-    const resB = py.runPython(`rk4_path(a11,a12,a13,a21,a22,a23,a31,a32,a33, x0,y0,z0, -10.0, h=0.02, clip=10.0)`).toJs();
+    const resF = py.runPython(`flow_path(a11,a12,a13,a21,a22,a23,a31,a32,a33, x0,y0,z0, 10.0, h=0.02, clip=10.0)`).toJs();
+    const resB = py.runPython(`flow_path(a11,a12,a13,a21,a22,a23,a31,a32,a33, x0,y0,z0, -10.0, h=0.02, clip=10.0)`).toJs();
 
     const [xf, yf, zf] = resF;
     const [xb, yb, zb] = resB;
@@ -24,6 +24,7 @@ async function initPyodideAndModule() {
     stderr: (s) => console.log("[pyodide]", s)
   });
 
+  await loadPythonFile(py, "../../../assets/mathlets/linear_flow.py");
   await loadPythonFile(py, "../../../assets/mathlets/3d_systems_flow.py");
 }
 
@@ -81,7 +82,7 @@ async function computeTraces(pars, T, forwardOnly, showEig) {
   py.globals.set("show_eig", Boolean(showEig));
 
   const out = py.runPython(`
-traces, eig_info, eig_shown = compute_flow_traces(pars, T, forward_only=forward_only, show_eig=show_eig)
+traces, eig_info, eig_shown = compute_flow_traces(pars, T, forward_only=forward_only, show_eig=show_eig, batch=True)
 (traces, eig_info, eig_shown)
   `);
 
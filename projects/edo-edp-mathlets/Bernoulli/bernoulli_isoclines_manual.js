@@ -59,14 +59,10 @@ function setupLanguageToggle(){
 async function initPy(){
   py = await initPyodideBase({ packages: ["numpy", "sympy"] });
 
-  try {
-    await loadPythonFile(py, "./bernoulli_isoclines.py");
-    console.log("[bern] loaded ./bernoulli_isoclines.py");
-  } catch (e1) {
-    console.warn("[bern] failed loading ./bernoulli_isoclines.py, trying assets path...", e1);
-    await loadPythonFile(py, "../../../assets/mathlets/bernoulli_isoclines.py");
-    console.log("[bern] loaded assets bernoulli_isoclines.py");
-  }
+  // shared sympy expression cache first: the mathlet uses compile_expr()
+  await loadPythonFile(py, "../../../assets/mathlets/expr_cache.py");
+  const pyUrl = await loadPythonFile(py, ["./bernoulli_isoclines.py", "../../../assets/mathlets/bernoulli_isoclines.py"]);
+  console.log("[bern] loaded", pyUrl);
 }
 
 function getInputs(){
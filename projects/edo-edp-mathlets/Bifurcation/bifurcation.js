@@ -44,14 +44,8 @@ function setupLanguageToggle(){
 
 async function initPy(){
   py = await initPyodideBase({ packages:["numpy"], stderr:(s)=>console.log("[pyodide]", s) });
-  try{
-    await loadPythonFile(py, "./bifurcation.py");
-    console.log("[bif] loaded ./bifurcation.py");
-  }catch(e1){
-    console.warn("[bif] failed ./bifurcation.py; trying assets...", e1);
-    await loadPythonFile(py, "../../../assets/mathlets/bifurcation.py");
-    console.log("[bif] loaded assets/bifurcation.py");
-  }
+  const pyUrl = await loadPythonFile(py, ["./bifurcation.py", "../../../assets/mathlets/bifurcation.py"]);
+  console.log("[bif] loaded", pyUrl);
 }
 
 function readUI(){
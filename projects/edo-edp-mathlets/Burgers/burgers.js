@@ -45,14 +45,8 @@ function setupLanguageToggle(){
 
 async function initPy(){
   py = await initPyodideBase({ packages:['numpy'], stderr:(s)=>console.log('[pyodide]', s) });
-  try{
-    await loadPythonFile(py, './burgers.py');
-    console.log('[burgers] loaded ./burgers.py');
-  }catch(e1){
-    console.warn('[burgers] failed ./burgers.py; trying assets...', e1);
-    await loadPythonFile(py, '../../../assets/mathlets/burgers.py');
-    console.log('[burgers] loaded assets/burgers.py');
-  }
+  const pyUrl = await loadPythonFile(py, ['./burgers.py', '../../../assets/mathlets/burgers.py']);
+  console.log('[burgers] loaded', pyUrl);
 }
 
 function layoutU(xmin, xmax){
@@ -84,8 +78,8 @@ function layoutXT(xmin, xmax, tmax){
 async function computeSim(){
   const kind=document.getElementById('ic').value;
   py.globals.set('kind', kind);
-  const out = py.runPython('simulate(kind)');
-  SIM = out.toJs();
+  // the space-time field stays in Python (burgers.STATE); JS only keeps metadata
+  SIM = pyToPlain(py, 'reset_state(kind)');
 }
 
 async function drawAtTime(){
@@ -97,11 +91,10 @@ async function drawAtTime(){
 
     if(!SIM) return;
 
-    py.globals.set('sim', SIM);
     py.globals.set('tq', t);
-    const out = py.runPython('sample_at_time(sim, tq)');
+    const out = py.runPython('sample_at_time(tq)');
     const arr = out.toJs();
-    const x = arr[0], u = arr[1];
+    const x = SIM.x, u = arr[0];
 
     const tracesU = [{
       type:'scatter', mode:'lines',
@@ -22,6 +22,11 @@ async function initPyodideAndModule() {
     stderr: (s) => console.log("[pyodide]", s)
   });
 
+  // adaptive RK45 shared by the ODE mathlets
+  await loadPythonFile(py, "../../../assets/mathlets/dopri.py");
+  // symplectic integrators + invariant drift (midpoint option)
+  await loadPythonFile(py, "../../../assets/mathlets/symplectic.py");
+
   await loadPythonFile(py, "../../../assets/mathlets/double_pendulum.py");
 }
 
@@ -50,11 +55,68 @@ function syncValueLabels() {
   document.getElementById("phiVal").textContent = fmt2(document.getElementById("phi").value);
 }
 
+// V(θ,φ) does not depend on the initial condition: fetched once, reused
+let grid = null;
+
+function getGrid() {
+  if (!grid) grid = pyToPlain(py, `contour_data()`);
+  return grid;
+}
+
+// trajectory only; the contour grid comes from getGrid()
 async function computeData(theta0, phi0) {
   py.globals.set("theta0", Number(theta0));
   py.globals.set("phi0", Number(phi0));
-  const out = py.runPython(`compute_fig_data(theta0, phi0)`);
-  return out.toJs();
+  return pyToPlain(py, `compute_fig_data(theta0, phi0, with_grid=False)`);
+}
+
+// ---------- Chaos maps (ensemble over the (θ0, φ0) grid) ----------
+let chaos = null;          // last finished map: { mode, th, ph, T, t_max }
+
+// One increment per animation frame, so the progress label repaints
+async function computeChaosMap(mode) {
+  const status = document.getElementById("chaosStatus");
+  py.globals.set("chaos_mode", mode);
+  py.runPython(`chaos_map_start(mode=chaos_mode)`);
+  for (;;) {
+    const [done, total] = pyToPlain(py, `chaos_map_step()`);
+    status.textContent = total ? `${Math.round((100 * done) / total)}%` : "";
+    if (done >= total) break;
+    await new Promise(requestAnimationFrame);
+  }
+  status.textContent = "";
+  return pyToPlain(py, `chaos_map_result()`);
+}
+
+function backgroundTrace(g) {
+  const mode = document.getElementById("viewMode").value;
+  if (mode !== "energy" && chaos && chaos.mode === mode) {
+    return {
+      type: "heatmap",
+      x: chaos.th,
+      y: chaos.ph,
+      z: chaos.T,
+      zmin: 0,
+      zmax: chaos.t_max,
+      colorscale: "Viridis",
+      reversescale: true,
+      hoverongaps: false,
+      colorbar: { title: mode === "flip" ? "flip t" : "diverge t", len: 0.6, y: 0.3 },
+      name: mode === "flip" ? "flip time" : "divergence time"
+    };
+  }
+  return {
+    type: "contour",
+    x: g.th_grid,
+    y: g.ph_grid,
+    z: g.Z,
+    ncontours: 18,
+    showscale: false,
+    contours: { coloring: "none", showlines: true },
+    line: { color: "#666", width: 1.0 },
+    opacity: 0.85,
+    name: "H(θ,φ,p=0)=V"
+  };
 }
 
 async function redraw() {
@@ -81,26 +143,16 @@ async function redraw() {
       throw new Error("Pyodide not initialized (py is null). Did initPyodideAndModule() run?");
     }
 
+    const g = getGrid();
     const d = await computeData(theta0, phi0);
 
     // 4) Validate payload (helps catch python->js conversion issues)
-    if (!d || !d.th_grid || !d.ph_grid || !d.Z || !d.ths || !d.phs) {
+    if (!g || !g.th_grid || !g.ph_grid || !g.Z || !d || !d.ths || !d.phs) {
       throw new Error("computeData() returned an unexpected object. Missing keys for plotting.");
     }
 
     const traces = [
-      {
-        type: "contour",
-        x: d.th_grid,
-        y: d.ph_grid,
-        z: d.Z,
-        ncontours: 18,
-        showscale: false,
-        contours: { coloring: "none", showlines: true },
-        line: { color: "#666", width: 1.0 },
-        opacity: 0.85,
-        name: "H(θ,φ,p=0)=V"
-      },
+      backgroundTrace(g),
       {
         type: "scatter",
         mode: "lines",
@@ -191,6 +243,24 @@ async function main() {
     });
   });
 
+  // background view; a chaos map is computed once per mode
+  const viewEl = document.getElementById("viewMode");
+  viewEl.addEventListener("change", async () => {
+    const mode = viewEl.value;
+    try {
+      if (mode !== "energy" && (!chaos || chaos.mode !== mode)) {
+        viewEl.disabled = true;
+        chaos = await computeChaosMap(mode);
+      }
+    } catch (e) {
+      showErr(e);
+      console.error(e);
+    } finally {
+      viewEl.disabled = false;
+    }
+    redraw();
+  });
+
   syncValueLabels();
   await redraw();
 }
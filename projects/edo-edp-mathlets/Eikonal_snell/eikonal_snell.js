@@ -23,14 +23,8 @@ async function initPyodideAndModule() {
   });
 
   // Robust load: local first, then shared assets
-  try {
-    await loadPythonFile(py, "./eikonal_snell.py");
-    console.log("[eikonal] loaded ./eikonal_snell.py");
-  } catch (e1) {
-    console.warn("[eikonal] failed loading ./eikonal_snell.py, trying assets path...", e1);
-    await loadPythonFile(py, "../../../assets/mathlets/eikonal_snell.py");
-    console.log("[eikonal] loaded ../../../assets/mathlets/eikonal_snell.py");
-  }
+  const pyUrl = await loadPythonFile(py, ["./eikonal_snell.py", "../../../assets/mathlets/eikonal_snell.py"]);
+  console.log("[eikonal] loaded", pyUrl);
 }
 
 function updateDashSliderUI(input) {
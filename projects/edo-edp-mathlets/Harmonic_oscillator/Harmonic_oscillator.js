@@ -53,14 +53,22 @@ function syncValueLabels() {
   document.getElementById("tVal").textContent = fmt2(document.getElementById("t").value);
 }
 
+// The energy grid is constant: fetched once, reused by every redraw
+let grid = null;
+
+function getGrid() {
+  if (!grid) grid = pyToPlain(py, `contour_data()`);
+  return grid;
+}
+
+// trajectory only; the contour grid comes from getGrid()
 async function computeData(x0, p0, alpha, t) {
   py.globals.set("x0", Number(x0));
   py.globals.set("p0", Number(p0));
   py.globals.set("alpha", Number(alpha));
   py.globals.set("tcur", Number(t));
 
-  const out = py.runPython(`compute_fig_data(x0, p0, alpha, tcur)`);
-  return out.toJs();
+  return pyToPlain(py, `compute_fig_data(x0, p0, alpha, tcur, with_grid=False)`);
 }
 
 async function redraw() {
@@ -74,15 +82,16 @@ async function redraw() {
 
     syncValueLabels();
 
+    const g = getGrid();
     const d = await computeData(x0, p0, alpha, t);
 
     // --- Phase plot
     const phaseTraces = [
       {
         type: "contour",
-        x: d.x_grid,
-        y: d.p_grid,
-        z: d.H,
+        x: g.x_grid,
+        y: g.p_grid,
+        z: g.H,
         ncontours: 20,
         showscale: false,
         contours: { coloring: "none", showlines: true },
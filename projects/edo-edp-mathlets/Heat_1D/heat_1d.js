@@ -27,6 +27,7 @@ async function initPyodideAndModule() {
 
   // expects:
   // ../../../assets/mathlets/heat-1d.py
+  await loadPythonFile(py, "../../../assets/mathlets/sine_transform.py");
   await loadPythonFile(py, "../../../assets/mathlets/heat_1d.py");
 }
 
@@ -86,7 +87,7 @@ async function computeProfile(params) {
   py.globals.set("sigma", params.sigma);
 
   const out = py.runPython(`
-compute_plot_data(IC, SHOW, t, U0, UL, kappa, C, A, x0, sigma)
+compute_plot_data(IC, SHOW, t, U0, UL, kappa, C, A, x0, sigma, method="dst")
   `);
 
   return out.toJs();
@@ -1,6 +1,7 @@
 let py = null;
 let running = false;
 let timerId = null;
+let stepping = false;
 
 function fmt(x, d = 2) { return Number(x).toFixed(d); }
 
@@ -18,20 +19,16 @@ function clearErr() {
 }
 
 async function initPyodideAndModule() {
+  // Python runs in a worker: stepping the ADI scheme never blocks the sliders
   py = await initPyodideBase({
+    worker: true,
     packages: ["numpy"],
     stderr: (s) => console.log("[pyodide]", s)
   });
 
   // robust path: local first, then shared assets
-  try {
-    await loadPythonFile(py, "./heat_2d.py");
-    console.log("[heat2d] loaded ./heat_2d.py");
-  } catch (e1) {
-    console.warn("[heat2d] failed loading ./heat_2d.py, trying assets...", e1);
-    await loadPythonFile(py, "../../../assets/mathlets/heat_2d.py");
-    console.log("[heat2d] loaded ../../../assets/mathlets/heat_2d.py");
-  }
+  const pyUrl = await loadPythonFile(py, ["./heat_2d.py", "../../../assets/mathlets/heat_2d.py"]);
+  console.log("[heat2d] loaded", pyUrl);
 }
 
 function updateDashSliderUI(input) {
@@ -72,37 +69,30 @@ async function resetSimulation() {
   const { a, b, c, d } = getParams();
 
   // (re)initialize state
-  py.globals.set("a", a);
-  py.globals.set("b", b);
-  py.globals.set("c", c);
-  py.globals.set("d", d);
-
-  // Keep these modest for responsiveness
-  py.globals.set("N", 61);
+  // The batched ADI sweeps run in the worker, so a fine grid stays
+  // responsive (a step plus the plot data is a few ms at N=121).
   // Smaller visual run window (t in [0,2]) and slower animation.
-  // Keep dt moderate for ADI stability + responsiveness.
-  py.globals.set("dt", 0.0025);
-
-  py.runPython(`reset_state(a,b,c,d,N=N,dt=dt)`);
+  // Keep dt moderate for ADI accuracy + responsiveness.
+  await py.runPython(`reset_state(a,b,c,d,N=N,dt=dt)`, { a, b, c, d, N: 121, dt: 0.0025 });
   await redraw();
 }
 
 async function getPlotData() {
-  const out = py.runPython(`get_plot_data()`);
-  return out.toJs(); // [X, Y, U, t, zmin, zmax]
+  // x, y: Float64Array axes; Z: rows of Float64Array with shape (ny, nx)
+  return await py.runPython(`get_plot_data()`); // [x, y, Z, t, zmin, zmax]
 }
 
 async function redraw() {
   try {
     clearErr();
-    const [X, Y, U, t, zmin, zmax] = await getPlotData();
+    const [x, y, Z, t, zmin, zmax] = await getPlotData();
     document.getElementById("tVal").textContent = fmt(t, 2);
 
     const surface = {
       type: "surface",
-      x: X,
-      y: Y,
-      z: U,
+      x: x,
+      y: y,
+      z: Z,
       showscale: false,
       opacity: 0.95
     };
@@ -124,19 +114,12 @@ async function redraw() {
 
     await Plotly.react("plotTop", [surface], layout, { responsive: true });
 
-    // Contour plot below
-    // NOTE: Python returns X,Y,U as meshgrids with shape (nx, ny) using indexing='ij'.
-    // Plotly contour expects z with rows corresponding to y and columns to x when x,y are 1D.
-    // So we extract xvec, yvec and transpose U.
-    const xvec = X.map(row => row[0]);      // xref
-    const yvec = Y[0];                      // yref
-    const Ut = U[0].map((_, j) => U.map(row => row[j])); // transpose -> (ny, nx)
-
+    // Contour plot below (same 1-D axes and (ny, nx) z as the surface)
     const contour = {
       type: "contour",
-      x: xvec,
-      y: yvec,
-      z: Ut,
+      x: x,
+      y: y,
+      z: Z,
       contours: {
         coloring: "heatmap",
         showlines: true,
@@ -168,8 +151,7 @@ async function redraw() {
 }
 
 async function stepAndRedraw(nsteps) {
-  py.globals.set("nsteps", nsteps);
-  py.runPython(`step_state(nsteps)`);
+  await py.runPython(`step_state(nsteps)`, { nsteps });
   await redraw();
 }
 
@@ -191,6 +173,9 @@ function startRun() {
 
   // advance until t >= 2
   timerId = setInterval(async () => {
+    // skip ticks while the previous step is still in flight
+    if (stepping) return;
+    stepping = true;
     try {
       // 1 step per frame -> 0.01 time units per frame (dt=0.0025)
       // With 150ms interval, the evolution is intentionally slower.
@@ -203,6 +188,8 @@ function startRun() {
     } catch (e) {
       stopRun();
       showErr(e);
+    } finally {
+      stepping = false;
     }
   }, 150);
 }
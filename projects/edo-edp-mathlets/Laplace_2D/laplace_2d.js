@@ -22,14 +22,8 @@ async function initPyodideAndModule() {
   });
 
   // Robust loading: local folder first, then shared assets.
-  try {
-    await loadPythonFile(py, "./laplace_2d.py");
-    console.log("[laplace] loaded ./laplace_2d.py");
-  } catch (e1) {
-    console.warn("[laplace] failed loading ./laplace_2d.py, trying assets path...", e1);
-    await loadPythonFile(py, "../../../assets/mathlets/laplace_2d.py");
-    console.log("[laplace] loaded ../../../assets/mathlets/laplace_2d.py");
-  }
+  const pyUrl = await loadPythonFile(py, ["./laplace_2d.py", "../../../assets/mathlets/laplace_2d.py"]);
+  console.log("[laplace] loaded", pyUrl);
 }
 
 function updateDashSliderUI(input) {
@@ -58,12 +52,13 @@ async function computeU(params) {
   py.globals.set("c", params.c);
   py.globals.set("d", params.d);
 
-  // Modest defaults for browser speed
-  py.globals.set("N", 61);
-  py.globals.set("ITERS", 450);
+  // Multigrid converges in a few V-cycles, so a fine grid stays interactive.
+  // N-1 = 128 coarsens cleanly down to the direct-solve level.
+  py.globals.set("N", 129);
+  py.globals.set("ITERS", 30);
 
-  const out = py.runPython(`compute_plot_data(a, b, c, d, N=N, iters=ITERS)`);
-  return out.toJs(); // [x, y, Z, zmin, zmax]
+  const out = py.runPython(`compute_plot_data(a, b, c, d, N=N, iters=ITERS, method="multigrid")`);
+  return out.toJs(); // [x, y, Z, zmin, zmax, nIter, residual, method]
 }
 
 async function redraw() {
@@ -80,7 +75,10 @@ async function redraw() {
     document.getElementById("cVal").textContent = fmt(c, 2);
     document.getElementById("dVal").textContent = fmt(d, 2);
 
-    const [x, y, Z, zmin, zmax] = await computeU({ a, b, c, d });
+    const [x, y, Z, zmin, zmax, nIter, residual, method] = await computeU({ a, b, c, d });
+    const unit = method === "multigrid" ? "V-cycles" : "sweeps";
+    document.getElementById("solverStatus").textContent =
+      `${method}: ${nIter} ${unit}, residual ${Number(residual).toExponential(2)}`;
 
     // --- 3D surface (top)
     const surf = [{
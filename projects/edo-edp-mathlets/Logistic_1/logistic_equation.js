@@ -22,14 +22,8 @@ async function initPyodideAndModule() {
   });
 
   // Robust load: try local folder first, then shared assets folder
-  try {
-    await loadPythonFile(py, "./logistic_equation.py");
-    console.log("[logistic] loaded ./logistic_equation.py");
-  } catch (e1) {
-    console.warn("[logistic] failed loading ./logistic_equation.py, trying assets path...", e1);
-    await loadPythonFile(py, "../../../assets/mathlets/logistic_equation.py");
-    console.log("[logistic] loaded ../../../assets/mathlets/logistic_equation.py");
-  }
+  const pyUrl = await loadPythonFile(py, ["./logistic_equation.py", "../../../assets/mathlets/logistic_equation.py"]);
+  console.log("[logistic] loaded", pyUrl);
 }
 
 function updateDashSliderUI(input) {
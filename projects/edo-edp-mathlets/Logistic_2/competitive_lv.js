@@ -21,14 +21,11 @@ async function initPyodideAndModule() {
     stderr: (s) => console.log("[pyodide]", s)
   });
 
-  try {
-    await loadPythonFile(py, "./competitive_lv.py");
-    console.log("[clv] loaded ./competitive_lv.py");
-  } catch (e1) {
-    console.warn("[clv] failed loading ./competitive_lv.py, trying assets path...", e1);
-    await loadPythonFile(py, "../../../assets/mathlets/competitive_lv.py");
-    console.log("[clv] loaded ../../../assets/mathlets/competitive_lv.py");
-  }
+  // adaptive RK45 shared by the ODE mathlets
+  await loadPythonFile(py, "../../../assets/mathlets/dopri.py");
+
+  const pyUrl = await loadPythonFile(py, ["./competitive_lv.py", "../../../assets/mathlets/competitive_lv.py"]);
+  console.log("[clv] loaded", pyUrl);
 }
 
 function updateDashSliderUI(input) {
@@ -21,15 +21,15 @@ async function initPyodideAndModule() {
     stderr: (s) => console.log("[pyodide]", s)
   });
 
+  // adaptive RK45 shared by the ODE mathlets
+  await loadPythonFile(py, "../../../assets/mathlets/dopri.py");
+
+  // pixel-tolerance polyline decimation shared by the trajectory mathlets
+  await loadPythonFile(py, "../../../assets/mathlets/decimate.py");
+
   // Robust: try local folder first, then shared assets folder.
-  try {
-    await loadPythonFile(py, "./lorenz_3d.py");
-    console.log("[lorenz] loaded ./lorenz_3d.py");
-  } catch (e1) {
-    console.warn("[lorenz] failed loading ./lorenz_3d.py, trying assets path...", e1);
-    await loadPythonFile(py, "../../../assets/mathlets/lorenz_3d.py");
-    console.log("[lorenz] loaded ../../../assets/mathlets/lorenz_3d.py");
-  }
+  const pyUrl = await loadPythonFile(py, ["./lorenz_3d.py", "../../../assets/mathlets/lorenz_3d.py"]);
+  console.log("[lorenz] loaded", pyUrl);
 }
 
 function updateDashSliderUI(input) {
@@ -65,7 +65,7 @@ async function computeTrajectory(params) {
 compute_plot_data(sigma, rho, beta, x0, y0, z0, tmax, dt)
   `);
 
-  return out.toJs();
+  return out.toJs(); // t, x, y, z arrive as Float64Array, then the ranges
 }
 
 async function redraw() {
@@ -147,6 +147,73 @@ async function redraw() {
   }
 }
 
+// ---------- Attractor analysis (one chunk per animation frame) ----------
+function fmtAnalysis(r) {
+  const lam = Array.from(r.lyap, v => (Number.isFinite(v) ? v.toFixed(3) : "…"));
+  let s = `λ = (${lam.join(", ")})`;
+  if (Number.isFinite(r.lyap_sum)) s += `  Σλ = ${r.lyap_sum.toFixed(3)} (tr J = ${r.trace.toFixed(3)})`;
+  if (Number.isFinite(r.dim_ky)) s += `  D_KY = ${r.dim_ky.toFixed(3)}`;
+  return s;
+}
+
+async function drawDensity(r) {
+  const el = document.getElementById("plotDensity");
+  el.style.display = "block";
+  const trace = {
+    type: "heatmap",
+    x: r.x_centers,
+    y: r.z_centers,
+    z: r.density,
+    colorscale: "Viridis",
+    colorbar: { title: "ρ(x,z)" },
+    name: "invariant density"
+  };
+  const layout = {
+    template: "plotly_dark",
+    margin: { l: 55, r: 10, t: 10, b: 45 },
+    xaxis: { title: "x", showgrid: false, zeroline: false },
+    yaxis: { title: "z", showgrid: false, zeroline: false },
+    paper_bgcolor: "#1e1e1e",
+    plot_bgcolor: "#1e1e1e",
+    font: { color: "#f0f0f0" }
+  };
+  await Plotly.react(el, [trace], layout, { responsive: true });
+}
+
+let analyzing = false;
+
+async function runAnalysis() {
+  if (analyzing) return;
+  analyzing = true;
+  const btn = document.getElementById("analyzeBtn");
+  const status = document.getElementById("analysisStatus");
+  btn.disabled = true;
+  try {
+    clearErr();
+    ["sigma", "rho", "beta", "x0", "y0", "z0"].forEach(id => {
+      py.globals.set(`a_${id}`, Number(document.getElementById(id).value));
+    });
+    py.runPython(`analysis_start(a_sigma, a_rho, a_beta, a_x0, a_y0, a_z0)`);
+
+    let r = null;
+    for (;;) {
+      const [done, total] = pyToPlain(py, `analysis_step()`);
+      r = pyToPlain(py, `analysis_result()`);
+      const pct = total ? Math.round((100 * done) / total) : 100;
+      status.textContent = (done < total ? `${pct}%  ` : "") + (r ? fmtAnalysis(r) : "");
+      if (done >= total) break;
+      await new Promise(requestAnimationFrame);
+    }
+    if (r && r.density) await drawDensity(r);
+  } catch (e) {
+    showErr(e);
+    console.error(e);
+  } finally {
+    btn.disabled = false;
+    analyzing = false;
+  }
+}
+
 function setupLanguageToggle() {
   const langBtn = document.getElementById("langToggle");
   const textES = document.getElementById("text-es");
@@ -185,6 +252,8 @@ async function main() {
     });
   });
 
+  document.getElementById("analyzeBtn").addEventListener("click", runAnalysis);
+
   await redraw();
 }
 
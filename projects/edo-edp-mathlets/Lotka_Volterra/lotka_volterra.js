@@ -21,15 +21,12 @@ async function initPyodideAndModule() {
     stderr: (s) => console.log("[pyodide]", s)
   });
 
+  // adaptive RK45 shared by the ODE mathlets
+  await loadPythonFile(py, "../../../assets/mathlets/dopri.py");
+
   // Robust: try local folder first, then shared assets folder.
-  try {
-    await loadPythonFile(py, "./lotka_volterra.py");
-    console.log("[lv] loaded ./lotka_volterra.py");
-  } catch (e1) {
-    console.warn("[lv] failed loading ./lotka_volterra.py, trying assets path...", e1);
-    await loadPythonFile(py, "../../../assets/mathlets/lotka_volterra.py");
-    console.log("[lv] loaded ../../../assets/mathlets/lotka_volterra.py");
-  }
+  const pyUrl = await loadPythonFile(py, ["./lotka_volterra.py", "../../../assets/mathlets/lotka_volterra.py"]);
+  console.log("[lv] loaded", pyUrl);
 }
 
 function updateDashSliderUI(input) {
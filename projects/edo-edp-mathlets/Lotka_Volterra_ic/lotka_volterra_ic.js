@@ -21,15 +21,12 @@ async function initPyodideAndModule() {
     stderr: (s) => console.log("[pyodide]", s)
   });
 
+  // symplectic integrators + invariant drift shared with other mathlets
+  await loadPythonFile(py, "../../../assets/mathlets/symplectic.py");
+
   // Robust load: local first, then shared assets
-  try {
-    await loadPythonFile(py, "./lotka_volterra_ic.py");
-    console.log("[lv] loaded ./lotka_volterra_ic.py");
-  } catch (e1) {
-    console.warn("[lv] failed loading local py, trying assets...", e1);
-    await loadPythonFile(py, "../../../assets/mathlets/lotka_volterra_ic.py");
-    console.log("[lv] loaded assets lotka_volterra_ic.py");
-  }
+  const pyUrl = await loadPythonFile(py, ["./lotka_volterra_ic.py", "../../../assets/mathlets/lotka_volterra_ic.py"]);
+  console.log("[lv] loaded", pyUrl);
 }
 
 function updateDashSliderUI(input) {
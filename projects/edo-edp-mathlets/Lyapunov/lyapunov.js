@@ -60,14 +60,10 @@ async function initPyodideAndModule() {
     stderr: (s) => console.log("[pyodide]", s),
   });
 
-  try {
-    await loadPythonFile(py, "./lyapunov.py");
-    console.log("[lyap] loaded ./lyapunov.py");
-  } catch (e1) {
-    console.warn("[lyap] failed ./lyapunov.py, trying assets path...", e1);
-    await loadPythonFile(py, "../../../assets/mathlets/lyapunov.py");
-    console.log("[lyap] loaded ../../../assets/mathlets/lyapunov.py");
-  }
+  // shared sympy expression cache first: the mathlet uses compile_expr()
+  await loadPythonFile(py, "../../../assets/mathlets/expr_cache.py");
+  const pyUrl = await loadPythonFile(py, ["./lyapunov.py", "../../../assets/mathlets/lyapunov.py"]);
+  console.log("[lyap] loaded", pyUrl);
 }
 
 function readUI() {
@@ -25,6 +25,9 @@ async function initPyodideAndModule() {
     stderr: (s) => console.log("[pyodide]", s)
   });
 
+  // adaptive RK45 shared by the ODE mathlets
+  await loadPythonFile(py, "../../../assets/mathlets/dopri.py");
+
   // save python file at this path:
   await loadPythonFile(py, "../../../assets/mathlets/projectile.py");
 }
@@ -40,14 +40,10 @@ async function initPy() {
   });
 
   // robust load: local first, then shared assets
-  try {
-    await loadPythonFile(py, "./riccati_isoclines.py");
-    console.log("[riccati] loaded ./riccati_isoclines.py");
-  } catch (e1) {
-    console.warn("[riccati] failed local load, trying assets path...", e1);
-    await loadPythonFile(py, "../../../assets/mathlets/riccati_isoclines.py");
-    console.log("[riccati] loaded ../../../assets/mathlets/riccati_isoclines.py");
-  }
+  // shared sympy expression cache first: the mathlet uses compile_expr()
+  await loadPythonFile(py, "../../../assets/mathlets/expr_cache.py");
+  const pyUrl = await loadPythonFile(py, ["./riccati_isoclines.py", "../../../assets/mathlets/riccati_isoclines.py"]);
+  console.log("[riccati] loaded", pyUrl);
 }
 
 function getParams() {
@@ -40,14 +40,8 @@ async function initPy(){
     stderr: (s) => console.log("[pyodide]", s)
   });
 
-  try{
-    await loadPythonFile(py, "./schrodinger_barrier.py");
-    console.log("[sch] loaded ./schrodinger_barrier.py");
-  }catch(e1){
-    console.warn("[sch] failed local load, trying assets path", e1);
-    await loadPythonFile(py, "../../../assets/mathlets/schrodinger_barrier.py");
-    console.log("[sch] loaded ../../../assets/mathlets/schrodinger_barrier.py");
-  }
+  const pyUrl = await loadPythonFile(py, ["./schrodinger_barrier.py", "../../../assets/mathlets/schrodinger_barrier.py"]);
+  console.log("[sch] loaded", pyUrl);
 }
 
 async function compute(a, V0, phase){
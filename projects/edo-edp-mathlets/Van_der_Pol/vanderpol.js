@@ -21,14 +21,14 @@ async function initPyodideAndModule() {
     stderr: (s) => console.log("[pyodide]", s)
   });
 
-  try {
-    await loadPythonFile(py, "./vanderpol.py");
-    console.log("[vdp] loaded ./vanderpol.py");
-  } catch (e1) {
-    console.warn("[vdp] failed local load, trying assets path...", e1);
-    await loadPythonFile(py, "../../../assets/mathlets/vanderpol.py");
-    console.log("[vdp] loaded ../../../assets/mathlets/vanderpol.py");
-  }
+  // adaptive RK45 shared by the ODE mathlets
+  await loadPythonFile(py, "../../../assets/mathlets/dopri.py");
+
+  // pixel-tolerance polyline decimation shared by the trajectory mathlets
+  await loadPythonFile(py, "../../../assets/mathlets/decimate.py");
+
+  const pyUrl = await loadPythonFile(py, ["./vanderpol.py", "../../../assets/mathlets/vanderpol.py"]);
+  console.log("[vdp] loaded", pyUrl);
 }
 
 function updateDashSliderUI(input) {
@@ -22,18 +22,15 @@ async function initPyodideAndModule() {
     stderr: (s) => console.log("[pyodide]", s)
   });
 
+  // shared DST helpers used by wave_1d.py (method="dst")
+  await loadPythonFile(py, "../../../assets/mathlets/sine_transform.py");
+
   // Robust: try local folder first, then your shared assets folder.
   // Put wave_1d.py EITHER:
   //   (A) in the same folder as wave_1d.html (recommended), OR
   //   (B) in ../../../assets/mathlets/
-  try {
-    await loadPythonFile(py, "./wave_1d.py");
-    console.log("[wave] loaded ./wave_1d.py");
-  } catch (e1) {
-    console.warn("[wave] failed loading ./wave_1d.py, trying assets path...", e1);
-    await loadPythonFile(py, "../../../assets/mathlets/wave_1d.py");
-    console.log("[wave] loaded ../../../assets/mathlets/wave_1d.py");
-  }
+  const pyUrl = await loadPythonFile(py, ["./wave_1d.py", "../../../assets/mathlets/wave_1d.py"]);
+  console.log("[wave] loaded", pyUrl);
 }
 
 function updateDashSliderUI(input) {
@@ -66,7 +63,7 @@ async function computeProfile(params) {
   py.globals.set("SHOW", params.show_modes ? 1 : 0);
 
   const out = py.runPython(`
-compute_plot_data(t, kappa, A, x0, sigma, SHOW)
+compute_plot_data(t, kappa, A, x0, sigma, SHOW, method="dst")
   `);
 
   return out.toJs();
@@ -1,35 +1,230 @@
+import email.utils
+import filecmp
+import hashlib
 import json
 import os
 import re
+import sqlite3
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode
 
 import requests
 
+try:  # optional: incremental JSON parsing keeps peak memory flat per page
+    import ijson
+except ImportError:
+    ijson = None
+
 
 ORCID = os.getenv("ORCID", "").strip()            
 MAILTO = os.getenv("MAILTO", "").strip()          
 
-if not ORCID:
-    raise SystemExit(
-        "ERROR: ORCID env var required (e.g. 0000-0000-0000-0000)")
+# Base URL of the INSPIRE REST API (point it at a local server to test offline)
+API = os.getenv("INSPIRE_API", "https://inspirehep.net/api").rstrip("/")
+# On-disk HTTP cache; reruns revalidate with ETag / If-Modified-Since
+CACHE_DIR = os.getenv("INSPIRE_CACHE_DIR", ".cache/inspire")
+PAGE_SIZE = int(os.getenv("INSPIRE_PAGE_SIZE", "250"))
+MAX_WORKERS = int(os.getenv("INSPIRE_WORKERS", "4"))
+MAX_BACKOFF = 120.0
+# Persistent record store for incremental refreshes (INSPIRE_INCREMENTAL=0 disables)
+STORE_PATH = os.getenv("INSPIRE_STORE", ".cache/inspire.sqlite")
+INCREMENTAL = os.getenv("INSPIRE_INCREMENTAL", "1") != "0"
+# A full resync every so often drops anything the incremental path could miss
+FULL_SYNC_DAYS = float(os.getenv("INSPIRE_FULL_SYNC_DAYS", "7"))
+
+FULL_FIELDS = [
+    "control_number",
+    "titles.title",
+    "authors.full_name",
+    "citation_count",
+    "dois.value",
+    "arxiv_eprints.value",
+    "publication_info.journal_title",
+    "publication_info.year",
+    "earliest_date",
+    "preprint_date",
+    "document_type",
+]
+# Citation counts change daily without the record's update date moving
+LIGHT_FIELDS = ["control_number", "citation_count"]
+# Author names shown per paper in publications.json before "et al."
+AUTHORS_SHOWN = int(os.getenv("INSPIRE_AUTHORS_SHOWN", "10"))
+# Bumped when the stored item layout changes (forces a full resync)
+STORE_SCHEMA = "2"
+
+_local = threading.local()
+
+
+def session() -> requests.Session:
+    """One requests.Session per thread (Session is not thread-safe)."""
+    s = getattr(_local, "session", None)
+    if s is None:
+        s = requests.Session()
+        s.headers["User-Agent"] = "github-pages-research-site"
+        _local.session = s
+    return s
 
-S = requests.Session()
-S.headers["User-Agent"] = "github-pages-research-site"
 
+def full_url(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    if not params:
+        return url
+    sep = "&" if "?" in url else "?"
+    return url + sep + urlencode(sorted(params.items()))
+
+
+def _cache_paths(url: str) -> Tuple[str, str]:
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return (os.path.join(CACHE_DIR, key + ".json"),
+            os.path.join(CACHE_DIR, key + ".meta.json"))
+
+
+def _cache_load(url: str) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Return (body_path, meta) of a cached response, or (None, {})."""
+    body_path, meta_path = _cache_paths(url)
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None, {}
+    if not os.path.exists(body_path):
+        return None, {}
+    return body_path, meta
+
+
+def _cache_write_meta(meta_path: str, meta: Dict[str, Any]) -> None:
+    tmp = meta_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, meta_path)
+
+
+def _cache_store(url: str, r: requests.Response) -> str:
+    """Stream a response body into the cache; returns the body path."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    body_path, meta_path = _cache_paths(url)
+    meta = {
+        "url": url,
+        "etag": r.headers.get("ETag"),
+        "last_modified": r.headers.get("Last-Modified"),
+        "fetched": time.time(),
+    }
+    # write-then-rename so an interrupted run never leaves a torn entry
+    tmp = body_path + ".tmp"
+    with open(tmp, "wb") as f:
+        for chunk in r.iter_content(chunk_size=1 << 16):
+            f.write(chunk)
+    os.replace(tmp, body_path)
+    _cache_write_meta(meta_path, meta)
+    return body_path
+
+
+def _scratch_store(r: requests.Response) -> str:
+    """Stream a response body to a scratch file the caller deletes."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        for chunk in r.iter_content(chunk_size=1 << 16):
+            f.write(chunk)
+    return path
+
+
+def prune_cache(max_age: float) -> int:
+    """
+    Drop cache entries not fetched or revalidated within max_age seconds,
+    plus scratch files left by an interrupted run; returns how many went.
+    """
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+    now = time.time()
+    removed = 0
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        if name.endswith(".tmp"):
+            os.remove(path)
+            removed += 1
+            continue
+        if not name.endswith(".meta.json"):
+            continue
+        try:
+            with open(path, encoding="utf-8") as f:
+                fetched = float(json.load(f).get("fetched") or 0)
+        except (OSError, ValueError):
+            fetched = 0.0
+        if now - fetched > max_age:
+            for p in (path, path[:-len(".meta.json")] + ".json"):
+                if os.path.exists(p):
+                    os.remove(p)
+            removed += 1
+    return removed
+
+
+def retry_after_seconds(value: Optional[str], default: float) -> float:
+    """Parse a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return default
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    return max(0.0, when.timestamp() - time.time())
+
+
+def fetch_to_cache(url: str, params: Optional[Dict[str, Any]] = None, retries: int = 8,
+                   cache: bool = True) -> str:
+    """
+    GET through the on-disk cache and return the path of the body on disk.
+    The body is streamed to the file, never held in memory. A cached entry
+    is revalidated with If-None-Match / If-Modified-Since and reused on 304.
+    429/5xx responses back off exponentially, honouring Retry-After when
+    the server sends it. With cache=False (one-off URLs that never repeat)
+    the body goes to a scratch file that the caller deletes.
+    """
+    url = full_url(url, params)
+    cached, meta = _cache_load(url) if cache else (None, {})
+
+    headers = {}
+    if cached is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
 
-def get_json(url: str, params: Optional[Dict[str, Any]] = None, retries: int = 8) -> Dict[str, Any]:
-    """GET JSON with basic retry/backoff for rate limits."""
     for i in range(retries):
-        r = S.get(url, params=params, timeout=60)
-        if r.status_code == 429:
-            time.sleep(2 * (i + 1))
+        backoff = min(MAX_BACKOFF, 2.0 ** i)
+        try:
+            r = session().get(url, headers=headers, timeout=60, stream=True)
+        except (requests.ConnectionError, requests.Timeout):
+            time.sleep(backoff)
             continue
-        r.raise_for_status()
-        return r.json()
+        with r:
+            if r.status_code == 304:
+                # only a conditional request may come back empty-bodied
+                if cached is None:
+                    raise RuntimeError(f"304 Not Modified without a cached entry: {url}")
+                # still current: keep it out of prune_cache's reach
+                _cache_write_meta(_cache_paths(url)[1], dict(meta, fetched=time.time()))
+                return cached
+            if r.status_code == 429 or r.status_code >= 500:
+                time.sleep(min(MAX_BACKOFF, retry_after_seconds(r.headers.get("Retry-After"), backoff)))
+                continue
+            r.raise_for_status()
+            return _cache_store(url, r) if cache else _scratch_store(r)
     raise RuntimeError(f"Failed after retries: {url}")
 
 
+def get_json(url: str, params: Optional[Dict[str, Any]] = None, retries: int = 8) -> Dict[str, Any]:
+    """GET JSON (small responses) through the on-disk cache."""
+    with open(fetch_to_cache(url, params, retries), encoding="utf-8") as f:
+        return json.load(f)
+
+
 def norm_title(s: Optional[str]) -> str:
     s = (s or "").lower()
     s = re.sub(r"\s+", " ", s).strip()
@@ -55,18 +250,55 @@ def compute_h_index(cites: List[int]) -> int:
     return h
 
 
-def iter_hits(first_page: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
-    """Yield INSPIRE 'metadata' dicts across pagination."""
-    page = first_page
-    while True:
-        hits = ((page.get("hits") or {}).get("hits")) or []
-        for h in hits:
-            yield h.get("metadata") or {}
-
-        next_url = ((page.get("links") or {}).get("next"))
-        if not next_url:
-            break
-        page = get_json(next_url)
+def page_hits(path: str) -> Iterable[Dict[str, Any]]:
+    """Yield the 'metadata' dicts of one cached results page, one at a time."""
+    with open(path, "rb") as f:
+        if ijson is not None:
+            for m in ijson.items(f, "hits.hits.item.metadata", use_float=True):
+                yield m or {}
+            return
+        page = json.load(f)
+    for h in ((page.get("hits") or {}).get("hits")) or []:
+        yield h.get("metadata") or {}
+
+
+def page_total(path: str) -> int:
+    with open(path, "rb") as f:
+        if ijson is not None:
+            return int(next(ijson.items(f, "hits.total"), 0) or 0)
+        page = json.load(f)
+    return int(((page.get("hits") or {}).get("total")) or 0)
+
+
+def iter_hits(url: str, params: Dict[str, Any], cache: bool = True) -> Iterable[Dict[str, Any]]:
+    """
+    Yield INSPIRE 'metadata' dicts across pagination, in result order.
+    The first page gives the total; the remaining pages are downloaded
+    concurrently (at most MAX_WORKERS in flight) with explicit page numbers
+    straight to the disk cache, then parsed one page at a time.
+    cache=False is for one-off queries: pages are deleted once parsed.
+    """
+    def hits(path: str) -> Iterable[Dict[str, Any]]:
+        try:
+            yield from page_hits(path)
+        finally:
+            if not cache:
+                os.remove(path)
+
+    params = dict(params, size=PAGE_SIZE, page=1)
+    first = fetch_to_cache(url, params=params, cache=cache)
+    total = page_total(first)
+    yield from hits(first)
+
+    n_pages = (total + PAGE_SIZE - 1) // PAGE_SIZE
+    if n_pages <= 1:
+        return
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        paths = pool.map(lambda n: fetch_to_cache(url, params=dict(params, page=n), cache=cache),
+                         range(2, n_pages + 1))
+        for path in paths:
+            yield from hits(path)
 
 
 def choose_best_venue(metadata: Dict[str, Any], journal: Optional[str], arxiv_id: Optional[str]) -> str:
@@ -100,73 +332,27 @@ def dedupe_key(p: Dict[str, Any]) -> Tuple[str, Any, Any]:
     return ("ty", norm_title(p.get("title")), p.get("year"))
 
 
-def sort_key(p: Dict[str, Any]) -> Tuple[str, int]:
-    d = p.get("publication_date") or ""
-    y = int(p.get("year") or 0)
-    return (d, y)
-
-
-# -----------------------------
-# 1) Resolve INSPIRE author from ORCID
-# -----------------------------
-author = get_json(f"https://inspirehep.net/api/orcid/{ORCID}")
-metadata = author.get("metadata") or {}
-
-ids = metadata.get("ids") or []
-bai = None
-for x in ids:
-    if x.get("schema") == "INSPIRE BAI":
-        bai = x.get("value")
-        break
-
-control_number = metadata.get("control_number")
-
-if not bai and not control_number:
-    raise SystemExit(
-        "ERROR: Could not find INSPIRE BAI or control_number in ORCID author record.")
-
-# INSPIRE search query:
-# Preferred: q = "a <BAI>" (curated author identity)
-# Fallback: refer to author record url
-q = f"a {bai}" if bai else f"authors.record:$ref:\"https://inspirehep.net/api/authors/{control_number}\""
-
-# -----------------------------
-# 2) Query literature for this author
-# -----------------------------
-params = {
-    "q": q,
-    "sort": "mostrecent",
-    "size": 1000,
-    "fields": ",".join([
-        "control_number",
-        "titles.title",
-        "authors.full_name",
-        "citation_count",
-        "dois.value",
-        "arxiv_eprints.value",
-        "publication_info.journal_title",
-        "publication_info.year",
-        "earliest_date",
-        "preprint_date",
-        "document_type",
-    ])
-}
-
-if MAILTO:
-    params["mailto"] = MAILTO
-
-first_page = get_json("https://inspirehep.net/api/literature", params=params)
-
-raw_items: List[Dict[str, Any]] = []
-for m in iter_hits(first_page):
+def display_authors(names: List[str], shown: int = AUTHORS_SHOWN) -> str:
+    """Comma-joined author string, truncated to `shown` names plus "et al."."""
+    if len(names) <= shown:
+        return ", ".join(names)
+    return ", ".join(names[:shown]) + " et al."
+
+
+def parse_item(m: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    INSPIRE literature metadata -> one publications.json item. The full
+    name list travels as "author_names" until RecordStore.upsert interns
+    it; only the truncated display string is kept in "authors".
+    """
     recid = m.get("control_number")
 
     titles = m.get("titles") or []
     title = (titles[0].get("title") if titles else None) or "Untitled"
 
     authors_list = m.get("authors") or []
-    authors = ", ".join([(a.get("full_name") or "").strip()
-                        for a in authors_list if a.get("full_name")])
+    names = [a["full_name"].strip() for a in authors_list if a.get("full_name")]
+    authors = display_authors(names)
 
     citation_count = int(m.get("citation_count") or 0)
 
@@ -186,7 +372,6 @@ for m in iter_hits(first_page):
     earliest_date = m.get("earliest_date") or m.get("preprint_date")
     year = pub_year or first_year_from_date(earliest_date)
 
-    doc_types = set(m.get("document_type") or [])
     is_published = bool(journal)
     # theses are not "citable" in charts
     is_citable = True
@@ -194,7 +379,7 @@ for m in iter_hits(first_page):
     venue = choose_best_venue(m, journal, arxiv_id)
     url = choose_best_url(doi, arxiv_id, recid)
 
-    raw_items.append({
+    return {
         "inspire_recid": recid,
         "doi": doi,
         "arxiv": arxiv_id,
@@ -208,52 +393,311 @@ for m in iter_hits(first_page):
         "cited_by_count": citation_count,
 
         "is_published": is_published,
-        "is_citable": is_citable
-    })
-
-# -----------------------------
-# 3) Deduplicate
-# -----------------------------
-seen = set()
-items: List[Dict[str, Any]] = []
-for p in raw_items:
-    k = dedupe_key(p)
-    if k in seen:
-        continue
-    seen.add(k)
-    items.append(p)
-
-# Sort newest first
-items.sort(key=sort_key, reverse=True)
-
-# -----------------------------
-# 4) Stats from items
-# -----------------------------
-# Very lightweight collaborator proxy: unique coauthor full names across all items
-coauthors = set()
-for p in items:
-    for name in (p.get("authors") or "").split(","):
-        nm = name.strip()
-        if nm:
-            coauthors.add(nm)
-
-stats = {
-    "works_count": len(items),
-    "cited_by_count": sum(int(p.get("cited_by_count") or 0) for p in items),
-    "collaborators": max(0, len(coauthors) - 1),
-    "h_index": compute_h_index([int(p.get("cited_by_count") or 0) for p in items]),
-}
-
-# -----------------------------
-# 5) Write outputs
-# -----------------------------
-os.makedirs("data", exist_ok=True)
-with open("data/publications.json", "w", encoding="utf-8") as f:
-    json.dump({"items": items}, f, indent=2, ensure_ascii=False)
-
-with open("data/stats.json", "w", encoding="utf-8") as f:
-    json.dump(stats, f, indent=2, ensure_ascii=False)
-
-print(f"INSPIRE BAI: {bai} | ORCID: {ORCID}")
-print(f"Raw records: {len(raw_items)} | After dedupe: {len(items)}")
-print("Updated data/publications.json and data/stats.json")
\ No newline at end of file
+        "is_citable": is_citable,
+
+        "author_names": names,
+    }
+
+
+def literature_params(q: str, fields: List[str]) -> Dict[str, Any]:
+    params = {
+        "q": q,
+        "sort": "mostrecent",
+        "fields": ",".join(fields),
+    }
+    if MAILTO:
+        params["mailto"] = MAILTO
+    return params
+
+
+def fetch_items(q: str, cache: bool = True) -> Iterable[Dict[str, Any]]:
+    """Parsed items, one at a time: raw metadata (author lists) is dropped early."""
+    for m in iter_hits(f"{API}/literature", literature_params(q, FULL_FIELDS), cache=cache):
+        yield parse_item(m)
+
+
+class RecordStore:
+    """
+    SQLite store of parsed items keyed by inspire_recid, plus a small
+    key/value table for run bookkeeping (query, last sync times) and an
+    interned author table (full name -> integer id). Stored items carry
+    "author_ids" instead of name lists.
+    """
+
+    def __init__(self, path: str):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS records (
+                recid INTEGER PRIMARY KEY,
+                cited_by_count INTEGER NOT NULL DEFAULT 0,
+                item TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS authors (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            );
+        """)
+        self._author_ids: Optional[Dict[str, int]] = None
+
+    def author_id(self, name: str) -> int:
+        if self._author_ids is None:
+            self._author_ids = {n: i for i, n in self.db.execute("SELECT id, name FROM authors")}
+        i = self._author_ids.get(name)
+        if i is None:
+            i = self.db.execute("INSERT INTO authors (name) VALUES (?)", (name,)).lastrowid
+            self._author_ids[name] = i
+        return i
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def recids(self) -> set:
+        return {r[0] for r in self.db.execute("SELECT recid FROM records")}
+
+    def upsert(self, items: Iterable[Dict[str, Any]]) -> List[int]:
+        """Store items as they stream in; returns the recids written."""
+        recids = []
+
+        def rows():
+            for p in items:
+                if p.get("inspire_recid") is None:
+                    continue
+                recids.append(p["inspire_recid"])
+                p = dict(p)
+                p["author_ids"] = [self.author_id(n) for n in p.pop("author_names", [])]
+                yield (p["inspire_recid"], int(p.get("cited_by_count") or 0),
+                       json.dumps(p, ensure_ascii=False))
+
+        self.db.executemany(
+            "INSERT OR REPLACE INTO records (recid, cited_by_count, item) VALUES (?, ?, ?)", rows())
+        return recids
+
+    def set_citations(self, counts: Dict[int, int]) -> int:
+        """Update citation counts; returns how many actually changed."""
+        changed = 0
+        for recid, n in counts.items():
+            cur = self.db.execute(
+                "UPDATE records SET cited_by_count = ?, item = json_set(item, '$.cited_by_count', ?) "
+                "WHERE recid = ? AND cited_by_count != ?", (n, n, recid, n))
+            changed += cur.rowcount
+        return changed
+
+    def delete(self, recids: Iterable[int]) -> None:
+        self.db.executemany("DELETE FROM records WHERE recid = ?", [(r,) for r in recids])
+
+    def clear(self) -> None:
+        self.db.execute("DELETE FROM records")
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def iter_items(self) -> Iterable[Dict[str, Any]]:
+        """
+        Items newest first (publication date, then integer year, ties by
+        recid), one at a time.
+        """
+        cur = self.db.execute("""
+            SELECT item FROM records
+            ORDER BY COALESCE(json_extract(item, '$.publication_date'), '') DESC,
+                     COALESCE(CAST(json_extract(item, '$.year') AS INTEGER), 0) DESC,
+                     recid DESC
+        """)
+        for (item,) in cur:
+            yield json.loads(item)
+
+    def commit(self) -> None:
+        self.db.commit()
+
+
+def sync_store(store: RecordStore, q: str) -> str:
+    """
+    Bring the store up to date and return the sync mode used.
+
+    full:        refetch everything (empty store, changed query, or the last
+                 full sync is older than FULL_SYNC_DAYS).
+    incremental: one light pass (recid + citation_count for all records)
+                 to refresh citations and drop removed records, then full
+                 fields only for records updated since the last run
+                 ("du" query) or not yet in the store.
+    """
+    now = time.time()
+    today = time.strftime("%Y-%m-%d", time.gmtime(now))
+    last_full = float(store.get_meta("last_full") or 0)
+    last_run = store.get_meta("last_run_date")
+
+    if (store.get_meta("query") != q or not last_run
+            or store.get_meta("schema") != STORE_SCHEMA
+            or now - last_full > FULL_SYNC_DAYS * 86400):
+        store.clear()
+        store.upsert(fetch_items(q))
+        store.set_meta("query", q)
+        store.set_meta("schema", STORE_SCHEMA)
+        store.set_meta("last_full", str(now))
+        store.set_meta("last_run_date", today)
+        store.commit()
+        return "full"
+
+    light = list(iter_hits(f"{API}/literature", literature_params(q, LIGHT_FIELDS)))
+    counts = {int(m["control_number"]): int(m.get("citation_count") or 0)
+              for m in light if m.get("control_number") is not None}
+
+    known = store.recids()
+    store.delete(known - set(counts))
+    store.set_citations(counts)
+
+    # records touched since the previous run (one day of overlap for safety);
+    # this and the recid queries below change every run, so skip the cache
+    updated = store.upsert(fetch_items(f"({q}) and du >= {last_run}", cache=False))
+
+    missing = sorted(set(counts) - known - set(updated))
+    for i in range(0, len(missing), 50):
+        chunk = missing[i:i + 50]
+        store.upsert(fetch_items(f"({q}) and (" + " or ".join(f"recid:{r}" for r in chunk) + ")",
+                                 cache=False))
+
+    store.set_meta("last_run_date", today)
+    store.commit()
+    return "incremental"
+
+
+class StatsAccumulator:
+    """Stats computed while items stream past (no list of items kept)."""
+
+    def __init__(self):
+        self.works = 0
+        self.cites: List[int] = []
+        # Collaborator proxy: unique interned author ids across all items
+        self.coauthors = set()
+
+    def add(self, p: Dict[str, Any], author_ids: Iterable[int]) -> None:
+        self.works += 1
+        self.cites.append(int(p.get("cited_by_count") or 0))
+        self.coauthors.update(author_ids)
+
+    def result(self) -> Dict[str, int]:
+        return {
+            "works_count": self.works,
+            "cited_by_count": sum(self.cites),
+            "collaborators": max(0, len(self.coauthors) - 1),
+            "h_index": compute_h_index(self.cites),
+        }
+
+
+def dedupe(items: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+    seen = set()
+    for p in items:
+        k = dedupe_key(p)
+        if k in seen:
+            continue
+        seen.add(k)
+        yield p
+
+
+def _replace_if_changed(tmp: str, path: str) -> bool:
+    if os.path.exists(path) and filecmp.cmp(tmp, path, shallow=False):
+        os.remove(tmp)
+        return False
+    os.replace(tmp, path)
+    return True
+
+
+def write_json_if_changed(path: str, obj: Any) -> bool:
+    """Write obj as indented JSON unless the file already holds exactly that."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+    return _replace_if_changed(tmp, path)
+
+
+def write_items_json_if_changed(path: str, items: Iterable[Dict[str, Any]]) -> bool:
+    """
+    Stream {"items": [...]} to disk one item at a time. The bytes are the
+    same as json.dump({"items": items}, f, indent=2), so unchanged output
+    is detected by comparing files.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write('{\n  "items": [')
+        first = True
+        for p in items:
+            f.write("\n" if first else ",\n")
+            first = False
+            text = json.dumps(p, indent=2, ensure_ascii=False)
+            f.write("\n".join("    " + line for line in text.split("\n")))
+        f.write("]\n}" if first else "\n  ]\n}")
+    return _replace_if_changed(tmp, path)
+
+
+def main() -> None:
+    if not ORCID:
+        raise SystemExit(
+            "ERROR: ORCID env var required (e.g. 0000-0000-0000-0000)")
+
+    # -----------------------------
+    # 1) Resolve INSPIRE author from ORCID
+    # -----------------------------
+    author = get_json(f"{API}/orcid/{ORCID}")
+    metadata = author.get("metadata") or {}
+
+    ids = metadata.get("ids") or []
+    bai = None
+    for x in ids:
+        if x.get("schema") == "INSPIRE BAI":
+            bai = x.get("value")
+            break
+
+    control_number = metadata.get("control_number")
+
+    if not bai and not control_number:
+        raise SystemExit(
+            "ERROR: Could not find INSPIRE BAI or control_number in ORCID author record.")
+
+    # INSPIRE search query:
+    # Preferred: q = "a <BAI>" (curated author identity)
+    # Fallback: refer to author record url
+    q = f"a {bai}" if bai else f"authors.record:$ref:\"https://inspirehep.net/api/authors/{control_number}\""
+
+    # -----------------------------
+    # 2) Query literature for this author (full or incremental)
+    # -----------------------------
+    # Without a persistent store, a throwaway in-memory one still lets
+    # items stream from the network straight into sorted output.
+    store = RecordStore(STORE_PATH if INCREMENTAL else ":memory:")
+    mode = sync_store(store, q)
+
+    # -----------------------------
+    # 3) Deduplicate, 4) stats, 5) write -- streamed, newest first,
+    #    files only rewritten when their content changed
+    # -----------------------------
+    os.makedirs("data", exist_ok=True)
+    acc = StatsAccumulator()
+
+    def counted(items: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+        for p in items:
+            # author ids are store-internal: counted here, not written out
+            acc.add(p, p.pop("author_ids", ()))
+            yield p
+
+    wrote_pubs = write_items_json_if_changed("data/publications.json",
+                                             counted(dedupe(store.iter_items())))
+    wrote_stats = write_json_if_changed("data/stats.json", acc.result())
+
+    # entries no run has touched for a full-sync period are dead weight
+    pruned = prune_cache(FULL_SYNC_DAYS * 86400)
+
+    print(f"INSPIRE BAI: {bai} | ORCID: {ORCID} | sync: {mode} | cache entries pruned: {pruned}")
+    print(f"Raw records: {len(store)} | After dedupe: {acc.works}")
+    print(f"data/publications.json {'updated' if wrote_pubs else 'unchanged'}; "
+          f"data/stats.json {'updated' if wrote_stats else 'unchanged'}")
+
+
+if __name__ == "__main__":
+    main()